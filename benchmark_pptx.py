@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmarks del generador de presentaciones (create_pptx_christian.py)
+Mide helpers, slides, guardado y decks completos, y compara con un baseline
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+from pptx.util import Inches
+
+import create_pptx_christian as gen
+
+# Helpers medidos de forma aislada: nombre → llamada sobre una slide vacía
+HELPER_CASES = {
+    "add_text_box": lambda slide: gen.add_text_box(
+        slide, Inches(1), Inches(1), Inches(3), Inches(0.5), "Texto de prueba",
+        font_size=14, font_color=gen.WHITE, bold=True),
+    "add_rounded_rectangle": lambda slide: gen.add_rounded_rectangle(
+        slide, Inches(1), Inches(1), Inches(3), Inches(1), gen.GRAY_DARK, line_color=gen.EMERALD),
+    "add_circle": lambda slide: gen.add_circle(
+        slide, Inches(1), Inches(1), Inches(1), gen.EMERALD),
+    "add_arrow": lambda slide: gen.add_arrow(
+        slide, Inches(1), Inches(1), Inches(1), Inches(0.4), gen.VIOLET),
+    "add_glass_card": lambda slide: gen.add_glass_card(
+        slide, Inches(1), Inches(1), Inches(3), Inches(2), gen.EMERALD, "Agenda", "📅"),
+    "add_mini_card": lambda slide: gen.add_mini_card(
+        slide, Inches(1), Inches(1), Inches(3), Inches(0.7)),
+    "add_badge": lambda slide: gen.add_badge(
+        slide, Inches(1), Inches(1), Inches(0.8), Inches(0.25), gen.EMERALD, "95%", gen.WHITE),
+    "add_progress_bar": lambda slide: gen.add_progress_bar(
+        slide, Inches(1), Inches(1), Inches(3), Inches(0.25), 0.78, gen.GRAY_DARK, gen.EMERALD),
+    "add_stat_number": lambda slide: gen.add_stat_number(
+        slide, Inches(1), Inches(1), "5h+", "cada semana", gen.EMERALD),
+}
+
+DECK_SIZES = (1, 10, 100, 1000)
+
+def _blank_slide(prs):
+    return prs.slides.add_slide(prs.slide_layouts[6])
+
+def _best_of(fn, repeat, setup=None):
+    """Best wall time of `repeat` runs of fn(), or of fn(setup()) untimed setup"""
+    best = float("inf")
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_helpers(calls, repeat):
+    """Calls/sec and shapes/sec of each helper on a fresh slide"""
+    results = {}
+    for name, case in HELPER_CASES.items():
+        prs = gen.new_presentation()
+        slide = _blank_slide(prs)
+        before = len(slide.shapes)
+        case(slide)
+        shapes_per_call = len(slide.shapes) - before
+
+        def run(slide):
+            for _ in range(calls):
+                case(slide)
+
+        seconds = _best_of(run, repeat, setup=lambda: _blank_slide(prs))
+        results[name] = {
+            "calls_per_sec": calls / seconds,
+            "shapes_per_sec": calls * shapes_per_call / seconds,
+        }
+    return results
+
+def bench_slides(repeat):
+    """Wall time of each create_slide_* builder"""
+    data = dict(gen.DEFAULT_DECK_DATA)
+    results = {}
+    for builder in gen.SLIDE_BUILDERS:
+        # Presentación nueva en cada repetición: sin slides acumuladas de la anterior
+        seconds = _best_of(lambda prs: builder(prs, data), repeat, setup=gen.new_presentation)
+        results[builder.__name__] = {"seconds": seconds}
+    return results
+
+def bench_save(repeat):
+    """Wall time of prs.save() and save_streaming() for the default deck"""
+    prs = gen.build_presentation()
+    return {
+        "prs.save": {"seconds": _best_of(lambda: prs.save(io.BytesIO()), repeat)},
+        "save_streaming": {"seconds": _best_of(lambda: gen.save_streaming(prs, io.BytesIO()),
+                                               repeat)},
+    }
+
+def _build_deck(n_slides):
+    prs = gen.new_presentation()
+    data = dict(gen.DEFAULT_DECK_DATA)
+    for i in range(n_slides):
+        gen.SLIDE_BUILDERS[i % len(gen.SLIDE_BUILDERS)](prs, data)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getbuffer().nbytes
+
+def bench_decks(sizes, repeat):
+    """Wall time, peak memory and output size of decks with n slides"""
+    results = {}
+    for n_slides in sizes:
+        seconds = _best_of(lambda: _build_deck(n_slides), repeat)
+        # Pasada aparte con tracemalloc para no inflar el tiempo medido
+        tracemalloc.start()
+        size = _build_deck(n_slides)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[str(n_slides)] = {
+            "seconds": seconds,
+            "slides_per_sec": n_slides / seconds,
+            "peak_mb": peak / 2**20,
+            "bytes": size,
+        }
+    return results
+
+def _flatten(results):
+    return {f"{group}.{name}.{metric}": value
+            for group, entries in results.items() if isinstance(entries, dict)
+            for name, metrics in entries.items()
+            for metric, value in metrics.items()}
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return the metrics that regressed more than `tolerance` (fraction)
+
+    Raises ValueError when the baseline was measured with the other
+    emitter: every helper would differ because of the mode, not the code.
+    """
+    if results["fast_emit"] != baseline.get("fast_emit"):
+        raise ValueError(f"el baseline se midió con fast_emit={baseline.get('fast_emit')} "
+                         f"y esta ejecución usa fast_emit={results['fast_emit']}")
+    current, previous = _flatten(results), _flatten(baseline)
+    regressions = []
+    for key, old in previous.items():
+        new = current.get(key)
+        if new is None or not old:
+            continue
+        if key.endswith("_per_sec"):
+            change = (old - new) / old
+        elif key.endswith((".seconds", ".peak_mb", ".bytes")):
+            change = (new - old) / old
+        else:
+            continue
+        if change > tolerance:
+            regressions.append((key, old, new, change))
+    return regressions
+
+def print_report(results):
+    print("Helpers (shapes/s):")
+    for name, metrics in results["helpers"].items():
+        print(f"  {name:<24} {metrics['shapes_per_sec']:>12,.0f} shapes/s"
+              f"  {metrics['calls_per_sec']:>10,.0f} llamadas/s")
+    print("Slides:")
+    for name, metrics in results["slides"].items():
+        print(f"  {name:<24} {metrics['seconds'] * 1000:>9.2f} ms")
+    print("Guardado:")
+    for name, metrics in results["save"].items():
+        print(f"  {name:<24} {metrics['seconds'] * 1000:>9.2f} ms")
+    print("Decks:")
+    for n_slides, metrics in results["decks"].items():
+        print(f"  {n_slides:>5} slides  {metrics['seconds']:>8.2f} s"
+              f"  {metrics['peak_mb']:>8.1f} MB pico  {metrics['bytes'] / 1024:>9.0f} KB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del generador REVIVE")
+    parser.add_argument("--calls", type=int, default=200,
+                        help="llamadas por repetición en los helpers")
+    parser.add_argument("--repeat", type=int, default=5, help="repeticiones (se toma la mejor)")
+    parser.add_argument("--sizes", default=",".join(map(str, DECK_SIZES)),
+                        help="tamaños de deck en slides, separados por comas")
+    parser.add_argument("--fast-emit", action="store_true", help="usa el emisor lxml directo")
+    parser.add_argument("--json", metavar="PATH", help="guarda los resultados en JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compara con un baseline JSON")
+    parser.add_argument("--save-baseline", metavar="PATH",
+                        help="guarda los resultados como nuevo baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="regresión máxima permitida respecto al baseline (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+    gen.use_fast_emitter(args.fast_emit)
+
+    # El baseline se lee antes de medir y de escribir nada: --save-baseline
+    # puede ser el mismo fichero
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as exc:
+            parser.error(f"--baseline: {exc}")
+        if not isinstance(baseline, dict) or baseline.get("fast_emit") != args.fast_emit:
+            parser.error(f"--baseline: no se midió con fast_emit={args.fast_emit} "
+                         f"(repite con el mismo --fast-emit que el baseline)")
+
+    results = {
+        "fast_emit": args.fast_emit,
+        "helpers": bench_helpers(args.calls, args.repeat),
+        "slides": bench_slides(args.repeat),
+        "save": bench_save(args.repeat),
+        "decks": bench_decks([int(n) for n in args.sizes.split(",") if n], args.repeat),
+    }
+    print_report(results)
+
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for key, old, new, change in regressions:
+            print(f"REGRESIÓN {key}: {old:.4g} → {new:.4g} ({change:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"Sin regresiones respecto a {args.baseline}")
+
+if __name__ == "__main__":
+    main()
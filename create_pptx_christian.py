@@ -4,11 +4,79 @@ Script para generar presentación PPTX para reunión con Christian
 Estilo: Dark Premium con colores Emerald, Blue, Violet
 """
 
+import abc
+import argparse
+import contextlib
+import copy
+import functools
+import hashlib
+import inspect
+import io
+import itertools
+import json
+import math
+import os
+import re
+import shutil
+import string
+import sys
+import time
+import unicodedata
+import zipfile
+from collections import Counter, defaultdict, namedtuple
+from datetime import date, datetime, timezone
+
+# Con REVIVE_WARM_SOCKET apuntando a un renderer caliente (--warm), el script
+# le pasa los argumentos y su stdin/stdout/stderr antes de importar
+# python-pptx y lxml; el renderer hace fork y el hijo ejecuta main().
+WARM_SOCKET_ENV = "REVIVE_WARM_SOCKET"
+
+def _run_in_warm_renderer(socket_path, argv):
+    """Run argv in the warm renderer; returns its exit code, or None if it is not running"""
+    import socket
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        return None
+    with client:
+        request = json.dumps({"argv": argv, "cwd": os.getcwd()}).encode()
+        socket.send_fds(client, [request], [0, 1, 2])
+        reply = client.makefile("rb").read()
+    return int(reply) if reply.strip() else 1
+
+if __name__ == "__main__" and os.environ.get(WARM_SOCKET_ENV) and "--warm" not in sys.argv:
+    _warm_exit_code = _run_in_warm_renderer(os.environ[WARM_SOCKET_ENV], sys.argv[1:])
+    if _warm_exit_code is not None:
+        sys.exit(_warm_exit_code)
+
+# Estos imports son siempre inmediatos (todo render los necesita): solo el
+# renderer caliente los evita. Lo diferido son los módulos opcionales (datos
+# de charts, ProcessPoolExecutor), importados donde se usan.
+_imports_start = time.perf_counter()
+
 from pptx import Presentation
-from pptx.util import Inches, Pt
+from pptx.util import Emu, Inches, Pt
 from pptx.dml.color import RGBColor as RgbColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.chart import XL_CHART_TYPE, XL_MARKER_STYLE
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM, RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part, XmlPart
+from pptx.opc.packuri import PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.oxml import parse_xml
+from pptx.shapes.autoshape import AutoShapeType
+
+# Tiempo de importación de python-pptx/lxml (se muestra con --import-time)
+IMPORT_SECONDS = time.perf_counter() - _imports_start
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, ".pptx_cache")
+DEFAULT_OUTPUT = "REVIVE_Reunion_Christian.pptx"
 
 # Colores del tema
 DARK_BG = RgbColor(0x12, 0x12, 0x1A)  # #12121A
@@ -30,6 +98,122 @@ GRAY_MEDIUM = RgbColor(0x6B, 0x6B, 0x80)
 GRAY_DARK = RgbColor(0x2A, 0x2A, 0x35)
 GLASS_BG = RgbColor(0x1E, 0x1E, 0x2E)  # Glass card background
 GLASS_BORDER = RgbColor(0x3D, 0x3D, 0x50)  # Glass border
+AMBER = RgbColor(0xFB, 0xBF, 0x24)    # Amber warning
+ROSE = RgbColor(0xFB, 0x71, 0x85)     # Rose: importes pendientes, caídas
+ROSE_DARK = RgbColor(0x9F, 0x12, 0x39)  # Rose oscuro
+
+# Datos por defecto del deck (se pueden sobrescribir por cliente/trainer)
+DEFAULT_DECK_DATA = {
+    "trainer_name": "Christian",
+    "sessions": [
+        {"client": "María García", "time": "10:00 - 11:00", "type": "Personal"},
+        {"client": "Carlos Ruiz", "time": "11:30 - 12:30", "type": "Grupal"},
+    ],
+    "sessions_today": 6,
+    "sessions_week_done": 24,
+    "sessions_week_total": 28,
+    "clients": [
+        {"name": "Ana López", "sessions": 12, "adherence": 95},
+        {"name": "Pedro Martín", "sessions": 8, "adherence": 72},
+    ],
+    "clients_follow_up": 2,
+    "revenue": 2450000,
+    "revenue_month": "Enero",
+    "revenue_growth": 12,
+    "collected_pct": 85,
+    "pending_invoices": 3,
+    "adherence": 78,
+    "adherence_delta": 5,
+    "top_adherence": [
+        {"name": "María García", "adherence": 95},
+        {"name": "Ana López", "adherence": 92},
+        {"name": "Luis Moreno", "adherence": 89},
+    ],
+}
+
+# Contexto activo mientras se construye una plantilla de slide (ver SlideTemplateCache)
+_template_context = None
+
+# Ficheros leídos por el builder en curso (specs, imágenes) en un build incremental
+_input_files = None
+
+def _record_input_file(path):
+    if _input_files is not None:
+        _input_files.add(os.path.relpath(os.path.abspath(path), BASE_DIR))
+
+class _Slot(str):
+    """Placeholder text for a deck data value while a slide template is built
+
+    The text is a token like ⟦3⟧ that points at an entry of the template
+    context; formatting (f"{x:+}"), derived values (initials, short_name) and
+    scaling (x / 100) register new entries so the real value can be
+    recomputed when the template is patched.
+    """
+
+    def __new__(cls, index):
+        return super().__new__(cls, f"⟦{index}⟧")
+
+    def _derive(self, **changes):
+        return _template_context.derive_slot(self, **changes)
+
+    def __format__(self, spec):
+        return str(self._derive(spec=spec)) if spec else str(self)
+
+    def __truediv__(self, divisor):
+        return self._derive(scale=1 / divisor)
+
+def format_amount(amount, currency="$"):
+    """Format an amount with dot thousands separators: 2450000 -> $2.450.000"""
+    if isinstance(amount, _Slot):
+        return amount._derive(transform="format_amount")
+    if isinstance(amount, str):
+        return amount
+    return f"{currency}{int(round(amount)):,}".replace(",", ".")
+
+def initials(name):
+    """First letters of the first two words of a name: María García -> MG"""
+    if isinstance(name, _Slot):
+        return name._derive(transform="initials")
+    return "".join(word[0] for word in name.split()[:2]).upper()
+
+def short_name(name):
+    """Abbreviate the surname: María García -> María G."""
+    if isinstance(name, _Slot):
+        return name._derive(transform="short_name")
+    parts = name.split()
+    if len(parts) < 2:
+        return name
+    return f"{parts[0]} {parts[1][0]}."
+
+def adherence_badge_colors(adherence):
+    """Badge (background, text) colors for an adherence percentage"""
+    if isinstance(adherence, _Slot):
+        return tuple(_template_context.color_slot(adherence, adherence_badge_colors, i)
+                     for i in range(2))
+    if adherence >= 80:
+        return EMERALD, WHITE
+    return AMBER, DARK_BG
+
+def growth_label(growth):
+    """Signed percentage with an arrow for its direction: 12 -> +12% ↑"""
+    if isinstance(growth, _Slot):
+        return growth._derive(transform="growth_label")
+    if growth > 0:
+        return f"{growth:+}% ↑"
+    if growth < 0:
+        return f"{growth:+}% ↓"
+    return f"{growth}% →"
+
+def growth_badge_colors(growth):
+    """Badge (background, text) colors for a growth percentage"""
+    if isinstance(growth, _Slot):
+        return tuple(_template_context.color_slot(growth, growth_badge_colors, i)
+                     for i in range(2))
+    if growth > 0:
+        return EMERALD_DARK, EMERALD_GLOW
+    if growth < 0:
+        return ROSE_DARK, ROSE
+    return GRAY_DARK, GRAY_LIGHT
 
 def set_slide_background(slide, color):
     """Set slide background color"""
@@ -38,217 +222,1139 @@ def set_slide_background(slide, color):
     fill.solid()
     fill.fore_color.rgb = color
 
-def add_text_box(slide, left, top, width, height, text, font_size=18,
-                 font_color=WHITE, bold=False, alignment=PP_ALIGN.LEFT,
-                 font_name="Arial"):
-    """Add a text box to slide"""
-    txBox = slide.shapes.add_textbox(left, top, width, height)
-    tf = txBox.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    p.text = text
-    p.font.size = Pt(font_size)
-    p.font.color.rgb = font_color
-    p.font.bold = bold
-    p.font.name = font_name
-    p.alignment = alignment
-    return txBox
+# ═══════════════════════════════════════════════════════════════
+# ESTILOS DE TEXTO Y TEMA: registrados una vez, reutilizados por shape
+# ═══════════════════════════════════════════════════════════════
 
-def add_rounded_rectangle(slide, left, top, width, height, fill_color,
-                          transparency=0, line_color=None):
-    """Add a rounded rectangle shape"""
-    shape = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        left, top, width, height
-    )
+# Fuente del tema (major y minor): las cajas de texto en esta fuente la
+# heredan del tema y no repiten <a:latin> en cada párrafo.
+THEME_FONT = "Arial"
+
+class TextStyle(namedtuple("TextStyle", "font_size font_color bold font_name")):
+    """Font size, color, weight and face of a text box paragraph"""
+
+TEXT_STYLES = {}
+_DEFAULT_TEXT_STYLE = TextStyle(18, WHITE, False, THEME_FONT)
+
+def register_text_style(name, font_size=18, font_color=WHITE, bold=False,
+                        font_name=THEME_FONT):
+    """Register a named text style usable as add_text_box(..., style=name)"""
+    style = TEXT_STYLES[name] = TextStyle(font_size, font_color, bold, font_name)
+    return style
+
+register_text_style("card_title", 14, bold=True)
+register_text_style("body", 14)
+register_text_style("caption", 9, GRAY_LIGHT)
+register_text_style("badge", 9, DARK_BG, bold=True)
+register_text_style("stat_number", 28, bold=True)
+register_text_style("stat_label", 9, GRAY_LIGHT)
+
+def text_style(style=None, font_size=None, font_color=None, bold=None, font_name=None):
+    """Resolve a style name or TextStyle, replacing the fields that are not None"""
+    if isinstance(style, str):
+        style = TEXT_STYLES[style]
+    elif style is None:
+        style = _DEFAULT_TEXT_STYLE
+    return TextStyle(style.font_size if font_size is None else font_size,
+                     style.font_color if font_color is None else font_color,
+                     style.bold if bold is None else bold,
+                     style.font_name if font_name is None else font_name)
+
+@functools.lru_cache(maxsize=None)
+def _def_rpr_xml(style):
+    """a:defRPr markup of a text style, built once per distinct style"""
+    font_size, font_color, bold, font_name = style
+    bold_attr = ' b="1"' if bold else ''
+    latin = '' if font_name == THEME_FONT else f'<a:latin typeface="{_xml_escape(font_name)}"/>'
+    return (f'<a:defRPr sz="{Pt(font_size).centipoints}"{bold_attr}>'
+            f'<a:solidFill><a:srgbClr val="{font_color}"/></a:solidFill>{latin}</a:defRPr>')
+
+@functools.lru_cache(maxsize=None)
+def _def_rpr_element(style):
+    return parse_xml(_def_rpr_xml(style).replace("<a:defRPr ", f"<a:defRPr {_NSDECLS} ", 1))
+
+def apply_text_style(paragraph, style, alignment=PP_ALIGN.LEFT):
+    """Give a paragraph a registered style with one cached element clone"""
+    p_pr = paragraph._p.get_or_add_pPr()
+    p_pr.set("algn", PP_ALIGN.to_xml(alignment))
+    for def_rpr in p_pr.findall("a:defRPr", _XML_NS):
+        p_pr.remove(def_rpr)
+    p_pr.append(copy.deepcopy(_def_rpr_element(style)))
+
+@functools.lru_cache(maxsize=None)
+def _themed_blob(blob):
+    """Theme part bytes with THEME_FONT as major and minor latin font"""
+    theme = etree.fromstring(blob)
+    for latin in theme.iterfind("a:themeElements/a:fontScheme/*/a:latin", _XML_NS):
+        latin.set("typeface", THEME_FONT)
+    return etree.tostring(theme, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+def apply_theme(prs):
+    """Set the deck theme fonts once so text boxes can inherit them"""
+    for master in prs.slide_masters:
+        theme = master.part.part_related_by(RT.THEME)
+        theme.blob = _themed_blob(theme.blob)
+
+# ═══════════════════════════════════════════════════════════════
+# LAYOUT: filas, columnas y medición de texto memoizada
+# ═══════════════════════════════════════════════════════════════
+
+# Anchos de avance de Arial/Helvetica (milésimas de em) para ASCII 32..126.
+# Se usan cuando PIL o el fichero de la fuente no están disponibles.
+_ARIAL_WIDTHS = {
+    False: (278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+            556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+            1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+            667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+            333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+            556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584),
+    True: (278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+           556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+           975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+           667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+           333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+           611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584),
+}
+LINE_SPACING = 1.2
+FONT_DIRS = (
+    "/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"),
+    "/Library/Fonts", "/System/Library/Fonts/Supplemental", "C:\\Windows\\Fonts",
+)
+_FONT_FILES = {
+    ("Arial", False): ("Arial.ttf", "arial.ttf", "LiberationSans-Regular.ttf"),
+    ("Arial", True): ("Arial Bold.ttf", "arialbd.ttf", "LiberationSans-Bold.ttf"),
+}
+
+@functools.lru_cache(maxsize=None)
+def _font_file_index():
+    """File name → path of the fonts installed in FONT_DIRS"""
+    index = {}
+    for font_dir in FONT_DIRS:
+        for root, _, files in os.walk(font_dir):
+            for name in files:
+                index.setdefault(name, os.path.join(root, name))
+    return index
+
+@functools.lru_cache(maxsize=None)
+def _load_font(font_name, bold):
+    """PIL font at 1000 px (1 px = 1/1000 em), or None to use the width tables"""
+    candidates = _FONT_FILES.get((font_name, bold),
+                                 (f"{font_name} Bold.ttf" if bold else f"{font_name}.ttf",))
+    index = _font_file_index()
+    path = next((index[name] for name in candidates if name in index), None)
+    if path is None:
+        return None
+    try:
+        from PIL import ImageFont
+    except ImportError:
+        return None
+    return ImageFont.truetype(path, 1000)
+
+def _char_width(char, bold):
+    """Advance width of one character in 1/1000 em from the Arial tables"""
+    code = ord(char)
+    if 32 <= code <= 126:
+        return _ARIAL_WIDTHS[bold][code - 32]
+    base = unicodedata.normalize("NFD", char)[0]
+    if base != char and 32 <= ord(base) <= 126:
+        return _ARIAL_WIDTHS[bold][ord(base) - 32]
+    if unicodedata.category(char) in ("Mn", "Cf"):
+        return 0
+    if unicodedata.category(char) == "So" or unicodedata.east_asian_width(char) in "WF":
+        return 1000
+    return 556
+
+@functools.lru_cache(maxsize=8192)
+def measure_text(text, font_size, bold=False, font_name=THEME_FONT):
+    """(width, height) in inches of text set at font_size points, one line per \\n"""
+    if isinstance(text, _Slot):
+        # En una plantilla el texto real aún no se conoce: la slide se renderiza directa
+        raise TypeError("measure_text() no admite slots de plantilla")
+    font = _load_font(font_name, bold)
+    lines = str(text).split("\n")
+    if font is not None:
+        em_width = max(font.getlength(line) for line in lines)
+    else:
+        em_width = max(sum(_char_width(char, bold) for char in line) for line in lines)
+    points = font_size / 72
+    return em_width / 1000 * points, len(lines) * LINE_SPACING * points
+
+class _GlyphWidths(dict):
+    """Advance width (1/1000 em) per character of one font, measured on first use"""
+
+    def __init__(self, font_name, bold):
+        super().__init__()
+        self._font = _load_font(font_name, bold)
+        self._bold = bold
+
+    def __missing__(self, char):
+        width = self[char] = (self._font.getlength(char) if self._font is not None
+                              else _char_width(char, self._bold))
+        return width
+
+    def text_width(self, text):
+        """Width of text in 1/1000 em (sum of advances, no kerning)"""
+        return sum(self[char] for char in text)
+
+@functools.lru_cache(maxsize=None)
+def glyph_widths(font_name=THEME_FONT, bold=False):
+    """Glyph-width table of a font, shared by every fit in the process"""
+    return _GlyphWidths(font_name, bold)
+
+AUTO_FIT_MIN_SIZE = 6
+AUTO_FIT_STEP = 0.5
+
+@functools.lru_cache(maxsize=8192)
+def fit_font_size(text, width, height, max_size, min_size=AUTO_FIT_MIN_SIZE, bold=False,
+                  font_name=THEME_FONT):
+    """Largest size (pt, in AUTO_FIT_STEP steps) at which text fits width × height inches
+
+    Lines wrap at spaces and words are never split. The box always allows
+    one line, so text boxes drawn shorter than their font still fit on one
+    line. Returns min_size when nothing larger fits.
+    """
+    if isinstance(text, _Slot):
+        raise TypeError("fit_font_size() no admite slots de plantilla")
+    widths = glyph_widths(font_name, bold)
+    space = widths[" "]
+    paragraphs = [[widths.text_width(word) for word in line.split(" ")]
+                  for line in str(text).split("\n")]
+    longest = max(max(words) for words in paragraphs)
+
+    def fits(size):
+        max_em = width / (size / 72) * 1000
+        if longest > max_em:
+            return False
+        lines = 0
+        for words in paragraphs:
+            lines += 1
+            current = words[0]
+            for word in words[1:]:
+                if current + space + word <= max_em:
+                    current += space + word
+                else:
+                    lines += 1
+                    current = word
+        return lines <= max(1, int(height / (LINE_SPACING * size / 72)))
+
+    if fits(max_size):
+        return max_size
+    low, high = math.ceil(min_size / AUTO_FIT_STEP), math.ceil(max_size / AUTO_FIT_STEP) - 1
+    best = min_size
+    while low <= high:
+        middle = (low + high) // 2
+        if fits(middle * AUTO_FIT_STEP):
+            best, low = middle * AUTO_FIT_STEP, middle + 1
+        else:
+            high = middle - 1
+    return best
+
+def _edges(padding):
+    """(left, top, right, bottom) from a number, an (x, y) pair or a 4-tuple"""
+    if isinstance(padding, (int, float)):
+        return (padding,) * 4
+    if len(padding) == 2:
+        return (padding[0], padding[1]) * 2
+    return tuple(padding)
+
+class Box(namedtuple("Box", "left top width height")):
+    """Rectangle in inches computed by layout()"""
+
+    @property
+    def right(self):
+        return self.left + self.width
+
+    @property
+    def bottom(self):
+        return self.top + self.height
+
+    @property
+    def emu(self):
+        """(left, top, width, height) in EMU, ready for the shape helpers"""
+        return tuple(Emu(round(value * 914400)) for value in self)
+
+class _LayoutNode:
+    """Node of a layout tree: fixed or measured size, padding, gap and flex factors"""
+
+    horizontal = None
+
+    def __init__(self, *children, key=None, width=None, height=None, padding=0, gap=0,
+                 grow=0, shrink=1, align="stretch", justify="start"):
+        self.children = children
+        self.key = key
+        self.width = width
+        self.height = height
+        self.padding = _edges(padding)
+        self.gap = gap
+        self.grow = grow
+        self.shrink = shrink
+        self.align = align
+        self.justify = justify
+
+    def natural_size(self):
+        """(width, height) before the parent grows or shrinks it"""
+        left, top, right, bottom = self.padding
+        sizes = [child.natural_size() for child in self.children]
+        if self.horizontal is None:
+            inner = (max((w for w, _ in sizes), default=0), max((h for _, h in sizes), default=0))
+        else:
+            main = sum(s[0 if self.horizontal else 1] for s in sizes)
+            main += self.gap * max(0, len(sizes) - 1)
+            cross = max((s[1 if self.horizontal else 0] for s in sizes), default=0)
+            inner = (main, cross) if self.horizontal else (cross, main)
+        return (self.width if self.width is not None else inner[0] + left + right,
+                self.height if self.height is not None else inner[1] + top + bottom)
+
+    def _cross(self, start, size, natural):
+        """Offset and size of a child on the cross axis according to align"""
+        if self.align == "stretch":
+            return start, size
+        offset = {"start": 0, "center": (size - natural) / 2, "end": size - natural}[self.align]
+        return start + offset, natural
+
+    def place(self, box, boxes):
+        if self.key is not None:
+            boxes[self.key] = box
+        if not self.children:
+            return
+        pad_left, pad_top, pad_right, pad_bottom = self.padding
+        x, y = box.left + pad_left, box.top + pad_top
+        width = box.width - pad_left - pad_right
+        height = box.height - pad_top - pad_bottom
+        if self.horizontal is None:
+            for child in self.children:
+                cw, ch = child.natural_size()
+                cx, cw = self._cross(x, width, cw)
+                cy, ch = self._cross(y, height, ch)
+                child.place(Box(cx, cy, cw, ch), boxes)
+            return
+
+        axis = 0 if self.horizontal else 1
+        available = width if self.horizontal else height
+        naturals = [child.natural_size() for child in self.children]
+        mains = [size[axis] for size in naturals]
+        free = available - sum(mains) - self.gap * (len(mains) - 1)
+        gap, offset = self.gap, 0
+        if free > 0 and any(child.grow for child in self.children):
+            total = sum(child.grow for child in self.children)
+            mains = [m + free * child.grow / total for m, child in zip(mains, self.children)]
+        elif free > 0:
+            if self.justify == "between" and len(mains) > 1:
+                gap += free / (len(mains) - 1)
+            else:
+                offset = {"start": 0, "center": free / 2, "end": free}[self.justify]
+        elif free < 0:
+            # Desborde: cada hijo cede espacio en proporción a su tamaño y su shrink
+            weights = [m * child.shrink for m, child in zip(mains, self.children)]
+            total = sum(weights) or 1
+            mains = [max(0, m + free * w / total) for m, w in zip(mains, weights)]
+
+        position = (x if self.horizontal else y) + offset
+        for child, main, natural in zip(self.children, mains, naturals):
+            if self.horizontal:
+                cy, ch = self._cross(y, height, natural[1])
+                child.place(Box(position, cy, main, ch), boxes)
+            else:
+                cx, cw = self._cross(x, width, natural[0])
+                child.place(Box(cx, position, cw, main), boxes)
+            position += main + gap
+
+class Row(_LayoutNode):
+    """Children side by side, left to right"""
+    horizontal = True
+
+class Column(_LayoutNode):
+    """Children stacked top to bottom"""
+    horizontal = False
+
+class Stack(_LayoutNode):
+    """Children overlaid in the same box (card background + content)"""
+
+class Spacer(_LayoutNode):
+    """Empty node with a fixed size or a grow factor"""
+
+class Text(_LayoutNode):
+    """Leaf sized by its measured text plus padding"""
+
+    def __init__(self, text, font_size, bold=False, font_name=THEME_FONT, **options):
+        super().__init__(**options)
+        self.text = text
+        self.font_size = font_size
+        self.bold = bold
+        self.font_name = font_name
+
+    def natural_size(self):
+        left, top, right, bottom = self.padding
+        width, height = measure_text(self.text, self.font_size, self.bold, self.font_name)
+        return (self.width if self.width is not None else width + left + right,
+                self.height if self.height is not None else height + top + bottom)
+
+def layout(node, left, top, width=None, height=None):
+    """Position a layout tree at (left, top) inches; returns {key: Box}"""
+    natural_width, natural_height = node.natural_size()
+    boxes = {}
+    node.place(Box(left, top, natural_width if width is None else width,
+                   natural_height if height is None else height), boxes)
+    return boxes
+
+# ═══════════════════════════════════════════════════════════════
+# EMISOR RÁPIDO: p:sp construidos directamente con lxml
+# ═══════════════════════════════════════════════════════════════
+
+# Con FAST_EMIT los helpers generan el XML de cada shape en una pasada en
+# lugar de ir propiedad a propiedad por los proxies de python-pptx.
+# El XML resultante es idéntico al del camino normal.
+FAST_EMIT = False
+
+_NSDECLS = (
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+_SHAPE_STYLE_XML = (
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+)
+
+def _xml_escape(text):
+    """Escape &, < and > like xml.sax.saxutils.escape"""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def use_fast_emitter(enabled=True):
+    """Switch the shape helpers to the direct lxml emitter"""
+    global FAST_EMIT
+    FAST_EMIT = enabled
+
+def _next_shape_id(shapes):
+    """Next free shape id, without rescanning the tree after our own emissions"""
+    sp_tree = shapes._spTree
+    last = getattr(shapes, "_fast_last_id", None)
+    if last is not None and sp_tree[-1][0][0].get("id") == str(last):
+        return last + 1
+    return shapes._next_shape_id
+
+def _append_sp(slide, shape_id, sp_xml):
+    """Parse one p:sp and append it to the slide's shape tree"""
+    shapes = slide.shapes
+    sp = parse_xml(sp_xml)
+    shapes._spTree.append(sp)
+    shapes._fast_last_id = shape_id
+    return shapes._shape_factory(sp)
+
+def _xfrm_xml(left, top, width, height):
+    return (f'<a:xfrm><a:off x="{int(left)}" y="{int(top)}"/>'
+            f'<a:ext cx="{int(width)}" cy="{int(height)}"/></a:xfrm>')
+
+def _emit_autoshape(slide, autoshape, left, top, width, height, fill_color,
+                    line_color=None, line_width=None):
+    """Build an auto shape p:sp (geometry, fill, line) as one lxml element"""
+    shape_type = AutoShapeType(autoshape)
+    shape_id = _next_shape_id(slide.shapes)
+    if line_color is None:
+        line_xml = '<a:ln><a:noFill/></a:ln>'
+    else:
+        width_attr = f' w="{int(line_width)}"' if line_width is not None else ''
+        line_xml = (f'<a:ln{width_attr}><a:solidFill><a:srgbClr val="{line_color}"/>'
+                    f'</a:solidFill></a:ln>')
+    return _append_sp(slide, shape_id, (
+        f'<p:sp {_NSDECLS}><p:nvSpPr>'
+        f'<p:cNvPr id="{shape_id}" name="{shape_type.basename} {shape_id - 1}"/>'
+        f'<p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr>{_xfrm_xml(left, top, width, height)}'
+        f'<a:prstGeom prst="{shape_type.prst}"><a:avLst/></a:prstGeom>'
+        f'<a:solidFill><a:srgbClr val="{fill_color}"/></a:solidFill>{line_xml}</p:spPr>'
+        f'{_SHAPE_STYLE_XML}<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/>'
+        f'<a:p><a:pPr algn="ctr"/></a:p></p:txBody></p:sp>'
+    ))
+
+def _emit_text_box(slide, left, top, width, height, text, style, alignment):
+    """Build a single-paragraph text box p:sp as one lxml element"""
+    shape_id = _next_shape_id(slide.shapes)
+    lines = text.replace("\v", "\n").split("\n") if text else []
+    runs = "<a:br/>".join(f"<a:r><a:t>{_xml_escape(line)}</a:t></a:r>" if line else ""
+                          for line in lines)
+    return _append_sp(slide, shape_id, (
+        f'<p:sp {_NSDECLS}><p:nvSpPr>'
+        f'<p:cNvPr id="{shape_id}" name="TextBox {shape_id - 1}"/>'
+        f'<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr><p:spPr>'
+        f'{_xfrm_xml(left, top, width, height)}'
+        f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+        f'<p:txBody><a:bodyPr wrap="square"><a:spAutoFit/></a:bodyPr><a:lstStyle/>'
+        f'<a:p><a:pPr algn="{PP_ALIGN.to_xml(alignment)}">{_def_rpr_xml(style)}</a:pPr>'
+        f'{runs}</a:p></p:txBody></p:sp>'
+    ))
+
+def add_autoshape(slide, autoshape, left, top, width, height, fill_color,
+                  line_color=None, line_width=None):
+    """Add a solid-filled auto shape; no outline unless line_color is given"""
+    if FAST_EMIT:
+        return _emit_autoshape(slide, autoshape, left, top, width, height, fill_color,
+                               line_color, line_width)
+    shape = slide.shapes.add_shape(autoshape, left, top, width, height)
     shape.fill.solid()
     shape.fill.fore_color.rgb = fill_color
     if line_color:
         shape.line.color.rgb = line_color
+        if line_width is not None:
+            shape.line.width = line_width
     else:
         shape.line.fill.background()
     return shape
 
+# Márgenes internos por defecto de un text box (izquierda/derecha, arriba/abajo)
+TEXT_BOX_INSETS = (Inches(0.1), Inches(0.05))
+
+def _fitted_style(style, text, width, height):
+    """style with the largest font size at which text fits the text box"""
+    size = fit_font_size(text, Emu(width - 2 * TEXT_BOX_INSETS[0]).inches,
+                         Emu(height - 2 * TEXT_BOX_INSETS[1]).inches, style.font_size,
+                         bold=style.bold, font_name=style.font_name)
+    return style if size == style.font_size else style._replace(font_size=size)
+
+def add_text_box(slide, left, top, width, height, text, font_size=None,
+                 font_color=None, bold=None, alignment=PP_ALIGN.LEFT,
+                 font_name=None, style=None, auto_fit=False):
+    """Add a text box to slide; explicit font arguments override the style
+
+    With auto_fit the font size (the style's, as a maximum) shrinks until
+    the text fits the box, measured with the font's glyph widths.
+    """
+    style = text_style(style, font_size=font_size, font_color=font_color, bold=bold,
+                       font_name=font_name)
+    # En una plantilla el texto real aún no existe: se ajusta al parchear
+    deferred_fit = auto_fit and _template_context is not None and "⟦" in text
+    if auto_fit and text and not deferred_fit:
+        style = _fitted_style(style, text, width, height)
+    if FAST_EMIT:
+        txBox = _emit_text_box(slide, left, top, width, height, text, style, alignment)
+    else:
+        txBox = slide.shapes.add_textbox(left, top, width, height)
+        tf = txBox.text_frame
+        tf.word_wrap = True
+        p = tf.paragraphs[0]
+        p.text = text
+        apply_text_style(p, style, alignment)
+    if deferred_fit:
+        _template_context.fit_slot(txBox.shape_id, style, width, height)
+    return txBox
+
+def add_rounded_rectangle(slide, left, top, width, height, fill_color,
+                          transparency=0, line_color=None):
+    """Add a rounded rectangle shape"""
+    return add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height,
+                         fill_color, line_color)
+
 def add_circle(slide, left, top, size, fill_color):
     """Add a circle shape"""
-    shape = slide.shapes.add_shape(
-        MSO_SHAPE.OVAL,
-        left, top, size, size
-    )
-    shape.fill.solid()
-    shape.fill.fore_color.rgb = fill_color
-    shape.line.fill.background()
-    return shape
+    return add_autoshape(slide, MSO_SHAPE.OVAL, left, top, size, size, fill_color)
 
 def add_arrow(slide, left, top, width, height, fill_color):
     """Add an arrow shape"""
-    shape = slide.shapes.add_shape(
-        MSO_SHAPE.RIGHT_ARROW,
-        left, top, width, height
+    return add_autoshape(slide, MSO_SHAPE.RIGHT_ARROW, left, top, width, height, fill_color)
+
+# ═══════════════════════════════════════════════════════════════
+# EFECTOS NATIVOS: sombra, glow y degradado DrawingML en un solo shape
+# ═══════════════════════════════════════════════════════════════
+
+# Con NATIVE_EFFECTS las glass cards dejan de apilar sombra + glow + card como
+# shapes separados (y el título como text box) y los badges llevan el texto en
+# su propio shape: menos shapes por slide, ficheros más pequeños y PowerPoint
+# abre y pinta antes. El aspecto es equivalente, no idéntico al XML clásico.
+NATIVE_EFFECTS = False
+
+SHADOW_OFFSET = Inches(0.08)
+GLOW_RADIUS = Inches(0.04)
+GLOW_ALPHA = 60  # % de opacidad del glow
+GLASS_GRADIENT_LIGHTEN = 8  # % más claro arriba del degradado
+# Márgenes del título dentro de la card: posición del text box clásico + su inset
+CARD_TITLE_INSETS = (Inches(0.25), Inches(0.3), Inches(0.25), Inches(0.05))
+
+def use_native_effects(enabled=True):
+    """Draw glass cards and badges with native DrawingML effects (fewer shapes)"""
+    global NATIVE_EFFECTS, _renderer_version
+    if enabled != NATIVE_EFFECTS:
+        NATIVE_EFFECTS = enabled
+        # Otras slides: las plantillas y manifiestos del modo anterior no valen
+        TEMPLATE_CACHE.clear()
+        _renderer_version = None
+
+def _init_worker(fast_emit, native_effects):
+    """Process pool initializer: carry the emitter and effects modes into workers"""
+    use_fast_emitter(fast_emit)
+    use_native_effects(native_effects)
+
+@functools.lru_cache(maxsize=64)
+def _glass_fill_xml(accent_color):
+    """gradFill + effectLst of a native glass card, keyed by accent color"""
+    lighten = GLASS_GRADIENT_LIGHTEN * 1000
+    shadow_dist = int(SHADOW_OFFSET * math.sqrt(2))
+    return (
+        f'<a:gradFill {_NSDECLS} rotWithShape="1"><a:gsLst>'
+        f'<a:gs pos="0"><a:srgbClr val="{GLASS_BG}"><a:lumMod val="{100000 - lighten}"/>'
+        f'<a:lumOff val="{lighten}"/></a:srgbClr></a:gs>'
+        f'<a:gs pos="100000"><a:srgbClr val="{GLASS_BG}"/></a:gs></a:gsLst>'
+        f'<a:lin ang="5400000" scaled="0"/></a:gradFill>',
+        f'<a:effectLst {_NSDECLS}>'
+        f'<a:glow rad="{int(GLOW_RADIUS)}"><a:srgbClr val="{accent_color}">'
+        f'<a:alpha val="{GLOW_ALPHA * 1000}"/></a:srgbClr></a:glow>'
+        f'<a:outerShdw dist="{shadow_dist}" dir="2700000" algn="tl" rotWithShape="0">'
+        f'<a:srgbClr val="{DARK_BG_2}"/></a:outerShdw></a:effectLst>',
     )
-    shape.fill.solid()
-    shape.fill.fore_color.rgb = fill_color
-    shape.line.fill.background()
-    return shape
+
+def _native_glass_card(slide, left, top, width, height, accent_color, text):
+    card = add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height,
+                         GLASS_BG, line_color=GLASS_BORDER, line_width=Pt(1))
+    sp_pr = card._element.spPr
+    fill_xml, effects_xml = _glass_fill_xml(accent_color)
+    sp_pr.replace(sp_pr.find("a:solidFill", _XML_NS), parse_xml(fill_xml))
+    sp_pr.find("a:ln", _XML_NS).addnext(parse_xml(effects_xml))
+
+    # Acento superior: sigue siendo un shape, lo demás va en la card
+    add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE,
+                  left + Inches(0.1), top + Inches(0.1),
+                  width - Inches(0.2), Inches(0.06), accent_color)
+    if text:
+        _set_shape_text(card, text, text_style("card_title", font_color=accent_color),
+                        PP_ALIGN.LEFT, MSO_ANCHOR.TOP, CARD_TITLE_INSETS)
+    return card
+
+def _set_shape_text(shape, text, style, alignment, anchor=None, insets=None):
+    """Put a styled paragraph inside an auto shape instead of a separate text box"""
+    tf = shape.text_frame
+    tf.word_wrap = True
+    if anchor is not None:
+        tf.vertical_anchor = anchor
+    if insets is not None:
+        tf.margin_left, tf.margin_top, tf.margin_right, tf.margin_bottom = insets
+    p = tf.paragraphs[0]
+    p.text = text
+    apply_text_style(p, style, alignment)
 
 def add_glass_card(slide, left, top, width, height, accent_color, title="", icon=""):
     """Create a glassmorphism card with glow effect and accent border"""
+    text = f"{icon}  {title}" if icon else title
+    if NATIVE_EFFECTS:
+        return _native_glass_card(slide, left, top, width, height, accent_color, text)
+
     # Shadow layer (offset behind)
-    shadow = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        left + Inches(0.08), top + Inches(0.08), width, height
-    )
-    shadow.fill.solid()
-    shadow.fill.fore_color.rgb = DARK_BG_2
-    shadow.line.fill.background()
+    add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE,
+                  left + Inches(0.08), top + Inches(0.08), width, height, DARK_BG_2)
 
     # Glow layer (subtle colored glow)
-    glow = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        left - Inches(0.02), top - Inches(0.02),
-        width + Inches(0.04), height + Inches(0.04)
-    )
-    glow.fill.solid()
-    glow.fill.fore_color.rgb = accent_color
-    glow.line.fill.background()
+    add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE,
+                  left - Inches(0.02), top - Inches(0.02),
+                  width + Inches(0.04), height + Inches(0.04), accent_color)
 
     # Main glass card
-    card = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        left, top, width, height
-    )
-    card.fill.solid()
-    card.fill.fore_color.rgb = GLASS_BG
-    card.line.color.rgb = GLASS_BORDER
-    card.line.width = Pt(1)
+    card = add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height,
+                         GLASS_BG, line_color=GLASS_BORDER, line_width=Pt(1))
 
     # Top accent bar
-    accent_bar = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        left + Inches(0.1), top + Inches(0.1),
-        width - Inches(0.2), Inches(0.06)
-    )
-    accent_bar.fill.solid()
-    accent_bar.fill.fore_color.rgb = accent_color
-    accent_bar.line.fill.background()
+    add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE,
+                  left + Inches(0.1), top + Inches(0.1),
+                  width - Inches(0.2), Inches(0.06), accent_color)
 
     # Title with icon
-    if icon or title:
+    if text:
         add_text_box(slide, left + Inches(0.15), top + Inches(0.25),
-                     width - Inches(0.3), Inches(0.4),
-                     f"{icon}  {title}" if icon else title,
-                     font_size=14, font_color=accent_color, bold=True)
+                     width - Inches(0.3), Inches(0.4), text,
+                     font_color=accent_color, style="card_title")
 
     return card
 
 def add_mini_card(slide, left, top, width, height, bg_color=None):
     """Create a mini inner card"""
-    card = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        left, top, width, height
-    )
-    card.fill.solid()
-    card.fill.fore_color.rgb = bg_color or RgbColor(0x16, 0x16, 0x22)
-    card.line.color.rgb = RgbColor(0x2D, 0x2D, 0x3D)
-    card.line.width = Pt(0.5)
-    return card
+    return add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height,
+                         bg_color or RgbColor(0x16, 0x16, 0x22),
+                         line_color=RgbColor(0x2D, 0x2D, 0x3D), line_width=Pt(0.5))
 
 def add_badge(slide, left, top, width, height, bg_color, text, text_color=None):
     """Create a small badge/pill"""
-    badge = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        left, top, width, height
-    )
-    badge.fill.solid()
-    badge.fill.fore_color.rgb = bg_color
-    badge.line.fill.background()
+    badge = add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height,
+                          bg_color)
+    if NATIVE_EFFECTS:
+        _set_shape_text(badge, text, text_style("badge", font_color=text_color),
+                        PP_ALIGN.CENTER)
+        return badge
 
     add_text_box(slide, left, top, width, height,
-                 text, font_size=9, font_color=text_color or DARK_BG,
-                 bold=True, alignment=PP_ALIGN.CENTER)
+                 text, font_color=text_color, style="badge", alignment=PP_ALIGN.CENTER)
     return badge
 
 def add_progress_bar(slide, left, top, width, height, progress, bg_color, fill_color):
     """Create a progress bar"""
     # Background
-    bg = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        left, top, width, height
-    )
-    bg.fill.solid()
-    bg.fill.fore_color.rgb = bg_color
-    bg.line.fill.background()
+    bg = add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height,
+                       bg_color)
 
     # Fill
-    fill_width = width * progress
+    if isinstance(progress, _Slot):
+        # Plantilla: se dibuja a ancho completo y el ancho real se parchea al clonar
+        fill_width = width
+    else:
+        fill_width = width * progress
     if fill_width > Inches(0.1):
-        fill = slide.shapes.add_shape(
-            MSO_SHAPE.ROUNDED_RECTANGLE,
-            left, top, fill_width, height
-        )
-        fill.fill.solid()
-        fill.fill.fore_color.rgb = fill_color
-        fill.line.fill.background()
+        fill = add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE, left, top, fill_width, height,
+                             fill_color)
+        if isinstance(progress, _Slot):
+            _template_context.width_slot(fill.shape_id, progress, width)
 
     return bg
 
 def add_stat_number(slide, left, top, number, label, color):
     """Add a big stat number with label"""
     add_text_box(slide, left, top, Inches(1.5), Inches(0.5),
-                 number, font_size=28, font_color=color, bold=True,
-                 alignment=PP_ALIGN.CENTER)
+                 number, font_color=color, style="stat_number", alignment=PP_ALIGN.CENTER)
     add_text_box(slide, left, top + Inches(0.4), Inches(1.5), Inches(0.3),
-                 label, font_size=9, font_color=GRAY_LIGHT,
-                 alignment=PP_ALIGN.CENTER)
+                 label, style="stat_label", alignment=PP_ALIGN.CENTER)
 
-def create_slide_1(prs):
-    """Slide 1: Apertura y Re-encuadre"""
-    slide_layout = prs.slide_layouts[6]  # Blank layout
-    slide = prs.slides.add_slide(slide_layout)
-    set_slide_background(slide, DARK_BG)
+# ═══════════════════════════════════════════════════════════════
+# IMÁGENES: redimensionado, recompresión y caché por contenido
+# ═══════════════════════════════════════════════════════════════
 
-    # Logo REVIVE (texto estilizado)
-    add_text_box(slide, Inches(3.5), Inches(1.5), Inches(6), Inches(1),
-                 "RƎVIVE", font_size=72, font_color=EMERALD, bold=True,
-                 alignment=PP_ALIGN.CENTER)
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "images")
+IMAGE_DPI = 150
+JPEG_QUALITY = 85
 
-    # Subtítulo
-    add_text_box(slide, Inches(2), Inches(2.6), Inches(9), Inches(0.6),
-                 "Nueva Etapa", font_size=32, font_color=WHITE, bold=False,
-                 alignment=PP_ALIGN.CENTER)
+_file_hashes = {}
 
-    # Mensaje clave
-    add_text_box(slide, Inches(2), Inches(3.5), Inches(9), Inches(0.5),
-                 '"Del experimento al activo comercial"',
-                 font_size=24, font_color=VIOLET, bold=False,
-                 alignment=PP_ALIGN.CENTER)
+def _file_content_hash(path):
+    """SHA-256 of a file, memoized by (path, mtime, size)"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _file_hashes.get(key)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = _file_hashes[key] = hashlib.sha256(f.read()).hexdigest()
+    return digest
 
-    # Timeline de evolución
-    # Fase 1: Chatbot
-    add_rounded_rectangle(slide, Inches(1.5), Inches(4.8), Inches(2.2), Inches(0.8), GRAY_DARK)
-    add_text_box(slide, Inches(1.5), Inches(4.85), Inches(2.2), Inches(0.7),
-                 "Chatbot", font_size=16, font_color=GRAY_LIGHT,
-                 alignment=PP_ALIGN.CENTER)
+def prepare_image(path, width, height, dpi=IMAGE_DPI):
+    """Return a cached copy of an image sized for a width x height (EMU) placement
 
-    # Flecha 1
-    add_arrow(slide, Inches(3.8), Inches(5), Inches(0.6), Inches(0.4), GRAY_DARK)
+    The image is downscaled to the placed size at `dpi` (never upscaled) and
+    recompressed: photos without transparency become JPEG, flat artwork and
+    anything with alpha becomes an optimized PNG. Results are cached on disk
+    by content hash + target size, so every deck that places the same image
+    at the same size gets the same bytes, which python-pptx then stores once
+    per package.
+    """
+    from PIL import Image, ImageOps
 
-    # Fase 2: Aprendizaje
-    add_rounded_rectangle(slide, Inches(4.5), Inches(4.8), Inches(2.2), Inches(0.8), GRAY_DARK)
-    add_text_box(slide, Inches(4.5), Inches(4.85), Inches(2.2), Inches(0.7),
-                 "Aprendizaje", font_size=16, font_color=GRAY_LIGHT,
-                 alignment=PP_ALIGN.CENTER)
+    _record_input_file(path)
+    target = (max(1, round(width / 914400 * dpi)), max(1, round(height / 914400 * dpi)))
+    stem = f"{_file_content_hash(path)[:20]}_{target[0]}x{target[1]}"
+    for ext in (".png", ".jpg"):
+        cached = os.path.join(IMAGE_CACHE_DIR, stem + ext)
+        if os.path.exists(cached):
+            return cached
 
-    # Flecha 2
-    add_arrow(slide, Inches(6.8), Inches(5), Inches(0.6), Inches(0.4), EMERALD)
+    with Image.open(path) as source:
+        img = ImageOps.exif_transpose(source)
+        size = (min(target[0], img.width), min(target[1], img.height))
+        if size != img.size:
+            img = img.resize(size, Image.LANCZOS)
+        has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+        if has_alpha:
+            alpha = img.convert("RGBA").getchannel("A")
+            has_alpha = alpha.getextrema()[0] < 255
+        flat = img.getcolors(maxcolors=4096) is not None
+        os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+        if has_alpha or flat:
+            cached, fmt, options = os.path.join(IMAGE_CACHE_DIR, stem + ".png"), "PNG", {
+                "optimize": True}
+            if not has_alpha:
+                img = img.convert("RGB")
+        else:
+            cached, fmt, options = os.path.join(IMAGE_CACHE_DIR, stem + ".jpg"), "JPEG", {
+                "quality": JPEG_QUALITY, "optimize": True, "progressive": True}
+            img = img.convert("RGB")
+        # Escritura atómica: varios workers pueden preparar la misma imagen
+        tmp_path = f"{cached}.{os.getpid()}.tmp"
+        img.save(tmp_path, fmt, **options)
+        os.replace(tmp_path, cached)
+    return cached
 
-    # Fase 3: Plataforma (destacada)
-    add_rounded_rectangle(slide, Inches(7.5), Inches(4.8), Inches(3.2), Inches(0.8), EMERALD)
-    add_text_box(slide, Inches(7.5), Inches(4.85), Inches(3.2), Inches(0.7),
-                 "Plataforma Profesional", font_size=16, font_color=DARK_BG, bold=True,
-                 alignment=PP_ALIGN.CENTER)
+def add_image(slide, path, left, top, width, height, dpi=IMAGE_DPI):
+    """Add a picture resized and recompressed for its placed size"""
+    return slide.shapes.add_picture(prepare_image(path, width, height, dpi),
+                                    left, top, width, height)
+
+# ═══════════════════════════════════════════════════════════════
+# GRÁFICOS NATIVOS: series → un único chart de PowerPoint
+# ═══════════════════════════════════════════════════════════════
+
+# Un gráfico con cientos de puntos es un solo graphicFrame + chart part, en
+# lugar de cientos de rectángulos. NumPy es opcional: si está instalado las
+# escalas se calculan vectorizadas y se aceptan arrays/series directamente.
+CHART_FONT_SIZE = 9
+CHART_MAX_TICKS = 5
+_NICE_STEPS = (1, 2, 2.5, 5, 10)
+_C_NS = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+
+@functools.lru_cache(maxsize=None)
+def _chart_data_classes():
+    """(CategoryChartData, static subclass), imported on first use (pulls in XlsxWriter)"""
+    from pptx.chart.data import CategoryChartData
+
+    class _StaticChartData(CategoryChartData):
+        """Chart data without the embedded Excel workbook (saves XlsxWriter time and bytes)"""
+
+        @property
+        def xlsx_blob(self):
+            return b""
+
+    return CategoryChartData, _StaticChartData
+
+def _chart_values(values):
+    """Plain list of floats (None for NaN) from a sequence, NumPy array or pandas series"""
+    tolist = getattr(values, "tolist", None)
+    return [None if v is None or v != v else float(v)
+            for v in (tolist() if tolist else values)]
+
+def _value_range(values):
+    """(min, max) of the finite values; vectorized when NumPy is available"""
+    try:
+        import numpy as np
+    except ImportError:
+        finite = [v for v in _chart_values(values) if v is not None and math.isfinite(v)]
+        return (min(finite), max(finite)) if finite else (0.0, 1.0)
+    array = np.asarray(values, dtype=float)
+    array = array[np.isfinite(array)]
+    if not array.size:
+        return 0.0, 1.0
+    return float(array.min()), float(array.max())
+
+def chart_scale(values, max_ticks=CHART_MAX_TICKS, include_zero=True):
+    """(minimum, maximum, major_unit) of a value axis with round tick steps"""
+    low, high = _value_range(values)
+    if include_zero:
+        low, high = min(low, 0.0), max(high, 0.0)
+    if high == low:
+        high = low + 1
+    raw_step = (high - low) / max(1, max_ticks)
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in _NICE_STEPS if raw_step <= m * magnitude)
+    return math.floor(low / step) * step, math.ceil(high / step) * step, step
+
+def _chart_data(categories, series, editable):
+    editable_class, static_class = _chart_data_classes()
+    chart_data = editable_class() if editable else static_class()
+    chart_data.categories = categories
+    for name, values in series:
+        chart_data.add_series(name, _chart_values(values))
+    return chart_data
+
+def _add_chart(slide, chart_type, left, top, width, height, chart_data, editable):
+    chart = slide.shapes.add_chart(chart_type, left, top, width, height, chart_data).chart
+    chart_space = chart._chartSpace
+    if not editable:
+        r_id = chart_space.externalData.rId
+        chart_space._remove_externalData()
+        chart.part.drop_rel(r_id)
+    # Fondo y borde transparentes para que el chart se integre en el tema oscuro
+    chart_space.chart.addnext(parse_xml(
+        f'<c:spPr xmlns:c="{_C_NS}" xmlns:a="{_XML_NS["a"]}">'
+        '<a:noFill/><a:ln><a:noFill/></a:ln></c:spPr>'))
+    chart.has_legend = False
+    chart.has_title = False
+    chart.font.size = Pt(CHART_FONT_SIZE)
+    chart.font.color.rgb = GRAY_LIGHT
+    chart.font.name = "Arial"
+    return chart
+
+def _fill_plot_area(chart):
+    """Make the plot area cover the whole chart frame (no automatic margins)"""
+    plot_area = chart._chartSpace.chart.plotArea
+    layout = plot_area.find("c:layout", {"c": _C_NS})
+    if layout is not None:
+        plot_area.remove(layout)
+    plot_area.insert(0, parse_xml(
+        f'<c:layout xmlns:c="{_C_NS}"><c:manualLayout><c:layoutTarget val="inner"/>'
+        '<c:xMode val="edge"/><c:yMode val="edge"/>'
+        '<c:x val="0"/><c:y val="0"/><c:w val="1"/><c:h val="1"/></c:manualLayout>'
+        '</c:layout>'))
+
+def _style_axes(chart, values, axes, minimum, maximum):
+    low, high, step = chart_scale(values)
+    value_axis = chart.value_axis
+    value_axis.minimum_scale = low if minimum is None else minimum
+    value_axis.maximum_scale = high if maximum is None else maximum
+    value_axis.major_unit = step
+    value_axis.has_major_gridlines = axes
+    if axes:
+        value_axis.major_gridlines.format.line.color.rgb = GRAY_DARK
+    value_axis.format.line.fill.background()
+    category_axis = chart.category_axis
+    category_axis.format.line.color.rgb = GRAY_DARK
+    value_axis.visible = category_axis.visible = axes
+    if not axes:
+        _fill_plot_area(chart)
+
+def add_bar_chart(slide, left, top, width, height, values, categories=None,
+                  color=EMERALD, axes=True, gap_width=60, minimum=None, maximum=None,
+                  editable=False):
+    """Add a native column chart of one series"""
+    values = _chart_values(values)
+    categories = categories if categories is not None else [str(i + 1) for i in
+                                                            range(len(values))]
+    chart = _add_chart(slide, XL_CHART_TYPE.COLUMN_CLUSTERED, left, top, width, height,
+                       _chart_data(categories, [("Serie", values)], editable), editable)
+    plot = chart.plots[0]
+    plot.gap_width = gap_width
+    plot.vary_by_categories = False
+    fill = plot.series[0].format.fill
+    fill.solid()
+    fill.fore_color.rgb = color
+    _style_axes(chart, values, axes, minimum, maximum)
+    return chart
+
+def add_line_chart(slide, left, top, width, height, series, categories=None,
+                   colors=(EMERALD, BLUE, VIOLET, CYAN, PINK), axes=True, smooth=False,
+                   minimum=None, maximum=None, editable=False):
+    """Add a native line chart; series is a sequence of values or a {name: values} dict"""
+    if not isinstance(series, dict):
+        series = {"Serie": series}
+    series = {name: _chart_values(values) for name, values in series.items()}
+    longest = max(len(values) for values in series.values())
+    categories = categories if categories is not None else [str(i + 1) for i in
+                                                            range(longest)]
+    chart = _add_chart(slide, XL_CHART_TYPE.LINE, left, top, width, height,
+                       _chart_data(categories, series.items(), editable), editable)
+    for i, plot_series in enumerate(chart.plots[0].series):
+        plot_series.smooth = smooth
+        plot_series.marker.style = XL_MARKER_STYLE.NONE
+        line = plot_series.format.line
+        line.color.rgb = colors[i % len(colors)]
+        line.width = Pt(2)
+    all_values = [v for values in series.values() for v in values if v is not None]
+    _style_axes(chart, all_values, axes, minimum, maximum)
+    if len(series) > 1:
+        chart.has_legend = True
+        chart.legend.include_in_layout = False
+    return chart
+
+def add_gauge(slide, left, top, size, progress, fill_color, track_color=GRAY_DARK,
+              label=None, hole_size=75, editable=False):
+    """Add a ring gauge (native doughnut chart) filled to progress (0-1)"""
+    progress = min(max(float(progress), 0.0), 1.0)
+    chart = _add_chart(slide, XL_CHART_TYPE.DOUGHNUT, left, top, size, size,
+                       _chart_data(["valor", "resto"], [("Progreso", (progress, 1 - progress))],
+                                   editable), editable)
+    plot = chart.plots[0]
+    plot.vary_by_categories = True
+    plot._element.find("c:holeSize", {"c": _C_NS}).set("val", str(hole_size))
+    for point, color in zip(plot.series[0].points, (fill_color, track_color)):
+        point.format.fill.solid()
+        point.format.fill.fore_color.rgb = color
+        point.format.line.fill.background()
+    _fill_plot_area(chart)
+    if label is not None:
+        add_text_box(slide, left, top + size / 2 - Inches(0.25), size, Inches(0.5),
+                     label, font_size=14, font_color=WHITE, bold=True,
+                     alignment=PP_ALIGN.CENTER)
+    return chart
+
+# ═══════════════════════════════════════════════════════════════
+# SLIDES DECLARATIVAS: spec JSON/YAML → operaciones de shapes
+# ═══════════════════════════════════════════════════════════════
+
+SPEC_DIR = os.path.join(BASE_DIR, "slide_specs")
+
+_REQUIRED = object()
+_ALIGNMENTS = {"left": PP_ALIGN.LEFT, "center": PP_ALIGN.CENTER, "right": PP_ALIGN.RIGHT}
+
+# tipo de componente → (helper, campos en el orden posicional del helper)
+# Cada campo es (nombre, tipo, valor por defecto)
+SPEC_COMPONENTS = {
+    "text": (add_text_box, [
+        ("x", "len", _REQUIRED), ("y", "len", _REQUIRED),
+        ("w", "len", _REQUIRED), ("h", "len", _REQUIRED),
+        ("text", "text", _REQUIRED), ("size", "num", None), ("color", "color", None),
+        ("bold", "bool", None), ("align", "align", "left"), ("font", "str", None),
+        ("style", "style", None), ("fit", "bool", False),
+    ]),
+    "rect": (add_rounded_rectangle, [
+        ("x", "len", _REQUIRED), ("y", "len", _REQUIRED),
+        ("w", "len", _REQUIRED), ("h", "len", _REQUIRED),
+        ("fill", "color", _REQUIRED), ("transparency", "num", 0), ("line", "color", None),
+    ]),
+    "circle": (add_circle, [
+        ("x", "len", _REQUIRED), ("y", "len", _REQUIRED), ("size", "len", _REQUIRED),
+        ("fill", "color", _REQUIRED),
+    ]),
+    "arrow": (add_arrow, [
+        ("x", "len", _REQUIRED), ("y", "len", _REQUIRED),
+        ("w", "len", _REQUIRED), ("h", "len", _REQUIRED), ("fill", "color", _REQUIRED),
+    ]),
+    "glass_card": (add_glass_card, [
+        ("x", "len", _REQUIRED), ("y", "len", _REQUIRED),
+        ("w", "len", _REQUIRED), ("h", "len", _REQUIRED),
+        ("accent", "color", _REQUIRED), ("title", "text", ""), ("icon", "text", ""),
+    ]),
+    "mini_card": (add_mini_card, [
+        ("x", "len", _REQUIRED), ("y", "len", _REQUIRED),
+        ("w", "len", _REQUIRED), ("h", "len", _REQUIRED), ("fill", "color", None),
+    ]),
+    "badge": (add_badge, [
+        ("x", "len", _REQUIRED), ("y", "len", _REQUIRED),
+        ("w", "len", _REQUIRED), ("h", "len", _REQUIRED),
+        ("fill", "color", _REQUIRED), ("text", "text", _REQUIRED), ("text_color", "color", None),
+    ]),
+    "progress_bar": (add_progress_bar, [
+        ("x", "len", _REQUIRED), ("y", "len", _REQUIRED),
+        ("w", "len", _REQUIRED), ("h", "len", _REQUIRED),
+        ("progress", "num", _REQUIRED), ("bg", "color", _REQUIRED), ("fill", "color", _REQUIRED),
+    ]),
+    "image": (add_image, [
+        ("src", "path", _REQUIRED), ("x", "len", _REQUIRED), ("y", "len", _REQUIRED),
+        ("w", "len", _REQUIRED), ("h", "len", _REQUIRED),
+    ]),
+    "stat_number": (add_stat_number, [
+        ("x", "len", _REQUIRED), ("y", "len", _REQUIRED),
+        ("number", "text", _REQUIRED), ("label", "text", _REQUIRED), ("color", "color", _REQUIRED),
+    ]),
+}
+
+class SlideSpecError(ValueError):
+    """Invalid declarative slide spec"""
+
+def _spec_color(value, where):
+    """Resolve a theme constant name (EMERALD) or #RRGGBB into an RgbColor"""
+    if value is None:
+        return None
+    if isinstance(value, str) and value.startswith("#") and len(value) == 7:
+        return RgbColor.from_string(value[1:].upper())
+    color = globals().get(value) if isinstance(value, str) else None
+    if not isinstance(color, RgbColor):
+        raise SlideSpecError(f"{where}: color desconocido {value!r}")
+    return color
+
+def _check_placeholders(text, where):
+    """Reject {placeholders} that are not deck data keys or do not format"""
+    try:
+        fields = [field for _, field, _, _ in string.Formatter().parse(text) if field is not None]
+    except ValueError as exc:
+        raise SlideSpecError(f"{where}: llaves mal formadas ({exc}); usa {{{{ y }}}} para "
+                             f"una llave literal") from None
+    for field in fields:
+        key = re.match(r"[^.\[]*", field).group()
+        if key not in DEFAULT_DECK_DATA:
+            raise SlideSpecError(f"{where}: marcador desconocido {{{field}}}")
+    try:
+        # Índices, atributos y formatos se comprueban con los datos por defecto
+        text.format_map(DEFAULT_DECK_DATA)
+    except (IndexError, KeyError, AttributeError, TypeError, ValueError) as exc:
+        raise SlideSpecError(f"{where}: marcador inválido ({exc})") from None
+
+def _compile_component(node, origin, where, ops):
+    """Validate one component node and append its (and its children's) shape ops"""
+    if not isinstance(node, dict) or "type" not in node:
+        raise SlideSpecError(f"{where}: cada componente necesita un 'type'")
+    if node["type"] not in SPEC_COMPONENTS:
+        raise SlideSpecError(f"{where}: tipo desconocido {node['type']!r}")
+    helper, fields = SPEC_COMPONENTS[node["type"]]
+    known = {name for name, _, _ in fields} | {"type", "children"}
+    unknown = set(node) - known
+    if unknown:
+        raise SlideSpecError(f"{where}: campos desconocidos {sorted(unknown)}")
+
+    args = []
+    for name, kind, default in fields:
+        value = node.get(name, default)
+        if value is _REQUIRED:
+            raise SlideSpecError(f"{where}: falta el campo {name!r}")
+        if value is None and default is None:
+            # Campo opcional sin valor: lo resuelve el helper (p. ej. el estilo de texto)
+            args.append((kind, None))
+            continue
+        if kind == "len":
+            # bool es subclase de int: true/false no son medidas
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise SlideSpecError(f"{where}.{name}: se esperaba un número (pulgadas)")
+            # Las coordenadas de los hijos son relativas al padre
+            value += origin[0] if name == "x" else origin[1] if name == "y" else 0
+            value = Inches(value)
+        elif kind == "color":
+            value = _spec_color(value, f"{where}.{name}")
+        elif kind == "align":
+            if value not in _ALIGNMENTS:
+                raise SlideSpecError(f"{where}.{name}: alineación inválida {value!r}")
+            value = _ALIGNMENTS[value]
+        elif kind == "num" and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise SlideSpecError(f"{where}.{name}: se esperaba un número")
+        elif kind == "bool" and not isinstance(value, bool):
+            raise SlideSpecError(f"{where}.{name}: se esperaba true o false")
+        elif kind in ("text", "str") and not isinstance(value, str):
+            raise SlideSpecError(f"{where}.{name}: se esperaba texto")
+        elif kind == "text":
+            _check_placeholders(value, f"{where}.{name}")
+        elif kind == "style" and value not in TEXT_STYLES:
+            raise SlideSpecError(f"{where}.{name}: estilo de texto desconocido {value!r}")
+        elif kind == "path":
+            # Rutas relativas a la raíz del repo
+            value = os.path.join(BASE_DIR, value)
+            if not os.path.isfile(value):
+                raise SlideSpecError(f"{where}.{name}: no existe {value}")
+        args.append((kind, value))
+    # Se guarda el nombre: el helper se resuelve al renderizar (permite instrumentarlo)
+    ops.append((helper.__name__, tuple(args)))
+
+    child_origin = (origin[0] + node["x"], origin[1] + node["y"])
+    for n, child in enumerate(node.get("children", [])):
+        _compile_component(child, child_origin, f"{where}.children[{n}]", ops)
+
+_compiled_specs = {}
+
+def compile_slide_spec(spec):
+    """Validate a slide spec once and compile it into (background, ops)
+
+    Compiled layouts are cached by the spec's content hash, so rendering the
+    same spec for many decks only pays the validation/layout cost once.
+    """
+    if not isinstance(spec, dict):
+        raise SlideSpecError("slide: el spec debe ser un objeto")
+    key = hashlib.sha1(json.dumps(spec, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+    compiled = _compiled_specs.get(key)
+    if compiled is None:
+        if not isinstance(spec.get("components"), list):
+            raise SlideSpecError("slide: 'components' debe ser una lista")
+        background = _spec_color(spec.get("background", "DARK_BG"), "slide.background")
+        ops = []
+        for n, node in enumerate(spec["components"]):
+            _compile_component(node, (0, 0), f"components[{n}]", ops)
+        compiled = _compiled_specs[key] = (background, tuple(ops))
+    return compiled
+
+def load_slide_spec(path):
+    """Load a slide spec from a .json or .yaml/.yml file"""
+    _record_input_file(path)
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise SlideSpecError(f"{path}: instala PyYAML para usar specs YAML") from None
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def render_slide_spec(prs, spec, data=None):
+    """Add a slide built from a declarative spec; {placeholders} in text use the deck data"""
+    background, ops = compile_slide_spec(spec)
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    set_slide_background(slide, background)
+    for helper_name, args in ops:
+        values = [value.format_map(data) if kind == "text" and data and "{" in value else value
+                  for kind, value in args]
+        globals()[helper_name](slide, *values)
+    return slide
+
+def create_slide_1(prs, data=None):
+    """Slide 1: Apertura y Re-encuadre"""
+    return render_slide_spec(prs, load_slide_spec(os.path.join(SPEC_DIR, "apertura.json")),
+                             data or DEFAULT_DECK_DATA)
 
-def create_slide_2(prs):
+def create_slide_2(prs, data=None):
     """Slide 2: Todo en Uno - Centralización de funcionalidades con flechas"""
     slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(slide_layout)
@@ -284,25 +1390,15 @@ def create_slide_2(prs):
         fy = center_y + offset_y
 
         # Flecha hacia el centro
+        arrow_width = abs(offset_x) - 1.6
         if arrow_dir == "right":
             # Flecha apuntando a la derecha (hacia REVIVE)
-            arrow_left = fx + 0.6
-            arrow_width = abs(offset_x) - 1.6
-            shape = slide.shapes.add_shape(
-                MSO_SHAPE.RIGHT_ARROW,
-                Inches(arrow_left), Inches(fy - 0.15), Inches(arrow_width), Inches(0.3)
-            )
+            arrow_shape, arrow_left = MSO_SHAPE.RIGHT_ARROW, fx + 0.6
         else:
             # Flecha apuntando a la izquierda (hacia REVIVE)
-            arrow_left = center_x + 1
-            arrow_width = abs(offset_x) - 1.6
-            shape = slide.shapes.add_shape(
-                MSO_SHAPE.LEFT_ARROW,
-                Inches(arrow_left), Inches(fy - 0.15), Inches(arrow_width), Inches(0.3)
-            )
-        shape.fill.solid()
-        shape.fill.fore_color.rgb = color
-        shape.line.fill.background()
+            arrow_shape, arrow_left = MSO_SHAPE.LEFT_ARROW, center_x + 1
+        add_autoshape(slide, arrow_shape, Inches(arrow_left), Inches(fy - 0.15),
+                      Inches(arrow_width), Inches(0.3), color)
 
         # Círculo de feature con glow
         add_circle(slide, Inches(fx - 0.55), Inches(fy - 0.55), Inches(1.1), GRAY_DARK)
@@ -319,7 +1415,7 @@ def create_slide_2(prs):
                  font_size=18, font_color=GRAY_LIGHT, alignment=PP_ALIGN.CENTER)
 
 
-def create_slide_2b(prs):
+def create_slide_2b(prs, data=None):
     """Slide 2b: Beneficios cuantitativos - Tu tiempo vale oro"""
     slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(slide_layout)
@@ -421,24 +1517,21 @@ def create_slide_2b(prs):
                  "Menos gestión, más impacto",
                  font_size=22, font_color=EMERALD, bold=True, alignment=PP_ALIGN.CENTER)
 
-def create_slide_3(prs):
+def create_slide_3(prs, data=None):
     """Slide 3: La Solución - Teaser Visual con Glassmorphism Premium"""
+    data = data or DEFAULT_DECK_DATA
     slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(slide_layout)
     set_slide_background(slide, DARK_BG)
 
     # Decorative background elements (subtle glows)
     # Top-left glow
-    glow1 = slide.shapes.add_shape(MSO_SHAPE.OVAL, Inches(-1), Inches(-1), Inches(4), Inches(4))
-    glow1.fill.solid()
-    glow1.fill.fore_color.rgb = RgbColor(0x16, 0x1B, 0x22)
-    glow1.line.fill.background()
+    add_autoshape(slide, MSO_SHAPE.OVAL, Inches(-1), Inches(-1), Inches(4), Inches(4),
+                  RgbColor(0x16, 0x1B, 0x22))
 
     # Bottom-right glow
-    glow2 = slide.shapes.add_shape(MSO_SHAPE.OVAL, Inches(10), Inches(4), Inches(5), Inches(5))
-    glow2.fill.solid()
-    glow2.fill.fore_color.rgb = RgbColor(0x1A, 0x16, 0x22)
-    glow2.line.fill.background()
+    add_autoshape(slide, MSO_SHAPE.OVAL, Inches(10), Inches(4), Inches(5), Inches(5),
+                  RgbColor(0x1A, 0x16, 0x22))
 
     # Título con gradiente simulado
     add_text_box(slide, Inches(0.5), Inches(0.2), Inches(12), Inches(0.6),
@@ -452,34 +1545,33 @@ def create_slide_3(prs):
                    EMERALD, "Agenda", "📅")
 
     # Session cards inside
-    add_mini_card(slide, Inches(0.65), Inches(1.7), Inches(3), Inches(0.75))
-    # Avatar circle with gradient effect
-    add_circle(slide, Inches(0.75), Inches(1.8), Inches(0.55), BLUE)
-    add_text_box(slide, Inches(0.78), Inches(1.88), Inches(0.5), Inches(0.35),
-                 "MG", font_size=11, font_color=WHITE, bold=True, alignment=PP_ALIGN.CENTER)
-    add_text_box(slide, Inches(1.4), Inches(1.78), Inches(2), Inches(0.3),
-                 "María García", font_size=12, font_color=WHITE, bold=True)
-    add_text_box(slide, Inches(1.4), Inches(2.02), Inches(1.2), Inches(0.25),
-                 "10:00 - 11:00", font_size=10, font_color=EMERALD_GLOW)
-    add_badge(slide, Inches(2.7), Inches(2.02), Inches(0.8), Inches(0.25),
-              EMERALD, "Personal", WHITE)
-
-    add_mini_card(slide, Inches(0.65), Inches(2.55), Inches(3), Inches(0.75))
-    add_circle(slide, Inches(0.75), Inches(2.65), Inches(0.55), VIOLET)
-    add_text_box(slide, Inches(0.78), Inches(2.73), Inches(0.5), Inches(0.35),
-                 "CR", font_size=11, font_color=WHITE, bold=True, alignment=PP_ALIGN.CENTER)
-    add_text_box(slide, Inches(1.4), Inches(2.63), Inches(2), Inches(0.3),
-                 "Carlos Ruiz", font_size=12, font_color=WHITE, bold=True)
-    add_text_box(slide, Inches(1.4), Inches(2.87), Inches(1.2), Inches(0.25),
-                 "11:30 - 12:30", font_size=10, font_color=VIOLET_GLOW)
-    add_badge(slide, Inches(2.7), Inches(2.87), Inches(0.8), Inches(0.25),
-              VIOLET, "Grupal", WHITE)
+    session_styles = [(BLUE, EMERALD, EMERALD_GLOW), (VIOLET, VIOLET, VIOLET_GLOW)]
+    sessions = list(zip(data["sessions"], session_styles))
+    rows = layout(Column(*[Spacer(height=0.75, key=i) for i in range(len(sessions))],
+                         gap=0.1, width=3), 0.65, 1.7)
+    for i, (session, (avatar_color, badge_color, time_color)) in enumerate(sessions):
+        y = rows[i].top
+        add_mini_card(slide, *rows[i].emu)
+        # Avatar circle with gradient effect
+        add_circle(slide, Inches(0.75), Inches(y + 0.1), Inches(0.55), avatar_color)
+        add_text_box(slide, Inches(0.78), Inches(y + 0.18), Inches(0.5), Inches(0.35),
+                     initials(session["client"]), font_size=11, font_color=WHITE, bold=True,
+                     alignment=PP_ALIGN.CENTER)
+        add_text_box(slide, Inches(1.4), Inches(y + 0.08), Inches(2), Inches(0.3),
+                     session["client"], font_size=12, font_color=WHITE, bold=True,
+                     auto_fit=True)
+        add_text_box(slide, Inches(1.4), Inches(y + 0.32), Inches(1.2), Inches(0.25),
+                     session["time"], font_size=10, font_color=time_color)
+        add_badge(slide, Inches(2.7), Inches(y + 0.32), Inches(0.8), Inches(0.25),
+                  badge_color, session["type"], WHITE)
 
     # Stats row
     add_text_box(slide, Inches(0.7), Inches(3.4), Inches(1), Inches(0.25),
-                 "Hoy: 6 sesiones", font_size=9, font_color=GRAY_LIGHT)
+                 f"Hoy: {data['sessions_today']} sesiones", font_size=9, font_color=GRAY_LIGHT,
+                 auto_fit=True)
     add_text_box(slide, Inches(2.2), Inches(3.4), Inches(1.4), Inches(0.25),
-                 "Semana: 24/28", font_size=9, font_color=EMERALD_GLOW)
+                 f"Semana: {data['sessions_week_done']}/{data['sessions_week_total']}",
+                 font_size=9, font_color=EMERALD_GLOW, auto_fit=True)
 
     # ═══════════════════════════════════════════════════════════════
     # CARD 2: CLIENTES (Top-Right) - Blue theme
@@ -488,28 +1580,26 @@ def create_slide_3(prs):
                    BLUE, "Clientes", "👥")
 
     # Client rows
-    add_mini_card(slide, Inches(4.15), Inches(1.7), Inches(3), Inches(0.65))
-    add_text_box(slide, Inches(4.25), Inches(1.78), Inches(1.5), Inches(0.3),
-                 "Ana López", font_size=11, font_color=WHITE, bold=True)
-    add_text_box(slide, Inches(4.25), Inches(1.98), Inches(1.2), Inches(0.25),
-                 "12 sesiones", font_size=9, font_color=GRAY_LIGHT)
-    add_badge(slide, Inches(6.25), Inches(1.82), Inches(0.7), Inches(0.35),
-              EMERALD, "95%", WHITE)
-
-    add_mini_card(slide, Inches(4.15), Inches(2.45), Inches(3), Inches(0.65))
-    add_text_box(slide, Inches(4.25), Inches(2.53), Inches(1.5), Inches(0.3),
-                 "Pedro Martín", font_size=11, font_color=WHITE, bold=True)
-    add_text_box(slide, Inches(4.25), Inches(2.73), Inches(1.2), Inches(0.25),
-                 "8 sesiones", font_size=9, font_color=GRAY_LIGHT)
-    add_badge(slide, Inches(6.25), Inches(2.57), Inches(0.7), Inches(0.35),
-              RgbColor(0xFB, 0xBF, 0x24), "72%", DARK_BG)
+    clients = data["clients"][:2]
+    rows = layout(Column(*[Spacer(height=0.65, key=i) for i in range(len(clients))],
+                         gap=0.1, width=3), 4.15, 1.7)
+    for i, client in enumerate(clients):
+        y = rows[i].top
+        add_mini_card(slide, *rows[i].emu)
+        add_text_box(slide, Inches(4.25), Inches(y + 0.08), Inches(1.5), Inches(0.3),
+                     client["name"], font_size=11, font_color=WHITE, bold=True, auto_fit=True)
+        add_text_box(slide, Inches(4.25), Inches(y + 0.28), Inches(1.2), Inches(0.25),
+                     f"{client['sessions']} sesiones", font_size=9, font_color=GRAY_LIGHT)
+        badge_color, badge_text_color = adherence_badge_colors(client["adherence"])
+        add_badge(slide, Inches(6.25), Inches(y + 0.12), Inches(0.7), Inches(0.35),
+                  badge_color, f"{client['adherence']}%", badge_text_color)
 
     # Alert badge
     add_mini_card(slide, Inches(4.15), Inches(3.2), Inches(3), Inches(0.4),
                   RgbColor(0x1E, 0x14, 0x14))
     add_text_box(slide, Inches(4.25), Inches(3.22), Inches(2.8), Inches(0.35),
-                 "⚠️  2 clientes necesitan seguimiento",
-                 font_size=9, font_color=RgbColor(0xFB, 0x92, 0x3C))
+                 f"⚠️  {data['clients_follow_up']} clientes necesitan seguimiento",
+                 font_size=9, font_color=RgbColor(0xFB, 0x92, 0x3C), auto_fit=True)
 
     # ═══════════════════════════════════════════════════════════════
     # CARD 3: FACTURACIÓN (Bottom-Left) - Violet theme
@@ -519,25 +1609,29 @@ def create_slide_3(prs):
 
     # Big number
     add_text_box(slide, Inches(0.65), Inches(4.5), Inches(3), Inches(0.6),
-                 "$2.450.000", font_size=32, font_color=EMERALD_GLOW, bold=True)
+                 format_amount(data["revenue"]), font_size=32, font_color=EMERALD_GLOW, bold=True,
+                 auto_fit=True)
     add_text_box(slide, Inches(0.65), Inches(5), Inches(1.5), Inches(0.25),
-                 "Ingresos Enero", font_size=10, font_color=GRAY_LIGHT)
+                 f"Ingresos {data['revenue_month']}", font_size=10, font_color=GRAY_LIGHT)
+    growth_bg, growth_text = growth_badge_colors(data["revenue_growth"])
     add_badge(slide, Inches(2.2), Inches(5), Inches(1), Inches(0.25),
-              EMERALD_DARK, "+12% ↑", EMERALD_GLOW)
+              growth_bg, growth_label(data["revenue_growth"]), growth_text)
 
     # Mini stats
     add_mini_card(slide, Inches(0.65), Inches(5.4), Inches(1.4), Inches(0.7))
     add_text_box(slide, Inches(0.7), Inches(5.45), Inches(1.3), Inches(0.25),
                  "Cobrado", font_size=8, font_color=GRAY_LIGHT, alignment=PP_ALIGN.CENTER)
     add_text_box(slide, Inches(0.7), Inches(5.7), Inches(1.3), Inches(0.35),
-                 "85%", font_size=18, font_color=EMERALD, bold=True, alignment=PP_ALIGN.CENTER)
+                 f"{data['collected_pct']}%", font_size=18, font_color=EMERALD, bold=True,
+                 alignment=PP_ALIGN.CENTER)
 
     add_mini_card(slide, Inches(2.15), Inches(5.4), Inches(1.5), Inches(0.7),
                   RgbColor(0x22, 0x16, 0x16))
     add_text_box(slide, Inches(2.2), Inches(5.45), Inches(1.4), Inches(0.25),
                  "Pendiente", font_size=8, font_color=GRAY_LIGHT, alignment=PP_ALIGN.CENTER)
     add_text_box(slide, Inches(2.2), Inches(5.7), Inches(1.4), Inches(0.35),
-                 "3", font_size=18, font_color=RgbColor(0xFB, 0x71, 0x85), bold=True, alignment=PP_ALIGN.CENTER)
+                 str(data["pending_invoices"]), font_size=18, font_color=ROSE,
+                 bold=True, alignment=PP_ALIGN.CENTER)
 
     # ═══════════════════════════════════════════════════════════════
     # CARD 4: REPORTES (Bottom-Right) - Cyan theme
@@ -551,49 +1645,48 @@ def create_slide_3(prs):
 
     # Progress bar
     add_progress_bar(slide, Inches(4.15), Inches(4.8), Inches(3), Inches(0.25),
-                     0.78, RgbColor(0x1E, 0x1E, 0x28), EMERALD)
+                     data["adherence"] / 100, RgbColor(0x1E, 0x1E, 0x28), EMERALD)
     add_text_box(slide, Inches(4.15), Inches(5.1), Inches(1), Inches(0.25),
-                 "78%", font_size=14, font_color=EMERALD, bold=True)
+                 f"{data['adherence']}%", font_size=14, font_color=EMERALD, bold=True)
     add_text_box(slide, Inches(5), Inches(5.12), Inches(2), Inches(0.25),
-                 "+5% vs mes anterior", font_size=9, font_color=EMERALD_GLOW)
+                 f"{data['adherence_delta']:+}% vs mes anterior", font_size=9, font_color=EMERALD_GLOW)
 
     # Mini ranking
     add_mini_card(slide, Inches(4.15), Inches(5.5), Inches(3), Inches(0.9))
     add_text_box(slide, Inches(4.25), Inches(5.55), Inches(2), Inches(0.25),
-                 "🏆 Top Adherencia", font_size=9, font_color=RgbColor(0xFB, 0xBF, 0x24), bold=True)
+                 "🏆 Top Adherencia", font_size=9, font_color=AMBER, bold=True)
+    ranking = "  ".join(f"{i}. {short_name(entry['name'])} ({entry['adherence']}%)"
+                        for i, entry in enumerate(data["top_adherence"][:3], start=1))
     add_text_box(slide, Inches(4.25), Inches(5.85), Inches(2.8), Inches(0.25),
-                 "1. María G. (95%)  2. Ana L. (92%)  3. Luis M. (89%)",
-                 font_size=8, font_color=GRAY_LIGHT)
+                 ranking, font_size=8, font_color=GRAY_LIGHT, auto_fit=True)
 
     # ═══════════════════════════════════════════════════════════════
     # RIGHT SIDE: Message and CTA
     # ═══════════════════════════════════════════════════════════════
 
     # Main message with styled background
-    msg_bg = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        Inches(7.6), Inches(2), Inches(5.2), Inches(2.2)
-    )
-    msg_bg.fill.solid()
-    msg_bg.fill.fore_color.rgb = RgbColor(0x18, 0x18, 0x24)
-    msg_bg.line.color.rgb = EMERALD_DARK
-    msg_bg.line.width = Pt(2)
+    add_autoshape(slide, MSO_SHAPE.ROUNDED_RECTANGLE,
+                  Inches(7.6), Inches(2), Inches(5.2), Inches(2.2),
+                  RgbColor(0x18, 0x18, 0x24), line_color=EMERALD_DARK, line_width=Pt(2))
 
     add_text_box(slide, Inches(7.9), Inches(2.3), Inches(4.8), Inches(0.8),
                  "Una plataforma.", font_size=36, font_color=WHITE, bold=True)
     add_text_box(slide, Inches(7.9), Inches(2.9), Inches(4.8), Inches(0.8),
                  "Todo tu negocio.", font_size=36, font_color=EMERALD_GLOW, bold=True)
 
-    # Feature pills
+    # Feature pills: ancho según el texto, repartidas en el ancho del mensaje
     pills_data = [
-        ("Agenda", EMERALD, 7.9),
-        ("Clientes", BLUE, 9.3),
-        ("Pagos", VIOLET, 10.55),
-        ("Reportes", CYAN, 11.6)
+        ("Agenda", EMERALD),
+        ("Clientes", BLUE),
+        ("Pagos", VIOLET),
+        ("Reportes", CYAN)
     ]
-    for text, color, left in pills_data:
-        add_badge(slide, Inches(left), Inches(3.9), Inches(1.1), Inches(0.35),
-                  color, text, WHITE)
+    badge = TEXT_STYLES["badge"]
+    pills = layout(Row(*[Text(text, badge.font_size, badge.bold, padding=(0.2, 0), height=0.35,
+                              key=text) for text, _ in pills_data],
+                       width=4.8, justify="between"), 7.9, 3.9)
+    for text, color in pills_data:
+        add_badge(slide, *pills[text].emu, color, text, WHITE)
 
     # CTA transition
     add_text_box(slide, Inches(7.9), Inches(5.5), Inches(5), Inches(0.5),
@@ -603,7 +1696,7 @@ def create_slide_3(prs):
     # Decorative arrow
     add_arrow(slide, Inches(11.5), Inches(5.55), Inches(0.8), Inches(0.4), VIOLET)
 
-def create_slide_4(prs):
+def create_slide_4(prs, data=None):
     """Slide 4: De Friends & Family a Business Partners"""
     slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(slide_layout)
@@ -672,82 +1765,22 @@ def create_slide_4(prs):
                  "Profesionalizar nuestra colaboración para crecer juntos",
                  font_size=18, font_color=WHITE, bold=True, alignment=PP_ALIGN.CENTER)
 
-def create_slide_5(prs):
+def create_slide_5(prs, data=None):
     """Slide 5: Parking Lot con ideas y espacios vacíos"""
-    slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
-    set_slide_background(slide, DARK_BG)
-
-    # Título
-    add_text_box(slide, Inches(0.5), Inches(0.4), Inches(12), Inches(0.7),
-                 "Roadmap de Ideas",
-                 font_size=40, font_color=WHITE, bold=True, alignment=PP_ALIGN.CENTER)
-
-    # Subtítulo
-    add_text_box(slide, Inches(0.5), Inches(1), Inches(12), Inches(0.5),
-                 "Genial para la versión 2.0 - Lo anotamos aquí",
-                 font_size=18, font_color=VIOLET, alignment=PP_ALIGN.CENTER)
-
-    # Ideas ya definidas (cards con contenido)
-    ideas_existentes = [
-        ("🤖", "IA Coaching", "Asistente inteligente\npara recomendaciones", EMERALD),
-        ("📱", "App Móvil Nativa", "iOS y Android\ncon notificaciones push", BLUE),
-        ("🔗", "Integraciones", "Google Calendar,\nStripe, WhatsApp API", VIOLET),
-    ]
+    return render_slide_spec(prs, load_slide_spec(os.path.join(SPEC_DIR, "roadmap.json")),
+                             data or DEFAULT_DECK_DATA)
 
-    for i, (icon, title, desc, color) in enumerate(ideas_existentes):
-        left = 0.7 + (i * 4.2)
-        # Card con idea
-        add_rounded_rectangle(slide, Inches(left), Inches(1.7), Inches(3.8), Inches(1.8),
-                              GRAY_DARK, line_color=color)
-        add_text_box(slide, Inches(left), Inches(1.8), Inches(3.8), Inches(0.5),
-                     icon, font_size=28, alignment=PP_ALIGN.CENTER)
-        add_text_box(slide, Inches(left), Inches(2.3), Inches(3.8), Inches(0.4),
-                     title, font_size=16, font_color=color, bold=True,
-                     alignment=PP_ALIGN.CENTER)
-        add_text_box(slide, Inches(left), Inches(2.7), Inches(3.8), Inches(0.7),
-                     desc, font_size=11, font_color=GRAY_LIGHT,
-                     alignment=PP_ALIGN.CENTER)
-
-    # Espacios vacíos para anotar en vivo (con icono de +)
-    add_text_box(slide, Inches(0.5), Inches(3.8), Inches(12), Inches(0.4),
-                 "Ideas de Christian:", font_size=14, font_color=GRAY_LIGHT)
-
-    for i in range(3):
-        left = 0.7 + (i * 4.2)
-        # Card vacía con borde punteado simulado
-        add_rounded_rectangle(slide, Inches(left), Inches(4.3), Inches(3.8), Inches(1.5),
-                              RgbColor(0x1A, 0x1A, 0x24), line_color=GRAY_DARK)
-        add_text_box(slide, Inches(left), Inches(4.7), Inches(3.8), Inches(0.6),
-                     "+", font_size=36, font_color=GRAY_DARK,
-                     alignment=PP_ALIGN.CENTER)
-        add_text_box(slide, Inches(left), Inches(5.3), Inches(3.8), Inches(0.4),
-                     "Tu idea aquí", font_size=12, font_color=GRAY_DARK,
-                     alignment=PP_ALIGN.CENTER)
-
-    # Mensaje inferior
-    add_text_box(slide, Inches(1), Inches(6.2), Inches(11), Inches(0.5),
-                 "Priorizamos juntos según el impacto en tu negocio",
-                 font_size=16, font_color=EMERALD, alignment=PP_ALIGN.CENTER)
-
-def create_slide_6(prs):
+def create_slide_6(prs, data=None):
     """Slide 6: Cierre - Oportunidad de crecer juntos"""
     slide_layout = prs.slide_layouts[6]
     slide = prs.slides.add_slide(slide_layout)
     set_slide_background(slide, DARK_BG)
 
-    # Fondo decorativo: Gráfico de crecimiento ascendente simulado
-    # Barras de crecimiento
-    bar_data = [
-        (2.5, 5.5, 0.8),   # Barra 1 (más pequeña)
-        (3.5, 4.8, 1.5),   # Barra 2
-        (4.5, 4.0, 2.3),   # Barra 3
-        (5.5, 3.2, 3.1),   # Barra 4
-        (6.5, 2.4, 3.9),   # Barra 5 (más grande)
-    ]
-    for left, top, height in bar_data:
-        add_rounded_rectangle(slide, Inches(left), Inches(top), Inches(0.7), Inches(height),
-                              RgbColor(0x1A, 0x2A, 0x1A))
+    # Fondo decorativo: gráfico de crecimiento ascendente (chart nativo, sin ejes).
+    # Cada categoría ocupa 1" y la barra 0.7", como las antiguas barras dibujadas
+    add_bar_chart(slide, Inches(2.35), Inches(2.4), Inches(5), Inches(3.9),
+                  [0.8, 1.5, 2.3, 3.1, 3.9], color=RgbColor(0x1A, 0x2A, 0x1A),
+                  axes=False, gap_width=43, minimum=0, maximum=3.9)
 
     # Línea de tendencia (flecha diagonal)
     add_arrow(slide, Inches(2.3), Inches(5.5), Inches(5.5), Inches(0.5), EMERALD_DARK)
@@ -813,26 +1846,2526 @@ def create_slide_6(prs):
                  "¿Construimos el futuro de REVIVE juntos?",
                  font_size=20, font_color=WHITE, bold=True, alignment=PP_ALIGN.CENTER)
 
-def main():
+# ═══════════════════════════════════════════════════════════════
+# CACHE DE PLANTILLAS: construir una vez, clonar y parchear por deck
+# ═══════════════════════════════════════════════════════════════
+
+_SLOT_TRANSFORMS = {
+    "format_amount": format_amount,
+    "initials": initials,
+    "short_name": short_name,
+    "growth_label": growth_label,
+}
+_SLOT_TOKEN = re.compile(r"⟦(\d+)⟧")
+_XML_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+}
+_SLIDE_LAYOUT_RELTYPE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+)
+
+class _TemplateContext:
+    """Records which parts of a slide under construction depend on deck data"""
+
+    def __init__(self):
+        self.slots = []          # índice → (path, spec, transform, scale)
+        self.colors = {}         # hex centinela → (slot, resolver, índice)
+        self.widths = []         # (shape_id, slot, ancho completo)
+        self.fits = []           # (shape_id, estilo, ancho, alto) con auto-fit
+
+    def new_slot(self, path, spec="", transform=None, scale=1):
+        self.slots.append((path, spec, transform, scale))
+        return _Slot(len(self.slots) - 1)
+
+    def derive_slot(self, slot, **changes):
+        path, spec, transform, scale = self.slots[int(slot[1:-1])]
+        if "scale" in changes:
+            changes["scale"] *= scale
+        entry = dict(spec=spec, transform=transform, scale=scale)
+        entry.update(changes)
+        return self.new_slot(path, **entry)
+
+    def color_slot(self, slot, resolver, index):
+        # Color centinela único que se sustituye por el color real al parchear
+        n = len(self.colors) + 1
+        sentinel = RgbColor(0x01, n >> 8, n & 0xFF)
+        self.colors[str(sentinel)] = (slot, resolver, index)
+        return sentinel
+
+    def width_slot(self, shape_id, slot, full_width):
+        self.widths.append((shape_id, slot, full_width))
+
+    def fit_slot(self, shape_id, style, width, height):
+        self.fits.append((shape_id, style, width, height))
+
+    def tokenize(self, value, path=()):
+        """Replace every scalar leaf of the deck data by a slot"""
+        if isinstance(value, dict):
+            return {k: self.tokenize(v, path + (k,)) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.tokenize(v, path + (n,)) for n, v in enumerate(value)]
+        return self.new_slot(path)
+
+def _data_shape(value):
+    """Structural key of the deck data: keys and list lengths, not values"""
+    if isinstance(value, dict):
+        return tuple((k, _data_shape(v)) for k, v in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_data_shape(v) for v in value)
+    return None
+
+class _SlideTemplate:
+    """Serialized shape tree of one slide plus the data-dependent patch points"""
+
+    def __init__(self, slide, context):
+        c_sld = slide._element.cSld
+        self._bg = c_sld.bg
+        self._sp_tree = c_sld.spTree
+        self._context = context
+
+    def _slot_value(self, index, data):
+        path, spec, transform, scale = self._context.slots[index]
+        value = data
+        for key in path:
+            value = value[key]
+        if transform:
+            value = _SLOT_TRANSFORMS[transform](value)
+        if scale != 1:
+            value = value * scale
+        return format(value, spec) if spec else value
+
+    def localized(self, catalog):
+        """Copy of the template with its message runs translated by catalog"""
+        clone = copy.copy(self)
+        clone._sp_tree = copy.deepcopy(self._sp_tree)
+        for t in clone._sp_tree.iterfind(".//a:t", _XML_NS):
+            if t.text:
+                t.text = catalog.translate_template_text(t.text)
+        return clone
+
+    def instantiate(self, prs, data):
+        """Add a slide to prs by deep-copying the template and patching data"""
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        tree = copy.deepcopy(self._sp_tree)
+        context = self._context
+
+        for t in tree.iterfind(".//a:t", _XML_NS):
+            if t.text and "⟦" in t.text:
+                t.text = _SLOT_TOKEN.sub(
+                    lambda m: str(self._slot_value(int(m.group(1)), data)), t.text)
+        if context.colors:
+            for clr in tree.iterfind(".//a:srgbClr", _XML_NS):
+                target = context.colors.get(clr.get("val"))
+                if target:
+                    slot, resolver, index = target
+                    value = self._slot_value(int(slot[1:-1]), data)
+                    clr.set("val", str(resolver(value)[index]))
+        for shape_id, style, width, height in context.fits:
+            c_nv_pr = tree.find(f".//p:cNvPr[@id='{shape_id}']", _XML_NS)
+            sp = c_nv_pr.getparent().getparent()
+            text = "".join(t.text or "" for t in sp.iterfind(".//a:t", _XML_NS))
+            if text:
+                fitted = _fitted_style(style, text, width, height)
+                sp.find(".//a:defRPr", _XML_NS).set("sz", str(Pt(fitted.font_size).centipoints))
+        for shape_id, slot, full_width in context.widths:
+            c_nv_pr = tree.find(f".//p:cNvPr[@id='{shape_id}']", _XML_NS)
+            sp = c_nv_pr.getparent().getparent()
+            width = int(full_width * self._slot_value(int(slot[1:-1]), data))
+            if width > Inches(0.1):
+                sp.find("p:spPr/a:xfrm/a:ext", _XML_NS).set("cx", str(width))
+            else:
+                sp.getparent().remove(sp)
+
+        c_sld = slide._element.cSld
+        if self._bg is not None:
+            c_sld.insert(0, copy.deepcopy(self._bg))
+        sp_tree = c_sld.spTree
+        for child in list(sp_tree):
+            sp_tree.remove(child)
+        sp_tree.extend(list(tree))
+        return slide
+
+class SlideTemplateCache:
+    """Build each slide's shape tree once and clone-and-patch it for later decks
+
+    Templates are keyed by builder, base template and the structure of the deck
+    data (list lengths), so only names, amounts, percentages, data-driven colors
+    and progress widths are patched. Builders that do something a template
+    cannot replay (arithmetic or comparisons on data, which raise TypeError on
+    a slot; slides with media relationships) are rendered directly every time
+    and listed in fallbacks.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._localized = {}     # (clave, catálogo) → plantilla traducida
+        self.fallbacks = {}      # builder → motivo del render directo
+
+    def __len__(self):
+        return len(self._templates)
+
+    def clear(self):
+        self._templates.clear()
+        self._localized.clear()
+        self.fallbacks.clear()
+
+    def stats(self):
+        """Number of templates built and the builders rendered directly"""
+        return {"templates": sum(t is not None for t in self._templates.values()),
+                "direct": dict(self.fallbacks)}
+
+    def _fallback(self, builder, reason, warn=True):
+        self.fallbacks[builder.__name__] = reason
+        if warn:
+            print(f"Plantilla de slide: {builder.__name__} se renderiza directo ({reason})",
+                  file=sys.stderr)
+
+    def _build(self, builder, data, template=None):
+        global _template_context
+        scratch = template_pool(template).presentation()
+        context = _template_context = _TemplateContext()
+        try:
+            builder(scratch, context.tokenize(data))
+        except TypeError as exc:
+            # Operación sobre un slot (str) en vez del valor real: el builder
+            # necesita los datos reales. Cualquier otro error es un bug y sube.
+            self._fallback(builder, f"TypeError: {exc}")
+            return None
+        finally:
+            _template_context = None
+        slide = scratch.slides[-1]
+        if any(rel.reltype != _SLIDE_LAYOUT_RELTYPE for rel in slide.part.rels.values()):
+            # Charts e imágenes: esperado, sin aviso
+            self._fallback(builder, "relaciones de chart o media", warn=False)
+            return None
+        return _SlideTemplate(slide, context)
+
+    def render(self, prs, builder, data, template=None, catalog=None):
+        """Render builder(prs, data) through the cache (template: base .pptx of prs)
+
+        With a catalog the template's message runs are translated; slides
+        rendered directly are translated run by run.
+        """
+        template = os.path.abspath(template) if template else None
+        key = (builder.__name__, template, _data_shape(data))
+        if key not in self._templates:
+            self._templates[key] = self._build(builder, data, template)
+        template_slide = self._templates[key]
+        if template_slide is None:
+            slide = builder(prs, data)
+            if catalog is not None:
+                for t in prs.slides[-1]._element.iterfind(".//a:t", _XML_NS):
+                    if t.text:
+                        t.text = catalog.translate(t.text)
+            return slide
+        if catalog is not None:
+            localized = self._localized.get((key, catalog))
+            if localized is None:
+                localized = self._localized[key, catalog] = template_slide.localized(catalog)
+            template_slide = localized
+        return template_slide.instantiate(prs, data)
+
+# Cache por proceso: en modo batch cada worker reutiliza sus plantillas
+TEMPLATE_CACHE = SlideTemplateCache()
+
+# ═══════════════════════════════════════════════════════════════
+# GUARDADO EN STREAMING
+# ═══════════════════════════════════════════════════════════════
+
+_STREAM_CHUNK = 1 << 20
+
+# Modo determinista: metadatos zip fijos (fecha, permisos, sistema) para que la
+# misma entrada produzca los mismos bytes; la fecha respeta SOURCE_DATE_EPOCH
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+HASH_SUFFIX = ".sha256"
+
+def _source_date():
+    """Fixed timestamp for deterministic builds (SOURCE_DATE_EPOCH or the zip epoch)"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc).replace(tzinfo=None)
+    return datetime(*ZIP_EPOCH)
+
+def _zip_entry(name, deterministic):
+    if not deterministic:
+        return name
+    info = zipfile.ZipInfo(name, _source_date().timetuple()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.create_system = 3
+    info.external_attr = 0o644 << 16
+    return info
+
+def _write_zip_xml(zf, name, element, deterministic=False):
+    """Serialize an XML part straight into its zip entry"""
+    with zf.open(_zip_entry(name, deterministic), "w") as entry:
+        etree.ElementTree(element).write(entry, encoding="UTF-8", xml_declaration=True,
+                                         standalone=True)
+
+def _write_zip_blob(zf, name, blob, deterministic=False):
+    """Copy a binary part into its zip entry in fixed-size chunks"""
+    view = memoryview(blob)
+    with zf.open(_zip_entry(name, deterministic), "w") as entry:
+        for start in range(0, len(view), _STREAM_CHUNK):
+            entry.write(view[start:start + _STREAM_CHUNK])
+
+class _HashingWriter:
+    """Write-only, non-seekable file wrapper that hashes what goes through it
+
+    Also makes the zip layout independent of the target: a seekable file and
+    stdout both get data descriptors instead of patched local headers.
+    """
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        return self._fileobj.write(data)
+
+    def flush(self):
+        self._fileobj.flush()
+
+def normalize_shape_ids(prs):
+    """Renumber shape ids 1..n in document order on every slide
+
+    Ids otherwise depend on how a slide was built (helpers, fast emitter,
+    template cache, merged pieces). Connector and animation references are
+    remapped to the new ids.
+    """
+    for slide in prs.slides:
+        tree = slide.shapes._spTree
+        mapping = {}
+        for new_id, c_nv_pr in enumerate(tree.xpath(".//p:cNvPr"), 1):
+            mapping.setdefault(c_nv_pr.get("id"), str(new_id))
+            c_nv_pr.set("id", str(new_id))
+        if len(mapping) < 2:
+            continue
+        for ref in slide._element.xpath(".//a:stCxn | .//a:endCxn"):
+            ref.set("id", mapping.get(ref.get("id"), ref.get("id")))
+        for ref in slide._element.xpath(".//p:timing//*[@spid]"):
+            ref.set("spid", mapping.get(ref.get("spid"), ref.get("spid")))
+
+def _pin_core_properties(prs):
+    props = prs.core_properties
+    props.created = props.modified = _source_date()
+    props.revision = 1
+
+def save_streaming(prs, target, deterministic=False):
+    """Write prs as a .pptx part by part
+
+    Unlike prs.save(), no part is serialized to an intermediate bytes object:
+    XML parts are written by lxml directly into their (deflated) zip entry and
+    media blobs are copied in chunks, so peak memory does not grow with the
+    size of the serialized deck. It is not faster than prs.save() (deflate
+    dominates both); what it adds is a non-seekable target (stdout, a socket),
+    hashing while writing and the deterministic mode. target is a path, a
+    binary file object or "-" for stdout.
+
+    With deterministic=True, zip metadata, part order, shape ids and core
+    properties are fixed, so identical input gives identical bytes, and the
+    SHA-256 hex digest of the written file is returned.
+    """
+    package = prs.part.package
+    if deterministic:
+        normalize_shape_ids(prs)
+        _pin_core_properties(prs)
+        parts = tuple(sorted(package.iter_parts(), key=lambda part: part.partname))
+    else:
+        parts = tuple(package.iter_parts())
+    if target == "-":
+        target = sys.stdout.buffer
+    with contextlib.ExitStack() as stack:
+        if isinstance(target, str):
+            target = stack.enter_context(open(target, "wb"))
+        if deterministic:
+            target = _HashingWriter(target)
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zf:
+            _write_zip_xml(zf, "[Content_Types].xml", _ContentTypesItem.xml_for(parts),
+                           deterministic)
+            zf.writestr(_zip_entry("_rels/.rels", deterministic), package._rels.xml)
+            for part in parts:
+                if isinstance(part, XmlPart):
+                    _write_zip_xml(zf, part.partname.membername, part._element, deterministic)
+                else:
+                    _write_zip_blob(zf, part.partname.membername, part.blob, deterministic)
+                if part._rels:
+                    zf.writestr(_zip_entry(part.partname.rels_uri.membername, deterministic),
+                                part.rels.xml)
+    return target.sha256.hexdigest() if deterministic else None
+
+def save_deck(prs, target, stream=False, deterministic=False):
+    """Save prs with prs.save() or save_streaming(); returns the SHA-256 when deterministic"""
+    if stream or deterministic or target == "-":
+        return save_streaming(prs, target, deterministic)
+    prs.save(target)
+    return None
+
+def file_sha256(path):
+    """SHA-256 hex digest of a file, read in chunks"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_STREAM_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+def write_hash_file(output_path, digest):
+    """Write `<output>.sha256` in sha256sum format; returns its path"""
+    hash_path = output_path + HASH_SUFFIX
+    with open(hash_path, "w", encoding="utf-8") as f:
+        f.write(f"{digest}  {os.path.basename(output_path)}\n")
+    return hash_path
+
+# ═══════════════════════════════════════════════════════════════
+# EXPORTACIÓN: PDF y miniaturas PNG con caché por contenido de slide
+# ═══════════════════════════════════════════════════════════════
+
+EXPORT_CACHE_DIR = os.path.join(CACHE_DIR, "export")
+EXPORT_FORMATS = ("pptx", "pdf", "png")
+THUMBNAIL_DPI = 96
+CONVERT_TIMEOUT = 300
+# Relaciones que no afectan a cómo se ve la slide
+_UNRENDERED_RELTYPES = (RT.NOTES_SLIDE, RT.NOTES_MASTER)
+
+class ExportError(RuntimeError):
+    """A converter is missing or failed"""
+
+def _part_hash(part, memo):
+    """SHA-256 of a part's content plus everything it relates to (masters, media, ...)
+
+    The partname is left out: /ppt/slides/slideN.xml and the media names
+    depend on where the slide sits in the deck, not on what it shows.
+    """
+    digest = memo.get(part)
+    if digest is None:
+        memo[part] = b""  # ciclos master ↔ layouts
+        h = hashlib.sha256(part.content_type.encode())
+        h.update(part.blob)
+        for rel in sorted(part.rels.values(), key=lambda rel: rel.rId):
+            h.update(f"{rel.rId} {rel.reltype}".encode())
+            if rel.is_external:
+                h.update(rel.target_ref.encode())
+            elif rel.reltype not in _UNRENDERED_RELTYPES:
+                h.update(_part_hash(rel.target_part, memo))
+        digest = memo[part] = h.digest()
+    return digest
+
+def slide_hashes(prs):
+    """Content hash of each slide: its XML, media, layout, master, theme and slide size"""
+    memo = {}
+    size = f"{prs.slide_width}x{prs.slide_height}".encode()
+    return [hashlib.sha256(size + _part_hash(slide.part, memo)).hexdigest()
+            for slide in prs.slides]
+
+def _soffice():
+    for name in ("soffice", "libreoffice"):
+        path = shutil.which(name)
+        if path:
+            return path
+    mac_app = "/Applications/LibreOffice.app/Contents/MacOS/soffice"
+    return mac_app if os.path.exists(mac_app) else None
+
+def _run_converter(command):
+    import subprocess
+
+    try:
+        subprocess.run(command, check=True, capture_output=True, timeout=CONVERT_TIMEOUT)
+    except subprocess.CalledProcessError as exc:
+        detail = exc.stderr.decode(errors="replace").strip()[-500:]
+        raise ExportError(f"{os.path.basename(command[0])} falló ({exc.returncode}): "
+                          f"{detail}") from None
+    except subprocess.TimeoutExpired:
+        raise ExportError(f"{os.path.basename(command[0])} tardó más de "
+                          f"{CONVERT_TIMEOUT}s") from None
+
+def convert_to_pdf(pptx_path, pdf_path):
+    """Convert a .pptx to PDF with a headless LibreOffice"""
+    import tempfile
+
+    soffice = _soffice()
+    if soffice is None:
+        raise ExportError("LibreOffice (soffice) no está instalado: no se puede exportar a PDF")
+    with tempfile.TemporaryDirectory(prefix="revive_export_") as tmp:
+        # Perfil propio por conversión: varias instancias pueden convertir en paralelo
+        profile = "file://" + os.path.join(tmp, "profile")
+        _run_converter([soffice, f"-env:UserInstallation={profile}", "--headless",
+                        "--norestore", "--convert-to", "pdf", "--outdir", tmp, pptx_path])
+        produced = os.path.join(tmp, os.path.splitext(os.path.basename(pptx_path))[0] + ".pdf")
+        if not os.path.exists(produced):
+            raise ExportError(f"LibreOffice no generó el PDF de {pptx_path}")
+        os.replace(produced, pdf_path)
+
+def rasterise_page(pdf_path, page, png_path, dpi=THUMBNAIL_DPI):
+    """Render one PDF page (1-based) to PNG with pdftoppm or, if missing, PyMuPDF"""
+    pdftoppm = shutil.which("pdftoppm")
+    tmp_path = f"{png_path}.{os.getpid()}.{page}.tmp"
+    if pdftoppm:
+        _run_converter([pdftoppm, "-png", "-r", str(dpi), "-f", str(page), "-l", str(page),
+                        "-singlefile", pdf_path, tmp_path])
+        os.replace(tmp_path + ".png", png_path)
+        return
+    try:
+        import fitz
+    except ImportError:
+        raise ExportError("Ni pdftoppm (poppler) ni PyMuPDF están instalados: "
+                          "no se pueden generar PNG") from None
+    with fitz.open(pdf_path) as document:
+        document[page - 1].get_pixmap(dpi=dpi).save(tmp_path, output="png")
+    os.replace(tmp_path, png_path)
+
+def export_deck(pptx_path, formats=("pdf", "png"), output_dir=None, dpi=THUMBNAIL_DPI,
+                workers=None, prs=None):
+    """Export a saved deck to PDF and/or one PNG per slide, reusing cached renders
+
+    The deck PDF is cached by the combined slide hashes and each thumbnail by
+    its own slide hash, so after a rebuild only changed slides are
+    rasterised; LibreOffice only runs when the PDF itself is not cached.
+    Returns {"pdf": path, "png": [paths], "rasterised": n}.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    prs = prs if prs is not None else Presentation(pptx_path)
+    output_dir = output_dir or os.path.dirname(os.path.abspath(pptx_path))
+    stem = os.path.splitext(os.path.basename(pptx_path))[0]
+    hashes = slide_hashes(prs)
+    deck_hash = hashlib.sha256("".join(hashes).encode()).hexdigest()
+    os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+
+    cached_pdf = os.path.join(EXPORT_CACHE_DIR, f"deck_{deck_hash[:32]}.pdf")
+    thumbnails = [os.path.join(EXPORT_CACHE_DIR, f"{digest[:32]}_{dpi}.png") for digest in hashes]
+    missing = [page for page, path in enumerate(thumbnails, start=1)
+               if not os.path.exists(path)] if "png" in formats else []
+    if ("pdf" in formats or missing) and not os.path.exists(cached_pdf):
+        convert_to_pdf(os.path.abspath(pptx_path), cached_pdf)
+
+    result = {"rasterised": len(missing)}
+    if missing:
+        # pdftoppm es un proceso externo: con hilos basta para paralelizar
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            list(executor.map(lambda page: rasterise_page(cached_pdf, page,
+                                                          thumbnails[page - 1], dpi), missing))
+    if "pdf" in formats:
+        result["pdf"] = os.path.join(output_dir, f"{stem}.pdf")
+        shutil.copyfile(cached_pdf, result["pdf"])
+    if "png" in formats:
+        result["png"] = []
+        for page, cached in enumerate(thumbnails, start=1):
+            target = os.path.join(output_dir, f"{stem}_{page:02d}.png")
+            shutil.copyfile(cached, target)
+            result["png"].append(target)
+    return result
+
+def parse_formats(value):
+    """Split "pptx,pdf,png" and validate each format"""
+    formats = [fmt.strip().lower() for fmt in value.split(",") if fmt.strip()]
+    unknown = sorted(set(formats) - set(EXPORT_FORMATS))
+    if unknown:
+        raise ValueError(f"formatos desconocidos {unknown}; válidos: {', '.join(EXPORT_FORMATS)}")
+    return formats
+
+# ═══════════════════════════════════════════════════════════════
+# MEZCLA DE DECKS: slides ya renderizadas copiadas parte a parte
+# ═══════════════════════════════════════════════════════════════
+
+# Relaciones de una slide que no se copian tal cual: el layout se re-enlaza al
+# del deck destino, las notas no se copian y los enlaces a otras slides se
+# re-apuntan a su copia (o se quitan si la slide enlazada no está en la mezcla)
+_SKIPPED_SLIDE_RELTYPES = (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE, RT.SLIDE)
+_SLIDE_LINK_TAGS = tuple(f"{{{_XML_NS['a']}}}{name}" for name in ("hlinkClick", "hlinkHover"))
+_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+# Solo la media se comparte entre slides; gráficos y sus xlsx son propios de cada slide
+_SHARED_MEDIA_TYPES = ("image/", "video/", "audio/")
+
+class _PartCopier:
+    """Copies parts into a target package, deduplicating binary parts by content"""
+
+    def __init__(self, prs):
+        self.prs = prs
+        self._copied = {}
+        self.package = prs.part.package
+        self._used = set()
+        self._binary = {}
+        self._known = set()
+        self._slides = {}       # slide part de origen → su copia
+        self._links = []        # (copia, rId, relación a otra slide) aún sin destino
+        self.sync()
+        self._layouts = {layout.name: layout for layout in prs.slide_layouts}
+
+    @classmethod
+    def for_presentation(cls, prs):
+        """The copier of prs, created on first use and reused by later merges"""
+        copier = getattr(prs.part, "_part_copier", None)
+        if copier is None:
+            copier = prs.part._part_copier = cls(prs)
+        else:
+            copier.sync()
+        return copier
+
+    def sync(self):
+        """Register parts added to the target since the last merge (hashing only new media)"""
+        for part in self.package.iter_parts():
+            if part in self._known:
+                continue
+            self._known.add(part)
+            self._used.add(str(part.partname))
+            if part.content_type.startswith(_SHARED_MEDIA_TYPES):
+                self._binary[(part.content_type, hashlib.sha1(part.blob).digest())] = part
+
+    def _partname(self, source_partname):
+        """Next free partname in the target following the source's naming pattern
+
+        /ppt/media/image7.png → /ppt/media/image1.png, image2.png...; a name
+        without a trailing number (logo.png) is kept if free, else numbered.
+        """
+        directory, filename = str(source_partname).rsplit("/", 1)
+        stem, dot, extension = filename.rpartition(".")
+        if not dot:
+            stem, extension = filename, ""
+        base = stem.rstrip("0123456789")
+        candidates = itertools.count(1)
+        name = str(source_partname) if base == stem else None
+        while name is None or name in self._used:
+            name = f"{directory}/{base}{next(candidates)}{dot}{extension}"
+        self._used.add(name)
+        return PackURI(name)
+
+    def copy_part(self, part):
+        """Copy of part (and everything it relates to) owned by the target package"""
+        copied = self._copied.get(part)
+        if copied is not None:
+            return copied
+        if isinstance(part, XmlPart):
+            copied = type(part)(self._partname(part.partname), part.content_type, self.package,
+                                copy.deepcopy(part._element))
+        elif part.content_type.startswith(_SHARED_MEDIA_TYPES):
+            key = (part.content_type, hashlib.sha1(part.blob).digest())
+            copied = self._binary.get(key)
+            if copied is not None:
+                self._copied[part] = copied
+                return copied
+            copied = self._binary[key] = Part(self._partname(part.partname), part.content_type,
+                                              self.package, part.blob)
+        else:
+            copied = Part(self._partname(part.partname), part.content_type, self.package,
+                          part.blob)
+        self._copied[part] = copied
+        self._copy_rels(part, copied)
+        return copied
+
+    def _copy_rels(self, source, target, skipped=()):
+        # Se conservan los rId del origen: el XML copiado no necesita reescribirse
+        for r_id, rel in source.rels.items():
+            if rel.reltype in skipped:
+                continue
+            related = rel.target_ref if rel.is_external else self.copy_part(rel.target_part)
+            target.rels._rels[r_id] = type(rel)(
+                str(target.partname.baseURI), r_id, rel.reltype, rel._target_mode, related)
+
+    def _target_layout(self, source_slide):
+        """Layout of the target deck with the same name, else the blank layout"""
+        layout = source_slide.slide_layout
+        return self._layouts.get(layout.name) or self.prs.slide_layouts[6]
+
+    def copy_slide(self, source_slide):
+        """Append a deep copy of source_slide to the target deck"""
+        self._copied = {}
+        source_part = source_slide.part
+        prs_part = self.prs.part
+        partname = prs_part._next_slide_partname
+        self._used.add(str(partname))
+        slide_part = type(source_part)(partname, source_part.content_type, self.package,
+                                       copy.deepcopy(source_part._element))
+        self._copy_rels(source_part, slide_part, _SKIPPED_SLIDE_RELTYPES)
+        layout_r_id = next(r_id for r_id, rel in source_part.rels.items()
+                           if rel.reltype == RT.SLIDE_LAYOUT)
+        slide_part.rels._rels[layout_r_id] = type(source_part.rels[layout_r_id])(
+            str(partname.baseURI), layout_r_id, RT.SLIDE_LAYOUT, RTM.INTERNAL,
+            self._target_layout(source_slide).part)
+        r_id = prs_part.relate_to(slide_part, RT.SLIDE)
+        self.prs.slides._sldIdLst.add_sldId(r_id)
+        self._slides[source_part] = slide_part
+        self._links.extend((slide_part, link_r_id, rel)
+                           for link_r_id, rel in source_part.rels.items()
+                           if rel.reltype == RT.SLIDE)
+        self._link_slides()
+        return slide_part.slide
+
+    def _link_slides(self):
+        # Enlaces cuya slide destino ya se ha copiado: mismo rId, apuntando a la copia
+        pending = []
+        for slide_part, r_id, rel in self._links:
+            target = self._slides.get(rel.target_part)
+            if target is None:
+                pending.append((slide_part, r_id, rel))
+            else:
+                slide_part.rels._rels[r_id] = type(rel)(
+                    str(slide_part.partname.baseURI), r_id, RT.SLIDE, RTM.INTERNAL, target)
+        self._links = pending
+
+    def finish(self):
+        """Drop links to slides that were not merged (their rIds would be dangling)"""
+        for slide_part, r_id, _ in self._links:
+            for tag in _SLIDE_LINK_TAGS:
+                for link in list(slide_part._element.iter(tag)):
+                    if link.get(_R_ID) == r_id:
+                        link.getparent().remove(link)
+        self._links = []
+
+@functools.lru_cache(maxsize=32)
+def _library_deck(path, mtime_ns):
+    return Presentation(path)
+
+def open_library_deck(path):
+    """Open a rendered .pptx once per process (reopened if the file changes)"""
+    path = os.path.abspath(path)
+    _record_input_file(path)
+    return _library_deck(path, os.stat(path).st_mtime_ns)
+
+def parse_slide_selection(selection, count):
+    """Slide indices (0-based) from a 1-based selection like "1,3-5"; all if empty"""
+    if not selection:
+        return list(range(count))
+    indices = []
+    for chunk in selection.split(","):
+        first, _, last = chunk.partition("-")
+        start, end = int(first), int(last or first)
+        if not 1 <= start <= end <= count:
+            raise ValueError(f"selección de slides fuera de rango: {chunk!r} (hay {count})")
+        indices.extend(range(start - 1, end))
+    return indices
+
+def merge_slides(target, source, slides=None):
+    """Append slides of source (a Presentation or .pptx path) to target without re-rendering
+
+    Slide XML is deep-copied and its related parts (images, media, charts)
+    are copied with the same rIds; identical media is stored once. Each
+    slide is re-linked to the target layout with the same name, so source
+    and target should share the base template. slides is a list of 0-based
+    indices or a "1,3-5" selection. Links between merged slides point at
+    the copies; links to slides left out are removed.
+    """
+    if isinstance(source, str):
+        source = open_library_deck(source)
+    if slides is None or isinstance(slides, str):
+        slides = parse_slide_selection(slides, len(source.slides))
+    copier = _PartCopier.for_presentation(target)
+    source_slides = list(source.slides)
+    copied = [copier.copy_slide(source_slides[index]) for index in slides]
+    copier.finish()
+    return copied
+
+def assemble_deck(pieces, template=None):
+    """New deck from library pieces: ["apertura.pptx", "teaser.pptx:2", ("cierre.pptx", [0])]"""
+    prs = new_presentation(template)
+    copier = _PartCopier.for_presentation(prs)
+    for piece in pieces:
+        if isinstance(piece, str):
+            path, _, selection = piece.partition(":")
+            piece = (path, selection)
+        path, selection = piece
+        source = open_library_deck(path)
+        if selection is None or isinstance(selection, str):
+            selection = parse_slide_selection(selection, len(source.slides))
+        source_slides = list(source.slides)
+        for index in selection:
+            copier.copy_slide(source_slides[index])
+    copier.finish()
+    return prs
+
+# ═══════════════════════════════════════════════════════════════
+# RELLENO TIPO MAIL-MERGE: {{tokens}} sobre un .pptx ya generado
+# ═══════════════════════════════════════════════════════════════
+
+FILL_TOKEN = re.compile(r"\{\{\s*([\w.]+)\s*\}\}")
+# Partes donde se buscan tokens: slides y notas
+_FILL_MEMBERS = re.compile(r"ppt/(slides|notesSlides)/\w+\d+\.xml")
+
+def _join_split_tokens(paragraph):
+    """Merge runs so that no {{token}} is split across a:t elements
+
+    PowerPoint splits text into runs at edits and spell-check marks, so a
+    typed {{name}} can end up as "{{na" + "me}}". The merged text keeps the
+    formatting of the run where the token starts.
+    """
+    texts = paragraph.findall(".//a:t", _XML_NS)
+    while True:
+        joined, ends = "", []
+        for t in texts:
+            joined += t.text or ""
+            ends.append(len(joined))
+        for match in FILL_TOKEN.finditer(joined):
+            first = next(n for n, end in enumerate(ends) if end > match.start())
+            last = next(n for n, end in enumerate(ends) if end >= match.end())
+            if first != last:
+                texts[first].text = "".join(t.text or "" for t in texts[first:last + 1])
+                for t in texts[first + 1:last + 1]:
+                    t.text = ""
+                break
+        else:
+            return
+
+class _RunPatcher(abc.ABC):
+    """A rendered .pptx whose selected text runs are rewritten per variant
+
+    Every member without selected runs (masters, layouts, media...) is
+    compressed once into a zip prefix; each variant only re-serializes the
+    slides holding those runs and appends them to a copy of that prefix.
+    source is a path or the bytes of a .pptx.
+    """
+
+    def __init__(self, source):
+        self._runs = {}  # member → [(a:t, texto original)]
+        self._roots = {}
+        prefix = io.BytesIO()
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        with zipfile.ZipFile(source) as package, \
+                zipfile.ZipFile(prefix, "w", zipfile.ZIP_DEFLATED) as zf:
+            for info in package.infolist():
+                data = package.read(info)
+                if _FILL_MEMBERS.fullmatch(info.filename) and self._scan_member(data):
+                    root = etree.fromstring(data)
+                    self._prepare(root)
+                    runs = [(t, t.text) for t in root.iterfind(".//a:t", _XML_NS)
+                            if t.text and self._selects(t.text)]
+                    if runs:
+                        self._runs[info.filename] = runs
+                        self._roots[info.filename] = root
+                        continue
+                zf.writestr(_zip_entry(info.filename, True), data)
+        self._prefix = prefix.getvalue()
+
+    def _scan_member(self, data):
+        """Cheap byte-level check before parsing a slide"""
+        return True
+
+    def _prepare(self, root):
+        """Normalize a parsed slide before its runs are indexed"""
+
+    @abc.abstractmethod
+    def _selects(self, text):
+        """Whether a run with this text is patched"""
+
+    def texts(self):
+        """Original text of every selected run"""
+        return [text for runs in self._runs.values() for _, text in runs]
+
+    def patch(self, replace):
+        """Deck bytes with each selected run's text set to replace(original)"""
+        buffer = io.BytesIO(self._prefix)
+        buffer.seek(0, io.SEEK_END)
+        with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as zf:
+            for member, runs in self._runs.items():
+                for t, text in runs:
+                    t.text = replace(text)
+                zf.writestr(_zip_entry(member, True),
+                            etree.tostring(self._roots[member], encoding="UTF-8",
+                                           xml_declaration=True, standalone=True))
+        return buffer.getvalue()
+
+class FillTemplate(_RunPatcher):
+    """A rendered .pptx scanned once for {{token}} placeholders"""
+
+    def __init__(self, path):
+        self.path = path
+        super().__init__(path)
+        self.tokens = sorted({name for text in self.texts()
+                              for name in FILL_TOKEN.findall(text)})
+
+    def _scan_member(self, data):
+        return b"{{" in data
+
+    def _prepare(self, root):
+        for paragraph in root.iterfind(".//a:p", _XML_NS):
+            _join_split_tokens(paragraph)
+
+    def _selects(self, text):
+        return FILL_TOKEN.search(text) is not None
+
+    def render(self, record):
+        """The filled deck for one record as bytes"""
+        def value(match):
+            name = match.group(1)
+            if name not in record:
+                raise KeyError(name)
+            return str(record[name])
+
+        return self.patch(lambda text: FILL_TOKEN.sub(value, text))
+
+def load_fill_records(path):
+    """Records from a JSON list of objects or a CSV file with a header row"""
+    if path.lower().endswith(".csv"):
+        import csv
+
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding="utf-8") as f:
+        records = json.load(f)
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise ValueError(f"{path}: se esperaba una lista JSON de objetos")
+    return records
+
+def fill_decks(source, records, output_pattern):
+    """Write one filled copy of source per record; yields the output paths
+
+    output_pattern is formatted with the record fields plus n (1-based, it
+    wins over a field named n), e.g. "decks/{client_name}.pptx" or
+    "decks/deck_{n:04d}.pptx".
+    """
+    template = source if isinstance(source, FillTemplate) else FillTemplate(source)
+    for n, record in enumerate(records, 1):
+        try:
+            output_path = output_pattern.format_map({**record, "n": n})
+        except (KeyError, IndexError, ValueError) as exc:
+            # ValueError: campos posicionales ({0}) o formato no válido
+            reason = f"falta el campo {exc.args[0]!r}" if isinstance(exc, KeyError) else exc
+            raise ValueError(f"patrón de salida {output_pattern!r}, registro #{n}: "
+                             f"{reason}") from None
+        try:
+            blob = template.render(record)
+        except KeyError as exc:
+            raise ValueError(f"registro #{n} sin valor para {exc.args[0]!r}") from None
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(blob)
+        yield output_path
+
+# ═══════════════════════════════════════════════════════════════
+# LOCALIZACIÓN: catálogos de mensajes y variantes por idioma
+# ═══════════════════════════════════════════════════════════════
+
+LOCALES_DIR = os.path.join(BASE_DIR, "locales")
+SOURCE_LOCALE = "es"
+# En las claves del catálogo, {} marca un valor de datos ("Hoy: {} sesiones")
+_MESSAGE_ARG = "{}"
+# Sección del catálogo con los valores de datos traducibles (meses, tipos de sesión)
+DATA_VALUES_KEY = "@data"
+# Claves de los datos del deck cuyos valores son vocabulario, no nombres propios
+LOCALIZED_DATA_KEYS = frozenset({"revenue_month", "type"})
+
+class MessageCatalog:
+    """Translations of one locale keyed by the Spanish source text
+
+    Keys without {} match a whole text run; keys with {} match runs built
+    from deck data and carry the values over in order. The @data section
+    translates data values (month names, session types) wherever they
+    appear. Empty translations fall back to the source text.
+    """
+
+    def __init__(self, locale, messages):
+        self.locale = locale
+        messages = dict(messages)
+        self._values = {source: target
+                        for source, target in (messages.pop(DATA_VALUES_KEY, None) or {}).items()
+                        if target}
+        self._messages = {source: target for source, target in messages.items() if target}
+        self._exact = {}
+        self._patterns = []
+        for source, target in messages.items():
+            if not target:
+                continue
+            if _MESSAGE_ARG in source:
+                regex = "(.+?)".join(map(re.escape, source.split(_MESSAGE_ARG)))
+                self._patterns.append((re.compile(regex, re.S), target.split(_MESSAGE_ARG),
+                                       len(source) - len(_MESSAGE_ARG) * source.count(_MESSAGE_ARG)))
+            else:
+                self._exact[source] = target
+        # El patrón más específico primero: "Hoy: {} sesiones" antes que "{} sesiones"
+        self._patterns.sort(key=lambda pattern: -pattern[2])
+        self._memo = {}
+
+    def translate_value(self, value):
+        """Translation of a deck data value from the @data section, or the value itself"""
+        return self._values.get(value, value)
+
+    def translate(self, text):
+        """Translated text, or text itself when the catalog has no entry
+
+        Works on rendered text only, so a data value equal to a message key is
+        translated as if it were that message; translate_template_text avoids
+        this for slides rendered from templates.
+        """
+        translated = self._memo.get(text)
+        if translated is None:
+            translated = self._exact.get(text) or self._values.get(text)
+            if translated is None:
+                for regex, pieces, _ in self._patterns:
+                    match = regex.fullmatch(text)
+                    if match:
+                        translated = pieces[0] + "".join(
+                            self.translate_value(value) + piece
+                            for value, piece in zip(match.groups(), pieces[1:]))
+                        break
+                else:
+                    translated = text
+            self._memo[text] = translated
+        return translated
+
+    def translate_template_text(self, text):
+        """Translate the text of a slide template run, keeping its ⟦n⟧ slots
+
+        Runs that are only data (⟦3⟧) are left alone: their values are
+        localized in the deck data, never looked up as messages.
+        """
+        tokens = [match.group(0) for match in _SLOT_TOKEN.finditer(text)]
+        if not tokens:
+            return self._exact.get(text, text)
+        target = self._messages.get(_SLOT_TOKEN.sub(_MESSAGE_ARG, text))
+        if target is None or target.count(_MESSAGE_ARG) != len(tokens):
+            return text
+        pieces = target.split(_MESSAGE_ARG)
+        return pieces[0] + "".join(token + piece for token, piece in zip(tokens, pieces[1:]))
+
+def _catalog_path(locale):
+    return os.path.join(LOCALES_DIR, f"{locale}.json")
+
+@functools.lru_cache(maxsize=None)
+def load_catalog(locale):
+    """Message catalog of locales/<locale>.json (identity for the source locale)"""
+    if locale == SOURCE_LOCALE:
+        return MessageCatalog(locale, {})
+    path = _catalog_path(locale)
+    _record_input_file(path)
+    with open(path, encoding="utf-8") as f:
+        return MessageCatalog(locale, json.load(f))
+
+def _is_message(text):
+    return any(char.isalpha() for char in _SLOT_TOKEN.sub("", text))
+
+def extract_messages(data=None):
+    """Source texts of every slide, with data values replaced by {}
+
+    Slides are built with template slots instead of data, so texts such as
+    f"Hoy: {n} sesiones" come out as "Hoy: {} sesiones"; slides that cannot
+    be templated are rendered with the default data.
+    """
+    data = data or DEFAULT_DECK_DATA
+    cache = SlideTemplateCache()
+    messages = set()
+    for builder in SLIDE_BUILDERS:
+        template = cache._build(builder, data)
+        if template is not None:
+            tree = template._sp_tree
+        else:
+            prs = new_presentation()
+            builder(prs, dict(data))
+            tree = prs.slides[-1].shapes._spTree
+        for t in tree.iterfind(".//a:t", _XML_NS):
+            if t.text and _is_message(t.text):
+                messages.add(_SLOT_TOKEN.sub(_MESSAGE_ARG, t.text))
+    return sorted(messages)
+
+def _data_values(value, key=None):
+    """String values under LOCALIZED_DATA_KEYS anywhere in the deck data"""
+    if isinstance(value, dict):
+        return {text for k, v in value.items() for text in _data_values(v, k)}
+    if isinstance(value, (list, tuple)):
+        return {text for v in value for text in _data_values(v, key)}
+    return {value} if key in LOCALIZED_DATA_KEYS and isinstance(value, str) else set()
+
+def extract_data_values(data=None):
+    """Data values the catalog's @data section translates: months, session types"""
+    values = _data_values(data or DEFAULT_DECK_DATA)
+    return sorted(values | set(MESES) | set(SESSION_TYPE_LABELS.values()))
+
+def localize_data(value, catalog, key=None):
+    """Deck data with the values under LOCALIZED_DATA_KEYS translated"""
+    if isinstance(value, dict):
+        return {k: localize_data(v, catalog, k) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [localize_data(v, catalog, key) for v in value]
+    if key in LOCALIZED_DATA_KEYS and isinstance(value, str):
+        return catalog.translate_value(value)
+    return value
+
+def update_catalog(locale, data=None):
+    """Add the deck's current source texts to locales/<locale>.json
+
+    Existing translations are kept; new texts and data values get an empty
+    translation. Returns the number of new entries.
+    """
+    path = _catalog_path(locale)
+    messages = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            messages = json.load(f)
+    added = [text for text in extract_messages(data) if text not in messages]
+    messages.update(dict.fromkeys(added, ""))
+    values = messages.setdefault(DATA_VALUES_KEY, {})
+    added_values = [value for value in extract_data_values(data) if value not in values]
+    values.update(dict.fromkeys(added_values, ""))
+    added += added_values
+    os.makedirs(LOCALES_DIR, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(messages, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    load_catalog.cache_clear()
+    return len(added)
+
+class _LocalizedDeck(_RunPatcher):
+    """A rendered deck whose translatable runs are swapped per locale"""
+
+    def __init__(self, source, catalogs):
+        self._catalogs = catalogs
+        super().__init__(source)
+
+    def _selects(self, text):
+        return any(catalog.translate(text) != text for catalog in self._catalogs)
+
+    def render(self, catalog):
+        return self.patch(catalog.translate)
+
+def localized_path(output_path, locale):
+    """deck.pptx → deck.en.pptx"""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.{locale}{ext or '.pptx'}"
+
+def render_deck_locales(data, locales, output_path, slides=None, template=None,
+                        template_cache=None):
+    """Render one variant of the deck per locale; returns {locale: path}
+
+    Every locale is instantiated from the same slide templates (built once):
+    message runs are translated in the template, where data runs are still
+    slots, and data values are localized through the catalog's @data
+    section, so a client called "Agenda" keeps their name. Auto-fit is
+    recomputed for the translated text.
+    """
+    catalogs = [load_catalog(locale) for locale in locales]
+    template_cache = template_cache if template_cache is not None else TEMPLATE_CACHE
+    deck_data = {**DEFAULT_DECK_DATA, **(data or {})}
+    outputs = {}
+    for catalog in catalogs:
+        prs = build_presentation(localize_data(deck_data, catalog), template_cache=template_cache,
+                                 slides=slides, template=template, catalog=catalog)
+        path = outputs[catalog.locale] = localized_path(output_path, catalog.locale)
+        save_streaming(prs, path, deterministic=True)
+    return outputs
+
+def render_locales(prs, locales, output_path):
+    """Write one variant of the rendered prs per locale; returns {locale: path}
+
+    For decks without builders behind them (--merge): the deck is serialized
+    once and each locale swaps the text of the runs its catalog translates,
+    keeping the geometry. Decks built from data use render_deck_locales.
+    """
+    catalogs = [load_catalog(locale) for locale in locales]
+    buffer = io.BytesIO()
+    save_streaming(prs, buffer, deterministic=True)
+    deck = _LocalizedDeck(buffer.getvalue(), catalogs)
+    outputs = {}
+    for catalog in catalogs:
+        path = outputs[catalog.locale] = localized_path(output_path, catalog.locale)
+        with open(path, "wb") as f:
+            f.write(deck.render(catalog))
+    return outputs
+
+# ═══════════════════════════════════════════════════════════════
+# VALIDACIÓN: lint del deck en memoria, una pasada por slide
+# ═══════════════════════════════════════════════════════════════
+
+LintIssue = namedtuple("LintIssue", "slide shape code severity message")
+
+# Texto que ocupa más de esta fracción de la caja menor de otro text box
+LINT_OVERLAP_RATIO = 0.5
+# Fuentes que se dan por disponibles además de la del tema y las de TEXT_STYLES
+LINT_KNOWN_FONTS = frozenset({"Arial", "Calibri", "Helvetica", "Segoe UI Emoji",
+                              "Apple Color Emoji", "Noto Color Emoji"})
+
+_A_NS = _XML_NS["a"]
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_TAG_C_NV_PR = f"{{{_XML_NS['p']}}}cNvPr"
+_TAG_XFRM = (f"{{{_A_NS}}}xfrm", f"{{{_XML_NS['p']}}}xfrm")
+_TAG_OFF, _TAG_EXT = f"{{{_A_NS}}}off", f"{{{_A_NS}}}ext"
+_TAG_T = f"{{{_A_NS}}}t"
+_FONT_TAGS = {f"{{{_A_NS}}}{name}" for name in ("latin", "ea", "cs")}
+_REL_ATTRS = tuple(f"{{{_R_NS}}}{name}" for name in ("embed", "link", "id"))
+_REL_TAGS = {f"{{{_A_NS}}}{name}"
+             for name in ("blip", "hlinkClick", "hlinkHover", "videoFile", "audioFile")}
+_REL_TAGS |= {f"{{{_C_NS}}}chart", f"{{{_XML_NS['p']}}}oleObj"}
+_TAG_C_NV_SP_PR = f"{{{_XML_NS['p']}}}cNvSpPr"
+# Solo se visitan estos nodos: lxml filtra en C y no crea proxies para el resto
+_LINT_TAGS = (_TAG_C_NV_PR, _TAG_C_NV_SP_PR, _TAG_T, *_TAG_XFRM, *_FONT_TAGS, *_REL_TAGS)
+_SHAPE_TAGS = {f"{{{_XML_NS['p']}}}{name}"
+               for name in ("sp", "pic", "graphicFrame", "grpSp", "cxnSp")}
+
+def _known_fonts():
+    fonts = set(LINT_KNOWN_FONTS) | {THEME_FONT}
+    fonts.update(style.font_name for style in TEXT_STYLES.values())
+    fonts.update(name for name, _ in _FONT_FILES)
+    return fonts
+
+def _lint_shape(element, rel_ids, known_fonts):
+    """One traversal of a shape: its facts plus any structural issues found"""
+    facts = {"id": None, "name": "", "box": None, "text": False, "text_box": False,
+             "issues": []}
+    issues = facts["issues"]
+    xfrm_seen = False
+    for node in element.iter(_LINT_TAGS):
+        tag = node.tag
+        if tag == _TAG_C_NV_PR and facts["id"] is None:
+            facts["id"], facts["name"] = node.get("id"), node.get("name", "")
+            if not (facts["id"] or "").isdigit():
+                issues.append(("bad_id", "error", f"id de shape inválido {facts['id']!r}"))
+        elif tag in _TAG_XFRM and not xfrm_seen:
+            xfrm_seen = True
+            off, ext = node.find(_TAG_OFF), node.find(_TAG_EXT)
+            if off is None or ext is None:
+                issues.append(("bad_xfrm", "error", "xfrm sin off/ext"))
+                continue
+            try:
+                x, y = int(off.get("x")), int(off.get("y"))
+                cx, cy = int(ext.get("cx")), int(ext.get("cy"))
+            except (TypeError, ValueError):
+                # Atributo ausente (None) o no numérico
+                values = [off.get("x"), off.get("y"), ext.get("cx"), ext.get("cy")]
+                issues.append(("bad_xfrm", "error", f"off/ext no numéricos {values}"))
+                continue
+            if cx < 0 or cy < 0:
+                issues.append(("negative_size", "error", f"tamaño negativo {cx}×{cy} EMU"))
+            else:
+                facts["box"] = (x, y, x + cx, y + cy)
+        elif tag == _TAG_T:
+            if node.text and node.text.strip():
+                facts["text"] = True
+        elif tag in _FONT_TAGS:
+            typeface = node.get("typeface", "")
+            if typeface and not typeface.startswith("+") and typeface not in known_fonts:
+                issues.append(("unknown_font", "warning", f"fuente no disponible {typeface!r}"))
+        elif tag == _TAG_C_NV_SP_PR:
+            facts["text_box"] = node.get("txBox") == "1"
+        else:
+            for attr in _REL_ATTRS:
+                r_id = node.get(attr)
+                if r_id and r_id not in rel_ids:
+                    issues.append(("broken_rel", "error", f"relación inexistente {r_id}"))
+    return facts
+
+def _overlap(a, b):
+    """Intersection area of two boxes over the area of the smaller one"""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return width * height / smaller if smaller else 0
+
+def lint_slide(slide, number, slide_width, slide_height, known_fonts=None):
+    """Issues of one slide: canvas bounds, text overlaps, fonts, empty text, ids, rels"""
+    known_fonts = known_fonts or _known_fonts()
+    rel_ids = set(slide.part.rels.keys())
+    issues = []
+    seen_ids = set()
+    text_boxes = []
+    for element in slide.shapes._spTree.iterchildren():
+        if element.tag not in _SHAPE_TAGS:
+            continue
+        facts = _lint_shape(element, rel_ids, known_fonts)
+        label = facts["name"] or f"#{facts['id']}"
+        issues.extend(LintIssue(number, label, *issue) for issue in facts["issues"])
+        if facts["id"] in seen_ids:
+            issues.append(LintIssue(number, label, "duplicate_id", "error",
+                                    f"id {facts['id']} repetido en la slide"))
+        seen_ids.add(facts["id"])
+        box = facts["box"]
+        if box is not None:
+            left, top, right, bottom = box
+            if right <= 0 or bottom <= 0 or left >= slide_width or top >= slide_height:
+                issues.append(LintIssue(number, label, "off_canvas", "error",
+                                        "fuera de la slide"))
+            elif left < 0 or top < 0 or right > slide_width or bottom > slide_height:
+                issues.append(LintIssue(number, label, "partly_off_canvas", "warning",
+                                        f"se sale de la slide ({Emu(left).inches:.2f}, "
+                                        f"{Emu(top).inches:.2f}) → ({Emu(right).inches:.2f}, "
+                                        f"{Emu(bottom).inches:.2f}) in"))
+        if facts["text_box"]:
+            if not facts["text"]:
+                issues.append(LintIssue(number, label, "empty_text", "warning",
+                                        "text box sin texto"))
+            elif box is not None:
+                text_boxes.append((box, label))
+    # Solapes entre text boxes: barrido por el borde izquierdo
+    text_boxes.sort()
+    for n, (box, label) in enumerate(text_boxes):
+        for other, other_label in text_boxes[n + 1:]:
+            if other[0] >= box[2]:
+                break
+            if _overlap(box, other) > LINT_OVERLAP_RATIO:
+                issues.append(LintIssue(number, label, "text_overlap", "warning",
+                                        f"texto solapado con {other_label}"))
+    return issues
+
+def lint_deck(prs):
+    """Lint every slide of prs; returns a list of LintIssue (slides numbered from 1)"""
+    known_fonts = _known_fonts()
+    width, height = prs.slide_width, prs.slide_height
+    return [issue for number, slide in enumerate(prs.slides, 1)
+            for issue in lint_slide(slide, number, width, height, known_fonts)]
+
+def print_lint(issues, file=None):
+    """Print lint issues, errors first; returns the number of errors"""
+    errors = sum(issue.severity == "error" for issue in issues)
+    for issue in sorted(issues, key=lambda issue: (issue.severity != "error", issue.slide)):
+        mark = "✗" if issue.severity == "error" else "⚠"
+        print(f"  {mark} slide {issue.slide} · {issue.shape}: {issue.message} ({issue.code})",
+              file=file)
+    print(f"Validación: {errors} errores, {len(issues) - errors} avisos", file=file)
+    return errors
+
+# ═══════════════════════════════════════════════════════════════
+# PERFILADO: tiempos, shapes y bytes por slide (opcional)
+# ═══════════════════════════════════════════════════════════════
+
+# Helpers que se instrumentan al activar el perfilado. Se sustituyen en los
+# globals del módulo, así que sin perfilado no tienen ningún coste extra.
+PROFILED_HELPERS = (
+    "set_slide_background", "add_autoshape", "add_text_box", "add_rounded_rectangle",
+    "add_circle", "add_arrow", "add_glass_card", "add_mini_card", "add_badge",
+    "add_progress_bar", "add_stat_number", "add_image", "add_bar_chart", "add_line_chart",
+    "add_gauge",
+)
+
+_PROFILER = None
+
+def _shape_kind(element):
+    """Short type name of a shape-tree child: text_box, roundRect, picture, ..."""
+    tag = etree.QName(element).localname
+    if tag == "sp":
+        if element.find("p:nvSpPr/p:cNvSpPr[@txBox='1']", _XML_NS) is not None:
+            return "text_box"
+        geometry = element.find("p:spPr/a:prstGeom", _XML_NS)
+        return geometry.get("prst") if geometry is not None else "shape"
+    return {"pic": "picture", "graphicFrame": "graphic_frame", "grpSp": "group",
+            "cxnSp": "connector"}.get(tag, tag)
+
+class Profiler:
+    """Per-slide shape counts, helper timings, save time and package bytes"""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._current_slide = None
+        self.events = []    # (nombre, categoría, inicio, duración, slide)
+        self.slides = []
+        self.package = {}
+
+    def _now(self):
+        return time.perf_counter() - self._origin
+
+    def wrap(self, name, helper):
+        @functools.wraps(helper)
+        def timed(*args, **kwargs):
+            start = self._now()
+            try:
+                return helper(*args, **kwargs)
+            finally:
+                self.events.append((name, "helper", start, self._now() - start,
+                                    self._current_slide))
+        return timed
+
+    @contextlib.contextmanager
+    def measure(self, name, category="stage"):
+        start = self._now()
+        try:
+            yield
+        finally:
+            self.events.append((name, category, start, self._now() - start, None))
+
+    @contextlib.contextmanager
+    def slide(self, prs, name):
+        """Time one slide builder and count the shapes it created"""
+        index = self._current_slide = len(self.slides)
+        start = self._now()
+        try:
+            yield
+        finally:
+            duration = self._now() - start
+            self._current_slide = None
+            self.events.append((name, "slide", start, duration, index))
+            sp_tree = prs.slides[-1].shapes._spTree
+            kinds = Counter(_shape_kind(child) for child in sp_tree.iterchildren()
+                            if etree.QName(child).localname not in ("nvGrpSpPr", "grpSpPr"))
+            self.slides.append({"index": index, "builder": name, "seconds": duration,
+                                "shapes": dict(kinds), "bytes": 0})
+
+    def record_package(self, prs, pptx_file):
+        """Attribute the compressed size of each zip entry to the slide that owns it
+
+        Slide XML, its .rels and the media/charts it is the first to reference
+        count for that slide; masters, layouts, theme and metadata count as
+        'shared'.
+        """
+        with zipfile.ZipFile(pptx_file) as zf:
+            sizes = {info.filename: info.compress_size for info in zf.infolist()}
+        claimed = set()
+        for entry, slide in zip(self.slides, prs.slides):
+            members = [slide.part.partname.membername, slide.part.partname.rels_uri.membername]
+            members += [rel.target_part.partname.membername
+                        for rel in slide.part.rels.values()
+                        if not rel.is_external and rel.reltype != _SLIDE_LAYOUT_RELTYPE]
+            for member in members:
+                if member in sizes and member not in claimed:
+                    claimed.add(member)
+                    entry["bytes"] += sizes[member]
+        self.package = {
+            "total_bytes": sum(sizes.values()),
+            "shared_bytes": sum(size for name, size in sizes.items() if name not in claimed),
+        }
+
+    def summary(self):
+        """JSON-friendly report: per-slide shapes/bytes/helper times, stages, package"""
+        slides = [dict(entry, helpers={}) for entry in self.slides]
+        stages = {}
+        for name, category, _, duration, index in self.events:
+            if category == "helper" and index is not None and index < len(slides):
+                helper = slides[index]["helpers"].setdefault(name, {"calls": 0, "seconds": 0.0})
+                helper["calls"] += 1
+                helper["seconds"] += duration
+            elif category == "stage":
+                stages[name] = stages.get(name, 0.0) + duration
+        return {"slides": slides, "stages": stages, "package": self.package}
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+
+    def write_chrome_trace(self, path):
+        """Write the events in Chrome trace format (chrome://tracing, Perfetto)"""
+        events = [{
+            "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": 1,
+            "ts": start * 1e6, "dur": duration * 1e6,
+            "args": {} if index is None else {"slide": index},
+        } for name, category, start, duration, index in self.events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+def enable_profiling():
+    """Instrument the helpers and return the active Profiler"""
+    global _PROFILER
+    disable_profiling()
+    _PROFILER = Profiler()
+    for name in PROFILED_HELPERS:
+        globals()[name] = _PROFILER.wrap(name, globals()[name])
+    return _PROFILER
+
+def disable_profiling():
+    """Restore the uninstrumented helpers"""
+    global _PROFILER
+    if _PROFILER is None:
+        return
+    for name in PROFILED_HELPERS:
+        globals()[name] = globals()[name].__wrapped__
+    _PROFILER = None
+
+def _profile_slide(prs, builder):
+    if _PROFILER is None:
+        return contextlib.nullcontext()
+    return _PROFILER.slide(prs, builder.__name__)
+
+def _profile_stage(name):
+    if _PROFILER is None:
+        return contextlib.nullcontext()
+    return _PROFILER.measure(name)
+
+# ═══════════════════════════════════════════════════════════════
+# POOL DE PLANTILLAS: la plantilla base se parsea una vez por proceso
+# ═══════════════════════════════════════════════════════════════
+
+class TemplatePool:
+    """Parse a base .pptx once and hand out decks that share its masters, layouts and theme
+
+    Each deck gets its own package with a copy of presentation.xml and of the
+    core properties; every other part (masters, layouts, theme, presProps...)
+    is the same object in all decks. Adding slides only creates relationships
+    from the new slide parts, so the shared parts are never modified. Slides
+    already in the base file are left out of the copies.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        base = Presentation(path)
+        base.slide_width = Inches(13.333)
+        base.slide_height = Inches(7.5)
+        apply_theme(base)
+        self._base = base
+
+    def presentation(self):
+        """New empty Presentation backed by the shared template parts"""
+        base_part = self._base.part
+        base_package = base_part.package
+        package = type(base_package)(None)
+
+        element = copy.deepcopy(base_part._element)
+        sld_id_lst = element.find("p:sldIdLst", _XML_NS)
+        if sld_id_lst is not None:
+            element.remove(sld_id_lst)
+        part = type(base_part)(base_part.partname, base_part.content_type, package, element)
+        part.rels._rels.update((r_id, rel) for r_id, rel in base_part.rels.items()
+                               if rel.reltype != RT.SLIDE)
+
+        for r_id, rel in base_package._rels.items():
+            target = rel.target_part if not rel.is_external else rel.target_ref
+            if rel.reltype == RT.OFFICE_DOCUMENT:
+                target = part
+            elif rel.reltype == RT.CORE_PROPERTIES:
+                target = type(target)(target.partname, target.content_type, package,
+                                      copy.deepcopy(target._element))
+            package._rels._rels[r_id] = type(rel)(
+                rel._base_uri, r_id, rel.reltype, rel._target_mode, target)
+        return part.presentation
+
+_template_pools = {}
+
+def template_pool(path=None):
+    """Per-process TemplatePool for a base .pptx (None: python-pptx's default)"""
+    # Clave absoluta: la misma plantilla por ruta relativa no se parsea dos veces
+    path = os.path.abspath(path) if path else None
+    pool = _template_pools.get(path)
+    if pool is None:
+        pool = _template_pools[path] = TemplatePool(path)
+    return pool
+
+# Orden de slides del deck
+SLIDE_BUILDERS = [
+    create_slide_1,      # Apertura: REVIVE Nueva Etapa
+    create_slide_2,      # Todo en uno: Centralización
+    create_slide_2b,     # Lo que vas a ganar: Beneficios
+    create_slide_3,      # Teaser Visual: Glassmorphism
+    create_slide_4,      # Friends & Family → Business Partners
+    create_slide_5,      # Roadmap de Ideas
+    create_slide_6,      # Crezcamos juntos
+]
+
+# Presentación vacía ya preparada por warm_up(); cada hijo del renderer
+# caliente hereda su propia copia con el fork y la usa una vez
+_warm_presentation = None
+
+def new_presentation(template=None):
+    """Empty 16:9 presentation from the template pool (template: custom base .pptx)"""
+    global _warm_presentation
+    if _warm_presentation is not None and template is None:
+        prs, _warm_presentation = _warm_presentation, None
+        return prs
+    return template_pool(template).presentation()
+
+def build_presentation(data=None, template_cache=None, prs=None, slides=None,
+                       template=None, catalog=None):
+    """Build the deck in memory (into prs if given) and return the Presentation
+
+    slides selects builders by 0-based index (all by default) or with a
+    1-based "1,3-5" selection; template is the base .pptx (of prs, if given)
+    and catalog translates the slides rendered through template_cache.
+    """
     # Create presentation with 16:9 aspect ratio
-    prs = Presentation()
-    prs.slide_width = Inches(13.333)
-    prs.slide_height = Inches(7.5)
-
-    # Create all slides
-    create_slide_1(prs)      # Apertura: REVIVE Nueva Etapa
-    create_slide_2(prs)      # Todo en uno: Centralización
-    create_slide_2b(prs)     # Lo que vas a ganar: Beneficios
-    create_slide_3(prs)      # Teaser Visual: Glassmorphism
-    create_slide_4(prs)      # Friends & Family → Business Partners
-    create_slide_5(prs)      # Roadmap de Ideas
-    create_slide_6(prs)      # Crezcamos juntos
-
-    # Save presentation
-    output_path = '/Users/juan.poblete/Documents/Personal/TheMindFactory/TheMindFactory/REVIVE_Reunion_Christian.pptx'
-    prs.save(output_path)
+    if prs is None:
+        prs = new_presentation(template)
+
+    if slides is None or isinstance(slides, str):
+        slides = parse_slide_selection(slides, len(SLIDE_BUILDERS))
+    deck_data = {**DEFAULT_DECK_DATA, **(data or {})}
+    for builder in (SLIDE_BUILDERS[index] for index in slides):
+        with _profile_slide(prs, builder):
+            if template_cache is not None:
+                template_cache.render(prs, builder, deck_data, template, catalog)
+            else:
+                builder(prs, deck_data)
+    return prs
+
+# ═══════════════════════════════════════════════════════════════
+# DATOS DE REVIVE-APP: carga única e índices en memoria
+# ═══════════════════════════════════════════════════════════════
+
+MESES = ("Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio", "Agosto",
+         "Septiembre", "Octubre", "Noviembre", "Diciembre")
+SESSION_TYPE_LABELS = {"presencial": "Presencial", "online": "Online"}
+
+def _full_name(nombre, apellidos=None):
+    return f"{nombre} {apellidos}".strip() if apellidos else nombre
+
+class AppDataIndex:
+    """In-memory index of a revive-app data export, built once per process
+
+    The export is JSON with the same collections as revive-app's
+    src/lib/mock-data.ts (types in src/types/index.ts), keyed without the
+    'mock' prefix: clientes, sesiones, transacciones, clientesAdherencia and
+    trainerPerfil (or a trainers list). Records may carry a trainer_id;
+    without one they belong to the first trainer. Sessions are indexed by
+    trainer and date, transactions by trainer and month (YYYY-MM), clients by
+    id and trainer, so building each deck is a handful of dict lookups.
+    """
+
+    def __init__(self, export):
+        trainers = export.get("trainers") or [export.get("trainerPerfil") or {"id": "trainer"}]
+        self.trainers = {trainer["id"]: trainer for trainer in trainers}
+        default_trainer = trainers[0]["id"]
+
+        self.clients = {}
+        self.clients_by_trainer = defaultdict(list)
+        for client in export.get("clientes", []):
+            self.clients[client["id"]] = client
+            self.clients_by_trainer[client.get("trainer_id", default_trainer)].append(client)
+
+        self.sessions_by_day = defaultdict(lambda: defaultdict(list))
+        self.session_count_by_client = Counter()
+        for session in export.get("sesiones", []):
+            trainer = session.get("trainer_id", default_trainer)
+            if session.get("estado") != "cancelada":
+                self.sessions_by_day[trainer][session["fecha"]].append(session)
+                self.session_count_by_client[session["cliente_id"]] += 1
+        for days in self.sessions_by_day.values():
+            for sessions in days.values():
+                sessions.sort(key=lambda session: session["hora_inicio"])
+
+        self.income_by_month = defaultdict(lambda: defaultdict(list))
+        for tx in export.get("transacciones", []):
+            if tx.get("tipo") == "ingreso":
+                trainer = tx.get("trainer_id", default_trainer)
+                self.income_by_month[trainer][tx["fecha"][:7]].append(tx)
+
+        self.adherence_by_trainer = defaultdict(list)
+        for entry in export.get("clientesAdherencia", []):
+            client = self.clients.get(entry["cliente_id"], {})
+            self.adherence_by_trainer[client.get("trainer_id", default_trainer)].append(entry)
+
+    def deck_data(self, trainer=None, day=None, month=None):
+        """Deck data overrides (DEFAULT_DECK_DATA keys) for one trainer
+
+        day (YYYY-MM-DD) defaults to the busiest day and month (YYYY-MM) to
+        the most recent month with income. Keys that cannot be derived from
+        the export are omitted so the defaults apply. Raises KeyError for a
+        trainer id that is not in the export.
+        """
+        trainer = trainer or next(iter(self.trainers))
+        if trainer not in self.trainers:
+            raise KeyError(f"trainer {trainer!r} no está en el export "
+                           f"(hay: {', '.join(self.trainers)})")
+        profile = self.trainers[trainer]
+        data = {"trainer_name": profile.get("nombre", DEFAULT_DECK_DATA["trainer_name"])}
+
+        days = self.sessions_by_day.get(trainer, {})
+        if days:
+            day = day or max(sorted(days), key=lambda d: len(days[d]))
+            today = days.get(day, [])
+            data["sessions"] = [{
+                "client": _full_name(s["cliente_nombre"], s.get("cliente_apellidos")),
+                "time": f"{s['hora_inicio']} - {s['hora_fin']}",
+                "type": SESSION_TYPE_LABELS.get(s["tipo"], s["tipo"].capitalize()),
+            } for s in today[:2]]
+            data["sessions_today"] = len(today)
+            week = date.fromisoformat(day).isocalendar()[:2]
+            week_days = [d for d in days if date.fromisoformat(d).isocalendar()[:2] == week]
+            data["sessions_week_total"] = sum(len(days[d]) for d in week_days)
+            data["sessions_week_done"] = sum(len(days[d]) for d in week_days if d <= day)
+
+        clients = [c for c in self.clients_by_trainer.get(trainer, [])
+                   if c.get("estado", "activo") == "activo"]
+        rated = [c for c in clients if c.get("adherenciaPromedio") is not None]
+        if rated:
+            busiest = sorted(rated, key=lambda c: -self.session_count_by_client[c["id"]])
+            data["clients"] = [{
+                "name": _full_name(c["nombre"], c.get("apellidos")),
+                "sessions": self.session_count_by_client[c["id"]],
+                "adherence": c["adherenciaPromedio"],
+            } for c in busiest[:2]]
+            data["adherence"] = round(sum(c["adherenciaPromedio"] for c in rated) / len(rated))
+        if clients:
+            data["clients_follow_up"] = sum(
+                1 for c in clients if c.get("alertasActivas") or c.get("tendencia") == "bajando")
+
+        ranking = self.adherence_by_trainer.get(trainer) or [
+            {"cliente_nombre": _full_name(c["nombre"], c.get("apellidos")),
+             "adherencia": c["adherenciaPromedio"]} for c in rated]
+        if ranking:
+            data["top_adherence"] = [
+                {"name": entry["cliente_nombre"], "adherence": entry["adherencia"]}
+                for entry in sorted(ranking, key=lambda e: -e["adherencia"])[:3]]
+
+        months = self.income_by_month.get(trainer, {})
+        if months:
+            month = month or max(months)
+            income = months.get(month, [])
+            total = sum(tx["monto"] for tx in income)
+            paid = sum(tx["monto"] for tx in income if tx["estado"] == "pagado")
+            year, month_number = map(int, month.split("-"))
+            previous = f"{year - (month_number == 1)}-{(month_number - 2) % 12 + 1:02d}"
+            previous_total = sum(tx["monto"] for tx in months.get(previous, []))
+            data.update({
+                "revenue": total,
+                "revenue_month": MESES[month_number - 1],
+                "revenue_growth": round((total - previous_total) / previous_total * 100)
+                                  if previous_total else 0,
+                "collected_pct": round(paid / total * 100) if total else 0,
+                "pending_invoices": sum(1 for tx in income if tx["estado"] != "pagado"),
+            })
+        return data
+
+    def trainer_deck_specs(self, output_dir, month=None):
+        """One deck spec per trainer in the export"""
+        return [{"output": os.path.join(output_dir, f"REVIVE_{trainer_id}.pptx"),
+                 "app_data": {"trainer": trainer_id, "month": month}}
+                for trainer_id in self.trainers]
+
+_app_data_indexes = {}
+
+def load_app_data(path):
+    """Load and index a revive-app JSON export (cached per process and path)"""
+    path = os.path.abspath(path)
+    index = _app_data_indexes.get(path)
+    if index is None:
+        with open(path, encoding="utf-8") as f:
+            index = _app_data_indexes[path] = AppDataIndex(json.load(f))
+    return index
+
+def _spec_deck_data(spec):
+    """Deck data of a spec: app export bindings first, explicit data on top"""
+    data = {}
+    if spec.get("app_data"):
+        bindings = dict(spec["app_data"])
+        index = load_app_data(bindings.pop("file", None) or spec["app_data_file"])
+        data.update(index.deck_data(**bindings))
+    data.update(spec.get("data") or {})
+    return data
+
+# ═══════════════════════════════════════════════════════════════
+# REBUILD INCREMENTAL: solo se regeneran las slides con inputs nuevos
+# ═══════════════════════════════════════════════════════════════
+
+BUILD_MANIFEST_SUFFIX = ".build.json"
+
+_renderer_version = None
+
+# Constantes alcanzables que no van en la versión: rutas de la máquina, el
+# emisor rápido (mismo XML que python-pptx) y los datos por defecto, que cada
+# slide ya compara por clave
+_VERSION_IGNORED_GLOBALS = frozenset({"BASE_DIR", "SPEC_DIR", "FONT_DIRS", "FAST_EMIT",
+                                      "DEFAULT_DECK_DATA"})
+
+def _code_names(code):
+    """Global names used by a code object and by its nested functions and comprehensions"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+def _plain_value(value):
+    # Constantes con repr estable entre procesos (sin direcciones de memoria)
+    if isinstance(value, (str, int, float, bool, bytes, type(None), RgbColor)):
+        return True
+    if isinstance(value, (tuple, list, frozenset, set)):
+        return all(_plain_value(v) for v in value)
+    if isinstance(value, dict):
+        return all(_plain_value(k) and _plain_value(v) for k, v in value.items())
+    return False
+
+def _stable_repr(value):
+    """repr with sets sorted: the order of a set of str changes with PYTHONHASHSEED"""
+    if isinstance(value, (frozenset, set)):
+        return "{" + ", ".join(sorted(map(_stable_repr, value))) + "}"
+    if isinstance(value, (tuple, list)) and not isinstance(value, RgbColor):
+        return type(value).__name__ + "(" + ", ".join(map(_stable_repr, value)) + ")"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{_stable_repr(k)}: {_stable_repr(v)}"
+                               for k, v in value.items()) + "}"
+    return repr(value)
+
+def _class_functions(cls):
+    """Plain functions behind the methods and properties defined on a class"""
+    for member in vars(cls).values():
+        member = getattr(member, "__func__", member)
+        for func in ((member.fget, member.fset) if isinstance(member, property) else (member,)):
+            if inspect.isfunction(func):
+                yield func
+
+def _hash_code(h, code):
+    # Bytecode, nombres y constantes; sin números de línea, para que editar
+    # otra parte del fichero no cambie la versión
+    h.update(code.co_code)
+    h.update(" ".join(code.co_names + code.co_varnames).encode())
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _hash_code(h, const)
+        else:
+            h.update(_stable_repr(const).encode())
+
+def _hash_function(h, func):
+    func = inspect.unwrap(func)
+    h.update(func.__qualname__.encode())
+    _hash_code(h, func.__code__)
+    h.update(_stable_repr((func.__defaults__, func.__kwdefaults__)).encode())
+
+def code_fingerprint(obj):
+    """Hash of a module function or class as compiled: code, defaults, class constants
+
+    Much faster than hashing inspect.getsource(), which re-parses the whole
+    module for every class.
+    """
+    h = hashlib.sha256()
+    if inspect.isclass(obj):
+        h.update(f"{obj.__name__}{[base.__name__ for base in obj.__mro__[1:]]}".encode())
+        for name, member in sorted(vars(obj).items()):
+            if _plain_value(member):
+                h.update(f"{name}={_stable_repr(member)}".encode())
+        for func in sorted(_class_functions(obj), key=lambda func: func.__qualname__):
+            _hash_function(h, func)
+    else:
+        _hash_function(h, obj)
+    return h.hexdigest()
+
+def render_dependencies():
+    """Module-level functions, classes and constants the slide builders can reach
+
+    Walks the global names used by every builder, transitively; the builders
+    themselves are left out (each slide fingerprints its own builder).
+    """
+    module_globals = globals()
+    seen, pending = set(), [builder.__name__ for builder in SLIDE_BUILDERS]
+    code_objects, constants = {}, {}
+    while pending:
+        name = pending.pop()
+        if name in seen or name not in module_globals:
+            continue
+        seen.add(name)
+        value = module_globals[name]
+        target = inspect.unwrap(value) if callable(value) else value
+        if inspect.isfunction(target) and target.__module__ == __name__:
+            code_objects[name] = target
+            pending.extend(_code_names(target.__code__))
+        elif inspect.isclass(target) and target.__module__ == __name__:
+            code_objects[name] = target
+            for base in target.__mro__[1:]:
+                if base.__module__ == __name__:
+                    pending.append(base.__name__)
+            for func in _class_functions(target):
+                pending.extend(_code_names(func.__code__))
+        elif (name.lstrip("_").isupper() and name not in _VERSION_IGNORED_GLOBALS
+              and _plain_value(value)):
+            # Solo constantes en mayúsculas: las minúsculas son estado y cachés
+            constants[name] = value
+    for builder in SLIDE_BUILDERS:
+        code_objects.pop(builder.__name__, None)
+    return code_objects, constants
+
+def renderer_version():
+    """Hash of the code and constants of everything the slide builders can reach"""
+    global _renderer_version
+    if _renderer_version is None:
+        h = hashlib.sha256()
+        code_objects, constants = render_dependencies()
+        for name in sorted(code_objects):
+            h.update(f"{name}={code_fingerprint(code_objects[name])}".encode())
+        # Incluye colores, TEXT_STYLES, THEME_FONT y NATIVE_EFFECTS
+        for name in sorted(constants):
+            h.update(f"{name}={_stable_repr(constants[name])}".encode())
+        _renderer_version = h.hexdigest()
+    return _renderer_version
+
+class _RecordingDict(dict):
+    """Deck data that remembers which top-level keys a slide builder reads"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.accessed = set()
+
+    def __getitem__(self, key):
+        self.accessed.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed.add(key)
+        return super().get(key, default)
+
+def _slide_fingerprint(builder, data, data_keys, files):
+    """Hash of everything a slide depends on: code, data it reads and input files"""
+    h = hashlib.sha256(renderer_version().encode())
+    h.update(code_fingerprint(builder).encode())
+    used = {key: data.get(key) for key in data_keys}
+    h.update(json.dumps(used, sort_keys=True, ensure_ascii=False, default=str).encode())
+    for path in files:
+        full_path = os.path.join(BASE_DIR, path)
+        h.update(path.encode())
+        h.update(_file_content_hash(full_path).encode() if os.path.exists(full_path) else b"-")
+    return h.hexdigest()
+
+def _render_recorded(prs, builder, data):
+    """Render one slide and return its manifest entry"""
+    global _input_files
+    recorder = _RecordingDict(data)
+    _input_files = set()
+    try:
+        builder(prs, recorder)
+        files = sorted(_input_files)
+    finally:
+        _input_files = None
+    data_keys = sorted(recorder.accessed)
+    return {
+        "builder": builder.__name__,
+        "data_keys": data_keys,
+        "files": files,
+        "fingerprint": _slide_fingerprint(builder, data, data_keys, files),
+    }
+
+def _move_last_slide_to(prs, index):
+    """Put the last slide at position index, dropping the slide that was there"""
+    sld_id_lst = prs.slides._sldIdLst
+    new, old = sld_id_lst[-1], sld_id_lst[index]
+    old.addprevious(new)
+    sld_id_lst.remove(old)
+    prs.part.drop_rel(old.rId)
+
+def _load_build_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("slides"), list):
+        return None
+    return manifest
+
+def _template_hash(template):
+    return _file_content_hash(template) if template else None
+
+def build_incremental(output_path, data=None, template=None):
+    """Reopen the last output and re-render only the slides whose inputs changed
+
+    Each slide's fingerprint covers the builder's code, everything it can
+    reach (renderer_version), the deck data keys it read and the files it
+    loaded; a different base template rebuilds the whole deck. Clean slides
+    keep their serialized parts from output_path.
+    Returns (prs, manifest_entries, dirty_indices).
+    """
+    deck_data = {**DEFAULT_DECK_DATA, **(data or {})}
+    manifest = _load_build_manifest(output_path + BUILD_MANIFEST_SUFFIX)
+    names = [builder.__name__ for builder in SLIDE_BUILDERS]
+
+    prs = previous = None
+    if manifest and manifest.get("template") == _template_hash(template):
+        previous = manifest["slides"]
+    if previous and [entry["builder"] for entry in previous] == names \
+            and os.path.exists(output_path):
+        prs = Presentation(output_path)
+        if len(prs.slides) != len(names):
+            prs = None
+    if prs is None:
+        prs = new_presentation(template)
+        entries = [_render_recorded(prs, builder, deck_data) for builder in SLIDE_BUILDERS]
+        return prs, entries, list(range(len(entries)))
+
+    entries, dirty = [], []
+    for index, (builder, entry) in enumerate(zip(SLIDE_BUILDERS, previous)):
+        fingerprint = _slide_fingerprint(builder, deck_data, entry["data_keys"], entry["files"])
+        if fingerprint == entry["fingerprint"]:
+            entries.append(entry)
+            continue
+        entries.append(_render_recorded(prs, builder, deck_data))
+        _move_last_slide_to(prs, index)
+        dirty.append(index)
+    if dirty:
+        prs.part.rename_slide_parts([sld_id.rId for sld_id in prs.slides._sldIdLst])
+    return prs, entries, dirty
+
+def render_incremental(output_path, data=None, stream=False, deterministic=False,
+                       template=None):
+    """Incrementally rebuild output_path; returns (prs, re-rendered indices, SHA-256)
+
+    The manifest records the base template's hash, the save mode and, for
+    deterministic saves, the file's SHA-256. With no dirty slide the deck is
+    saved again if it was written in the other mode or no longer matches
+    that hash, so the returned digest always describes a deterministic file.
+    The digest is None unless deterministic.
+    """
+    manifest = _load_build_manifest(output_path + BUILD_MANIFEST_SUFFIX)
+    prs, entries, dirty = build_incremental(output_path, data, template)
+    digest = None
+    if not dirty and manifest and manifest.get("deterministic") == deterministic:
+        if deterministic:
+            digest = file_sha256(output_path)
+        saved = digest == manifest.get("sha256")
+    else:
+        saved = False
+    if not saved:
+        digest = save_deck(prs, output_path, stream, deterministic)
+    with open(output_path + BUILD_MANIFEST_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump({"renderer": renderer_version(), "template": _template_hash(template),
+                   "deterministic": deterministic, "sha256": digest, "slides": entries}, f,
+                  indent=2, ensure_ascii=False)
+    return prs, dirty, digest
+
+def render_deck(spec):
+    """Render one deck spec and return its stats
+
+    A spec is {"output": path, "data": {...}}, optionally with "app_data":
+    {"trainer": id, "day": ..., "month": ...} bound from the revive-app
+    export in "app_data_file" (or app_data["file"]), a branded base .pptx
+    in "template" and extra "formats" (["pdf", "png"]) exported next to it.
+    "slides" renders a subset ("1,3-5" or 0-based indices) and with "lint"
+    the validation issues are returned under "lint".
+    With "deterministic" the save is reproducible and its SHA-256 is
+    returned and written to <output>.sha256; with "incremental" only the
+    slides whose inputs changed since the last run are re-rendered.
+    "stream" saves part by part and "locales" (["en", ...]) also writes one
+    translated variant per locale, returned under "locales".
+    """
+    start = time.perf_counter()
+    output_path = spec["output"]
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    data = _spec_deck_data(spec)
+    stream, deterministic = spec.get("stream", False), spec.get("deterministic", False)
+    if spec.get("incremental") and spec.get("slides"):
+        raise ValueError("'incremental' no se combina con 'slides'")
+    if spec.get("incremental"):
+        prs, _, digest = render_incremental(output_path, data, stream, deterministic,
+                                            spec.get("template"))
+    else:
+        prs = build_presentation(data, template_cache=TEMPLATE_CACHE,
+                                 slides=spec.get("slides"), template=spec.get("template"))
+        digest = save_deck(prs, output_path, stream, deterministic)
+    result = {
+        "output": output_path,
+        "slides": len(prs.slides),
+        "bytes": os.path.getsize(output_path),
+    }
+    if digest:
+        write_hash_file(output_path, digest)
+        result["sha256"] = digest
+    if spec.get("lint"):
+        issues = lint_deck(prs)
+        result["lint"] = [issue._asdict() for issue in issues]
+    formats = spec.get("formats", ())
+    if "pdf" in formats or "png" in formats:
+        result.update(export_deck(output_path, formats, prs=prs))
+    if spec.get("locales"):
+        result["locales"] = render_deck_locales(data, spec["locales"], output_path,
+                                                slides=spec.get("slides"),
+                                                template=spec.get("template"))
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def _render_deck_safe(spec):
+    """render_deck wrapper that reports failures instead of aborting the batch"""
+    try:
+        return render_deck(spec)
+    except Exception as exc:  # noqa: BLE001 - un deck roto no debe tumbar el lote
+        return {"output": spec.get("output"), "error": f"{type(exc).__name__}: {exc}"}
+
+def render_batch(specs, workers=None):
+    """Render many deck specs in parallel across processes, results in input order"""
+    specs = list(specs)
+    if workers == 1 or len(specs) <= 1:
+        return [_render_deck_safe(spec) for spec in specs]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(FAST_EMIT, NATIVE_EFFECTS)) as executor:
+        return list(executor.map(_render_deck_safe, specs))
+
+def load_deck_specs(path):
+    """Load a JSON list of deck specs: [{"output": "...", "data": {...}}, ...]"""
+    with open(path, encoding="utf-8") as f:
+        specs = json.load(f)
+    if not isinstance(specs, list):
+        raise ValueError(f"{path} debe contener una lista de deck specs")
+    for n, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            raise ValueError(f"Deck spec #{n} en {path} no es un objeto")
+        if not isinstance(spec.get("output"), str) or not spec["output"]:
+            raise ValueError(f"Deck spec #{n} en {path} no tiene 'output'")
+    return specs
+
+def print_batch_summary(results, elapsed, workers):
+    """Print per-deck timing and totals for a batch run"""
+    failed = [r for r in results if "error" in r]
+    for result in results:
+        if "error" in result:
+            print(f"  ✗ {result['output']}: {result['error']}")
+        else:
+            lint = result.get("lint")
+            errors = sum(issue["severity"] == "error" for issue in lint or ())
+            lint_note = f", validación: {errors} errores / {len(lint) - errors} avisos" \
+                if lint is not None else ""
+            print(f"  {'✗' if errors else '✓'} {result['output']}: {result['slides']} slides, "
+                  f"{result['bytes'] / 1024:.0f} KB, {result['seconds']:.2f}s{lint_note}")
+    rendered = len(results) - len(failed)
+    print(f"Decks generados: {rendered}/{len(results)} en {elapsed:.2f}s "
+          f"(workers: {workers or os.cpu_count()})")
+
+# ═══════════════════════════════════════════════════════════════
+# RENDERER CALIENTE: todo cargado en memoria, un fork por trabajo
+# ═══════════════════════════════════════════════════════════════
+
+def warm_up():
+    """Load and cache everything a render needs so a forked job only renders"""
+    global _warm_presentation
+    _chart_data_classes()
+    for name in sorted(os.listdir(SPEC_DIR)):
+        if name.endswith(".json"):
+            compile_slide_spec(load_slide_spec(os.path.join(SPEC_DIR, name)))
+    # Un deck completo llena la caché de plantillas, de medidas de texto y el tema
+    build_presentation(template_cache=TEMPLATE_CACHE)
+    _warm_presentation = new_presentation()
+
+def _run_warm_job(conn):
+    """Child side of the warm renderer: adopt the client's stdio and run main()"""
+    import socket
+    import traceback
+
+    global IMPORT_SECONDS
+    IMPORT_SECONDS = 0.0  # el hijo no importa nada: lo heredó del renderer
+    message, fds, _, _ = socket.recv_fds(conn, 1 << 16, 3)
+    request = json.loads(message)
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    code = 0
+    try:
+        os.chdir(request["cwd"])
+        main(request["argv"])
+    except SystemExit as exc:
+        if isinstance(exc.code, int) or exc.code is None:
+            code = exc.code or 0
+        else:
+            print(exc.code, file=sys.stderr)
+            code = 1
+    except Exception:  # noqa: BLE001 - el error se devuelve al cliente
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    conn.sendall(str(code).encode())
+    conn.close()
+    return code
+
+def serve_warm(socket_path):
+    """Keep a warm renderer listening on a Unix socket; each job runs in a fork"""
+    import gc
+    import signal
+    import socket
+
+    start = time.perf_counter()
+    warm_up()
+    # Fuera del GC: los hijos no tocan (ni copian) las páginas del estado caliente
+    gc.freeze()
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    # Los hijos terminan solos: sin zombies y sin esperar por ellos
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Renderer caliente listo en {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"(imports: {IMPORT_SECONDS * 1000:.0f} ms)", file=sys.stderr)
+    print(f"  export {WARM_SOCKET_ENV}={os.path.abspath(socket_path)}", file=sys.stderr)
+    sys.stderr.flush()
+    try:
+        while True:
+            conn, _ = server.accept()
+            if os.fork() == 0:
+                server.close()
+                # El trabajo puede lanzar su propio pool (--batch) y esperar a sus procesos
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                os._exit(_run_warm_job(conn))
+            conn.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.unlink(socket_path)
+
+def print_exports(result):
+    """Print the files written by export_deck()"""
+    if "pdf" in result:
+        print(f"PDF guardado en: {result['pdf']}")
+    if "png" in result:
+        print(f"Miniaturas: {len(result['png'])} PNG ({result['rasterised']} rasterizadas, "
+              f"el resto desde caché) en {os.path.dirname(result['png'][0])}")
+
+def load_deck_data(path):
+    """Deck data overrides from a JSON object (same keys as DEFAULT_DECK_DATA)"""
+    _record_input_file(path)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: se esperaba un objeto JSON")
+    return data
+
+def write_stats(path, stats):
+    """Write run statistics (timings in seconds, sizes, results) as JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2, ensure_ascii=False, default=str)
+        f.write("\n")
+
+def _in_dir(path, output_dir):
+    """path inside output_dir unless it is absolute (or there is no output_dir)"""
+    return path if not output_dir or os.path.isabs(path) else os.path.join(output_dir, path)
+
+def print_timings(timings):
+    """Print stage timings (imports, template, render, save) to stderr"""
+    print("Tiempos: " + " · ".join(f"{stage} {seconds * 1000:.0f} ms"
+                                   for stage, seconds in timings.items()), file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera la presentación REVIVE")
+    parser.add_argument("-o", "--output", metavar="PPTX",
+                        help=f"ruta del .pptx (por defecto {DEFAULT_OUTPUT} junto al script, "
+                             f"o en --output-dir); - para la salida estándar")
+    parser.add_argument("--output-dir", metavar="DIR",
+                        help="directorio de salida para rutas relativas (deck, --batch, --fill)")
+    parser.add_argument("--slides", metavar="SEL",
+                        help=f"genera solo estas slides, p. ej. 1,3-5 (de 1 a {len(SLIDE_BUILDERS)})")
+    parser.add_argument("--data", metavar="JSON",
+                        help="datos del deck (mismas claves que DEFAULT_DECK_DATA); en --batch "
+                             "son la base de cada spec")
+    parser.add_argument("--stats-json", metavar="PATH",
+                        help="guarda tiempos (s), tamaño y resultados de la ejecución en JSON")
+    parser.add_argument("--batch", metavar="SPECS_JSON",
+                        help="genera un deck por cada spec del fichero JSON")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos en paralelo para --batch e hilos de rasterizado "
+                             "(por defecto: nº de CPUs)")
+    parser.add_argument("--app-data", metavar="EXPORT_JSON",
+                        help="export JSON de revive-app con clientes, sesiones y transacciones")
+    parser.add_argument("--trainer", help="id del trainer del export (por defecto el primero)")
+    parser.add_argument("--month", help="mes de facturación YYYY-MM (por defecto el último)")
+    parser.add_argument("--per-trainer", metavar="DIR",
+                        help="genera un deck por cada trainer del export en DIR")
+    parser.add_argument("--template", metavar="PPTX",
+                        help="presentación base con masters, layouts y tema de marca")
+    parser.add_argument("--fast-emit", action="store_true",
+                        help="genera los shapes directamente con lxml (mismo resultado)")
+    parser.add_argument("--fill", metavar="RECORDS",
+                        help="rellena los {{tokens}} de un .pptx ya generado con cada registro "
+                             "de un JSON (lista de objetos) o CSV, un deck por registro")
+    parser.add_argument("--fill-deck", metavar="PPTX",
+                        help="deck con tokens para --fill (por defecto la salida habitual)")
+    parser.add_argument("--fill-output", metavar="PATTERN",
+                        default=os.path.join("decks", "deck_{n:04d}.pptx"),
+                        help="ruta de cada deck de --fill; admite {n} y los campos del registro")
+    parser.add_argument("--locales", metavar="LISTA",
+                        help="genera además una variante por idioma (p. ej. es,en) con los "
+                             "catálogos de locales/, desde las plantillas de slide")
+    parser.add_argument("--extract-messages", metavar="LOCALE",
+                        help="añade los textos actuales del deck a locales/LOCALE.json")
+    parser.add_argument("--lint", action="store_true",
+                        help="valida el deck generado (fuera de la slide, textos solapados, "
+                             "fuentes, text boxes vacíos, ids, relaciones); sale con 1 si hay errores")
+    parser.add_argument("--native-effects", action="store_true",
+                        help="sombra/glow/degradado nativos en las glass cards y texto dentro "
+                             "de los badges (menos shapes por slide)")
+    parser.add_argument("--merge", nargs="+", metavar="PPTX[:SLIDES]",
+                        help="ensambla un deck a partir de .pptx ya generados, sin re-renderizar "
+                             "(p. ej. apertura.pptx teaser.pptx:2-4)")
+    parser.add_argument("--stream", action="store_true",
+                        help="guarda el .pptx parte a parte: menos memoria pico, "
+                             "no más rápido que el guardado normal")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reutiliza la última salida y regenera solo las slides cambiadas")
+    parser.add_argument("--format", default="pptx",
+                        help="formatos de salida separados por comas: pptx,pdf,png "
+                             "(pdf/png necesitan LibreOffice; el .pptx se guarda siempre)")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="guardado reproducible (mismos datos → mismos bytes) y "
+                             "SHA-256 en <salida>.sha256")
+    parser.add_argument("--stdout", action="store_true",
+                        help="escribe el .pptx en la salida estándar (implica --stream)")
+    parser.add_argument("--profile", metavar="JSON",
+                        help="guarda shapes, tiempos y bytes por slide en JSON")
+    parser.add_argument("--trace", metavar="JSON",
+                        help="guarda una traza Chrome (chrome://tracing) del render")
+    parser.add_argument("--import-time", action="store_true",
+                        help="muestra en stderr el tiempo de imports, plantilla, render y guardado")
+    parser.add_argument("--warm", metavar="SOCKET",
+                        help=f"arranca un renderer caliente en un socket Unix; con "
+                             f"{WARM_SOCKET_ENV}=SOCKET las siguientes ejecuciones lo usan")
+    args = parser.parse_args(argv)
+    if args.warm:
+        serve_warm(args.warm)
+        return
+    if args.output == "-":
+        args.stdout = True
+    if args.slides:
+        try:
+            parse_slide_selection(args.slides, len(SLIDE_BUILDERS))
+        except ValueError as exc:
+            parser.error(f"--slides: {exc}")
+        if args.incremental or args.merge:
+            parser.error("--slides no se combina con --incremental ni --merge")
+    if args.incremental:
+        # El build incremental reabre la salida y no pasa por build_presentation
+        incompatible = [flag for flag, used in (("--merge", args.merge), ("--fill", args.fill),
+                                                ("--stdout", args.stdout),
+                                                ("--profile", args.profile),
+                                                ("--trace", args.trace)) if used]
+        if incompatible:
+            parser.error(f"--incremental no se combina con {', '.join(incompatible)}")
+    if args.batch or args.per_trainer:
+        # Cada deck lo renderiza render_deck en un worker: solo valen las opciones de un spec
+        incompatible = [flag for flag, used in (("-o", args.output), ("--stdout", args.stdout),
+                                                ("--merge", args.merge), ("--fill", args.fill),
+                                                ("--trainer", args.trainer),
+                                                ("--month", args.month and args.batch),
+                                                ("--profile", args.profile),
+                                                ("--trace", args.trace),
+                                                ("--import-time", args.import_time)) if used]
+        if incompatible:
+            mode = "--batch" if args.batch else "--per-trainer"
+            parser.error(f"{mode} no se combina con {', '.join(incompatible)}")
+    data_file = {}
+    if args.data:
+        try:
+            data_file = load_deck_data(args.data)
+        except (OSError, ValueError) as exc:
+            parser.error(f"--data: {exc}")
+    try:
+        formats = parse_formats(args.format)
+    except ValueError as exc:
+        parser.error(str(exc))
+    exports = [fmt for fmt in formats if fmt != "pptx"]
+    if exports and args.stdout:
+        parser.error("--stdout solo admite --format pptx")
+    use_fast_emitter(args.fast_emit)
+    use_native_effects(args.native_effects)
+    profiler = enable_profiling() if args.profile or args.trace else None
+
+    if args.extract_messages:
+        added = update_catalog(args.extract_messages)
+        print(f"{_catalog_path(args.extract_messages)}: {added} textos nuevos")
+        return
+    locales = [locale.strip() for locale in (args.locales or "").split(",") if locale.strip()]
+    if locales and args.stdout:
+        parser.error("--locales no admite --stdout")
+
+    if (args.trainer or args.month) and not args.app_data:
+        parser.error("--trainer y --month necesitan --app-data")
+    app_data = None
+    if args.app_data:
+        # Carga única antes de crear el pool: los workers la heredan
+        app_data = load_app_data(args.app_data)
+
+    if args.batch or args.per_trainer:
+        for locale in locales:
+            # Un catálogo que falta es un error de uso, no un fallo en cada deck
+            if locale != SOURCE_LOCALE and not os.path.exists(_catalog_path(locale)):
+                parser.error(f"--locales: no hay catálogo {_catalog_path(locale)}")
+        if args.per_trainer:
+            if app_data is None:
+                parser.error("--per-trainer necesita --app-data")
+            specs = app_data.trainer_deck_specs(args.per_trainer, args.month)
+        else:
+            try:
+                specs = load_deck_specs(args.batch)
+            except (OSError, ValueError) as exc:
+                # json.JSONDecodeError es un ValueError
+                parser.error(f"--batch: {exc}")
+        for spec in specs:
+            spec["output"] = _in_dir(spec["output"], args.output_dir)
+            if data_file:
+                spec["data"] = {**data_file, **(spec.get("data") or {})}
+            if args.slides:
+                spec.setdefault("slides", args.slides)
+            if spec.get("app_data") and args.app_data:
+                spec.setdefault("app_data_file", args.app_data)
+            if args.template:
+                spec.setdefault("template", args.template)
+            if exports:
+                spec.setdefault("formats", exports)
+            if args.deterministic:
+                spec.setdefault("deterministic", True)
+            if args.lint:
+                spec.setdefault("lint", True)
+            if args.incremental:
+                spec.setdefault("incremental", True)
+            if args.stream:
+                spec.setdefault("stream", True)
+            if locales:
+                spec.setdefault("locales", locales)
+        start = time.perf_counter()
+        results = render_batch(specs, workers=args.workers)
+        elapsed = time.perf_counter() - start
+        print_batch_summary(results, elapsed, args.workers)
+        if args.stats_json:
+            write_stats(args.stats_json, {"seconds": elapsed,
+                                          "workers": args.workers or os.cpu_count(),
+                                          "decks": results})
+        if any(issue["severity"] == "error" for r in results for issue in r.get("lint", ())):
+            sys.exit(1)
+        return
+
+    try:
+        deck_data = app_data.deck_data(args.trainer, month=args.month) if app_data else {}
+    except KeyError as exc:
+        parser.error(f"--trainer: {exc.args[0]}")
+    deck_data = {**deck_data, **data_file}
+
+    # Ruta de salida: -o relativo a --output-dir (o al directorio actual); por
+    # defecto, junto al script
+    if args.output and not args.stdout:
+        output_path = _in_dir(args.output, args.output_dir)
+    else:
+        output_path = os.path.join(args.output_dir or BASE_DIR, DEFAULT_OUTPUT)
+    if not args.stdout and os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    if args.fill:
+        start = time.perf_counter()
+        try:
+            template = FillTemplate(args.fill_deck or output_path)
+            records = load_fill_records(args.fill)
+            outputs = list(fill_decks(template, records,
+                                      _in_dir(args.fill_output, args.output_dir)))
+        except (OSError, ValueError, zipfile.BadZipFile) as exc:
+            parser.error(f"--fill: {exc}")
+        elapsed = time.perf_counter() - start
+        print(f"Tokens: {', '.join(template.tokens) or '(ninguno)'}")
+        print(f"Decks rellenados: {len(outputs)} en {elapsed:.2f} s")
+        if args.stats_json:
+            write_stats(args.stats_json, {"seconds": elapsed, "tokens": template.tokens,
+                                          "outputs": outputs})
+        return
+
+    if args.incremental:
+        timings = {"imports": IMPORT_SECONDS}
+        start = time.perf_counter()
+        prs, dirty, digest = render_incremental(output_path, deck_data, args.stream,
+                                                args.deterministic, args.template)
+        timings["incremental"] = time.perf_counter() - start
+        print(f"Presentación guardada en: {output_path}")
+        print(f"Slides regeneradas: {len(dirty)}/{len(prs.slides)}")
+        if digest:
+            write_hash_file(output_path, digest)
+            print(f"SHA-256: {digest}")
+        result = {"output": output_path, "slides": len(prs.slides), "rerendered": dirty,
+                  "timings": timings}
+        lint_errors = 0
+        if args.lint:
+            # Sobre el deck resultante: slides reutilizadas y regeneradas
+            issues = lint_deck(prs)
+            lint_errors = print_lint(issues)
+            result["lint"] = [issue._asdict() for issue in issues]
+        if exports:
+            try:
+                result["exports"] = export_deck(output_path, exports, workers=args.workers,
+                                                prs=prs)
+            except ExportError as exc:
+                parser.exit(1, f"Exportación fallida: {exc}\n")
+            print_exports(result["exports"])
+        if locales:
+            start = time.perf_counter()
+            try:
+                result["locales"] = render_deck_locales(deck_data, locales, output_path,
+                                                        template=args.template)
+            except FileNotFoundError as exc:
+                parser.error(f"--locales: no hay catálogo {exc.filename}")
+            for locale, path in result["locales"].items():
+                print(f"Variante {locale}: {path}")
+            timings["idiomas"] = time.perf_counter() - start
+        if args.import_time:
+            print_timings(timings)
+        if args.stats_json:
+            write_stats(args.stats_json, result)
+        if lint_errors:
+            sys.exit(1)
+        return
+
+    timings = {"imports": IMPORT_SECONDS}
+    template_cache = None
+    start = time.perf_counter()
+    if args.merge:
+        try:
+            prs = assemble_deck(args.merge, args.template)
+        except (OSError, ValueError) as exc:
+            parser.error(f"--merge: {exc}")
+        timings["mezcla"] = time.perf_counter() - start
+    else:
+        prs = new_presentation(args.template)
+        timings["plantilla"] = time.perf_counter() - start
+        # En el renderer caliente las plantillas de slide ya están construidas;
+        # con --locales se construyen aquí y las variantes las reutilizan
+        template_cache = (TEMPLATE_CACHE if (len(TEMPLATE_CACHE) or locales) and not profiler
+                          else None)
+        start = time.perf_counter()
+        build_presentation(deck_data, template_cache=template_cache, prs=prs,
+                           slides=args.slides, template=args.template)
+        timings["render"] = time.perf_counter() - start
+
+    stats = {"output": "-" if args.stdout else output_path, "timings": timings}
+    if template_cache is not None:
+        stats["template_cache"] = template_cache.stats()
+    lint_errors = 0
+    if args.lint:
+        start = time.perf_counter()
+        issues = lint_deck(prs)
+        lint_errors = print_lint(issues, file=sys.stderr if args.stdout else None)
+        timings["validación"] = time.perf_counter() - start
+        stats["lint"] = [issue._asdict() for issue in issues]
+
+    start = time.perf_counter()
+    if args.stdout:
+        digest = save_streaming(prs, "-", args.deterministic)
+        timings["guardado"] = time.perf_counter() - start
+        print(f"Total de slides: {len(prs.slides)}", file=sys.stderr)
+        if digest:
+            print(f"SHA-256: {digest}", file=sys.stderr)
+        if args.import_time:
+            print_timings(timings)
+        if args.stats_json:
+            write_stats(args.stats_json, {**stats, "slides": len(prs.slides), "sha256": digest})
+        if lint_errors:
+            sys.exit(1)
+        return
+
+    with _profile_stage("save"):
+        digest = save_deck(prs, output_path, args.stream, args.deterministic)
+    timings["guardado"] = time.perf_counter() - start
     print(f"Presentación guardada en: {output_path}")
     print(f"Total de slides: {len(prs.slides)}")
+    stats.update(slides=len(prs.slides), bytes=os.path.getsize(output_path), sha256=digest)
+    if digest:
+        write_hash_file(output_path, digest)
+        print(f"SHA-256: {digest}")
+    if exports:
+        start = time.perf_counter()
+        try:
+            stats["exports"] = export_deck(output_path, exports, workers=args.workers, prs=prs)
+        except ExportError as exc:
+            parser.exit(1, f"Exportación fallida: {exc}\n")
+        print_exports(stats["exports"])
+        timings["exportación"] = time.perf_counter() - start
+    if locales:
+        start = time.perf_counter()
+        try:
+            if args.merge:
+                variants = render_locales(prs, locales, output_path)
+            else:
+                variants = render_deck_locales(deck_data, locales, output_path,
+                                               slides=args.slides, template=args.template)
+        except FileNotFoundError as exc:
+            parser.error(f"--locales: no hay catálogo {exc.filename}")
+        for locale, path in variants.items():
+            print(f"Variante {locale}: {path}")
+        timings["idiomas"] = time.perf_counter() - start
+        stats["locales"] = variants
+    if args.import_time:
+        print_timings(timings)
+
+    if profiler:
+        profiler.record_package(prs, output_path)
+        if args.profile:
+            profiler.write_json(args.profile)
+            print(f"Perfil guardado en: {args.profile}")
+        if args.trace:
+            profiler.write_chrome_trace(args.trace)
+            print(f"Traza guardada en: {args.trace}")
+    if args.stats_json:
+        write_stats(args.stats_json, stats)
+    if lint_errors:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
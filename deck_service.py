@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Servicio local de generación de decks (create_pptx_christian.py)
+Cola de trabajos asyncio + pool de procesos acotado, expuesto por HTTP
+
+  POST /decks            encola un deck spec (JSON) → 202 {"id", "status"}
+  POST /decks?wait=1     encola y devuelve el .pptx cuando termina
+  GET  /decks/<id>       estado del trabajo
+  GET  /decks/<id>/file  descarga el .pptx generado
+  GET  /health           trabajos en cola / en curso y nº de workers
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import shutil
+import sys
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import create_pptx_christian as gen
+
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+MAX_BODY = 4 << 20
+DEFAULT_PORT = 8765
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 410: "Gone", 413: "Payload Too Large",
+           431: "Request Header Fields Too Large", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+# Claves de spec que acepta el servicio: nada que apunte a ficheros del servidor
+# (template, formats, incremental, app_data_file, app_data["file"])
+CLIENT_SPEC_KEYS = frozenset({"output", "data", "slides", "app_data", "stream",
+                              "deterministic", "lint"})
+MAX_JOBS = 1000
+JOB_TTL = 3600
+# Caracteres fuera de este conjunto se sustituyen en el nombre de salida: el
+# nombre acaba en la cabecera Content-Disposition
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+class HttpError(Exception):
+    """Request that must be answered with an HTTP error status"""
+
+    def __init__(self, status, message=None):
+        super().__init__(message or REASONS[status])
+        self.status = status
+
+def client_spec(spec, app_data_file=None):
+    """Validate a client deck spec; raises ValueError on keys the service does not accept"""
+    unknown = sorted(set(spec) - CLIENT_SPEC_KEYS)
+    if unknown:
+        raise ValueError(f"claves no permitidas en el spec: {', '.join(unknown)}")
+    if not isinstance(spec.get("data", {}), dict):
+        raise ValueError("'data' debe ser un objeto JSON")
+    spec = dict(spec)
+    if spec.get("app_data"):
+        if not isinstance(spec["app_data"], dict) or "file" in spec["app_data"]:
+            raise ValueError("'app_data' debe ser un objeto sin 'file'")
+        if not app_data_file:
+            raise ValueError("el servicio no tiene export de revive-app (--app-data)")
+        # El único origen de datos es el export del propio servicio
+        spec["app_data_file"] = app_data_file
+    return spec
+
+class DeckJob:
+    """One queued deck spec and its result"""
+
+    def __init__(self, job_id, spec):
+        self.id = job_id
+        self.spec = spec
+        self.status = "queued"
+        self.result = None
+        self.submitted = time.time()
+        self.started = None
+        self.done = asyncio.Event()
+        self.pins = 0  # descargas en curso o esperando: evict() no borra sus ficheros
+
+    def to_dict(self):
+        waited = (self.started or time.time()) - self.submitted
+        info = {"id": self.id, "status": self.status, "queued_seconds": round(waited, 3)}
+        if self.result:
+            info.update(self.result)
+            info.pop("output", None)
+        return info
+
+class DeckService:
+    """Job queue with `workers` consumers feeding a process pool off the event loop"""
+
+    def __init__(self, output_dir, workers=None, queue_size=100, app_data_file=None,
+                 max_jobs=MAX_JOBS, job_ttl=JOB_TTL):
+        self.output_dir = os.path.abspath(output_dir)
+        self.app_data_file = app_data_file
+        self.workers = workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self.job_ttl = job_ttl
+        self.jobs = {}
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._running = 0
+        self._executor = None
+        self._consumers = []
+
+    def start(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=gen._init_worker,
+                                             initargs=(gen.FAST_EMIT, gen.NATIVE_EFFECTS))
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._executor.shutdown(cancel_futures=True)
+
+    def submit(self, spec):
+        """Queue a deck spec
+
+        Raises ValueError for specs with keys the service does not accept and
+        asyncio.QueueFull when the queue is full.
+        """
+        job = DeckJob(uuid.uuid4().hex[:12], client_spec(spec, self.app_data_file))
+        # La salida siempre queda dentro de output_dir, nunca en una ruta del cliente
+        name = _UNSAFE_NAME_CHARS.sub("_", os.path.basename(str(spec.get("output") or "")))
+        if name and not name.endswith(".pptx"):
+            name += ".pptx"
+        filename = f"{job.id}_{name}" if name else f"{job.id}.pptx"
+        job.spec["output"] = os.path.join(self.output_dir, filename)
+        self.evict()
+        self._queue.put_nowait(job)
+        self.jobs[job.id] = job
+        return job
+
+    def evict(self, now=None):
+        """Forget finished jobs older than job_ttl or beyond max_jobs, deleting their files"""
+        now = time.time() if now is None else now
+        finished = [job for job in self.jobs.values() if job.done.is_set() and not job.pins]
+        excess = len(self.jobs) - self.max_jobs + 1
+        for job in finished:
+            # jobs conserva el orden de llegada: los primeros son los más antiguos
+            if excess <= 0 and now - job.submitted < self.job_ttl:
+                continue
+            excess -= 1
+            del self.jobs[job.id]
+            self._remove_files(job)
+
+    def _remove_files(self, job):
+        # Deck, <deck>.sha256 y exportaciones llevan el id del trabajo como prefijo
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(job.id):
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                    else:
+                        os.remove(entry.path)
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started = time.time()
+            self._running += 1
+            try:
+                job.result = await loop.run_in_executor(self._executor, gen._render_deck_safe,
+                                                        job.spec)
+                job.status = "error" if "error" in job.result else "done"
+            except Exception as exc:  # noqa: BLE001 - p. ej. un worker caído
+                job.result = {"error": f"{type(exc).__name__}: {exc}"}
+                job.status = "error"
+            finally:
+                self._running -= 1
+                job.done.set()
+                self._queue.task_done()
+
+    def health(self):
+        return {"queued": self._queue.qsize(), "running": self._running,
+                "workers": self.workers, "jobs": len(self.jobs)}
+
+# ═══════════════════════════════════════════════════════════════
+# HTTP mínimo sobre asyncio streams (HTTP/1.1, una petición por conexión)
+# ═══════════════════════════════════════════════════════════════
+
+async def _read_line(reader):
+    try:
+        return (await reader.readline()).decode("latin-1").strip()
+    except (asyncio.LimitOverrunError, ValueError):
+        # readline() convierte LimitOverrunError en ValueError: línea de más de 64 KiB
+        raise HttpError(431) from None
+
+async def _read_request(reader):
+    request_line = await _read_line(reader)
+    if not request_line:
+        return None
+    parts = request_line.split(" ")
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise HttpError(400, "línea de petición mal formada")
+    method, target, _ = parts
+    headers = {}
+    while True:
+        line = await _read_line(reader)
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Content-Length no válido") from None
+    if length < 0:
+        raise HttpError(400, "Content-Length no válido")
+    if length > MAX_BODY:
+        raise HttpError(413)
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), urlsplit(target), body
+
+def _head(status, content_type, length):
+    return (f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {length}\r\nConnection: close\r\n\r\n").encode()
+
+async def _send_json(writer, status, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    writer.write(_head(status, "application/json; charset=utf-8", len(body)) + body)
+    await writer.drain()
+
+async def _send_file(writer, path, filename):
+    writer.write(_head(200, PPTX_MIME, os.path.getsize(path))[:-2]
+                 + f'Content-Disposition: attachment; filename="{filename}"\r\n\r\n'.encode())
+    with open(path, "rb") as f:
+        while chunk := f.read(gen._STREAM_CHUNK):
+            writer.write(chunk)
+            await writer.drain()
+
+async def _send_job_file(writer, job):
+    if job.status != "done":
+        await _send_json(writer, 409 if job.status != "error" else 500, job.to_dict())
+        return
+    output = job.result["output"]
+    job.pins += 1
+    try:
+        await _send_file(writer, output, os.path.basename(output).split("_", 1)[-1])
+    except FileNotFoundError:
+        raise HttpError(410, "el deck de este trabajo ya se ha borrado") from None
+    finally:
+        job.pins -= 1
+
+async def _route(service, writer, method, url, body):
+    parts = [part for part in url.path.split("/") if part]
+    if parts == ["health"] and method == "GET":
+        return await _send_json(writer, 200, service.health())
+    if parts == ["decks"] and method == "POST":
+        try:
+            spec = json.loads(body or b"{}")
+            if not isinstance(spec, dict):
+                raise ValueError("el spec debe ser un objeto JSON")
+        except ValueError as exc:
+            return await _send_json(writer, 400, {"error": str(exc)})
+        try:
+            job = service.submit(spec)
+        except ValueError as exc:
+            return await _send_json(writer, 400, {"error": str(exc)})
+        except asyncio.QueueFull:
+            return await _send_json(writer, 503, {"error": "cola llena"})
+        if parse_qs(url.query).get("wait", ["0"])[0] not in ("", "0"):
+            # Fijado desde que se encola: evict() no puede borrarlo antes de enviarlo
+            job.pins += 1
+            try:
+                await job.done.wait()
+                return await _send_job_file(writer, job)
+            finally:
+                job.pins -= 1
+        return await _send_json(writer, 202, job.to_dict())
+    if len(parts) in (2, 3) and parts[0] == "decks":
+        job = service.jobs.get(parts[1])
+        if job is None:
+            return await _send_json(writer, 404, {"error": "trabajo desconocido"})
+        if method != "GET":
+            return await _send_json(writer, 405, {"error": "método no permitido"})
+        if len(parts) == 2:
+            return await _send_json(writer, 200, job.to_dict())
+        if parts[2] == "file":
+            return await _send_job_file(writer, job)
+    return await _send_json(writer, 404, {"error": "ruta desconocida"})
+
+async def _handle(service, reader, writer):
+    try:
+        try:
+            request = await _read_request(reader)
+            if request:
+                await _route(service, writer, *request)
+        except HttpError as exc:
+            await _send_json(writer, exc.status, {"error": str(exc)})
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(host, port, output_dir, workers, queue_size, app_data_file=None,
+                max_jobs=MAX_JOBS, job_ttl=JOB_TTL):
+    service = DeckService(output_dir, workers, queue_size, app_data_file, max_jobs, job_ttl)
+    service.start()
+    server = await asyncio.start_server(lambda r, w: _handle(service, r, w), host, port)
+    print(f"Servicio de decks en http://{host}:{port} "
+          f"(workers: {service.workers}, salida: {service.output_dir})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+# ═══════════════════════════════════════════════════════════════
+# CLIENTE: encolar un spec desde la línea de comandos
+# ═══════════════════════════════════════════════════════════════
+
+def submit(url, spec_path, output=None):
+    """POST a spec file; with output, wait for the deck and save it there"""
+    with open(spec_path, "rb") as f:
+        body = f.read()
+    target = f"{url.rstrip('/')}/decks" + ("?wait=1" if output else "")
+    request = urllib.request.Request(target, data=body, method="POST",
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        if not output:
+            print(response.read().decode())
+            return
+        with open(output, "wb") as f:
+            while chunk := response.read(gen._STREAM_CHUNK):
+                f.write(chunk)
+    print(f"Presentación guardada en: {output}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de decks REVIVE")
+    sub = parser.add_subparsers(dest="command")
+    serve_parser = sub.add_parser("serve", help="arranca el servicio HTTP (por defecto)")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--output-dir", default=os.path.join(gen.BASE_DIR, "decks"),
+                              help="directorio donde se escriben los decks")
+    serve_parser.add_argument("--workers", type=int, default=None,
+                              help="decks renderizados a la vez (por defecto: nº de CPUs)")
+    serve_parser.add_argument("--queue-size", type=int, default=100,
+                              help="trabajos en cola antes de responder 503")
+    serve_parser.add_argument("--max-jobs", type=int, default=MAX_JOBS,
+                              help="trabajos terminados que se conservan (con sus ficheros)")
+    serve_parser.add_argument("--job-ttl", type=float, default=JOB_TTL,
+                              help="segundos que se conserva un trabajo terminado")
+    serve_parser.add_argument("--app-data", metavar="EXPORT_JSON",
+                              help="export de revive-app para specs con app_data (el único "
+                                   "origen de datos de la app)")
+    serve_parser.add_argument("--fast-emit", action="store_true",
+                              help="genera los shapes directamente con lxml")
+    serve_parser.add_argument("--native-effects", action="store_true",
+                              help="efectos DrawingML nativos en cards y badges")
+    submit_parser = sub.add_parser("submit", help="encola un deck spec JSON")
+    submit_parser.add_argument("spec", help="fichero JSON con el spec del deck")
+    submit_parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    submit_parser.add_argument("-o", "--output",
+                               help="espera al deck y lo guarda en esta ruta")
+    args = parser.parse_args(sys.argv[1:] or ["serve"])
+
+    if args.command == "submit":
+        submit(args.url, args.spec, args.output)
+        return
+
+    gen.use_fast_emitter(args.fast_emit)
+    gen.use_native_effects(args.native_effects)
+    app_data_file = os.path.abspath(args.app_data) if args.app_data else None
+    if app_data_file:
+        # Carga única antes de crear el pool: los workers heredan el índice
+        gen.load_app_data(app_data_file)
+    try:
+        asyncio.run(serve(args.host, args.port, args.output_dir, args.workers, args.queue_size,
+                          app_data_file, args.max_jobs, args.job_ttl))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import create_pptx_christian as gen  # noqa: E402
+
+
+@pytest.fixture
+def slide_texts():
+    """Texts of every a:t run of one slide, in document order"""
+    def texts(slide):
+        return [t.text for t in slide._element.iter(
+            "{http://schemas.openxmlformats.org/drawingml/2006/main}t")]
+    return texts
+
+
+@pytest.fixture(autouse=True)
+def _render_modes():
+    # Los tests que cambian de modo no deben contaminar a los siguientes
+    yield
+    gen.use_fast_emitter(False)
+    gen.use_native_effects(False)
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+import create_pptx_christian as gen
+
+EXPORT = {
+    "trainers": [{"id": "t1", "nombre": "Ana"}, {"id": "t2", "nombre": "Luis"}],
+    "clientes": [
+        {"id": "c1", "nombre": "Marta", "apellidos": "Gil", "trainer_id": "t1",
+         "adherenciaPromedio": 90, "tendencia": "subiendo"},
+        {"id": "c2", "nombre": "Pablo", "trainer_id": "t1", "adherenciaPromedio": 70,
+         "alertasActivas": 2},
+        {"id": "c3", "nombre": "Eva", "trainer_id": "t2", "adherenciaPromedio": 80},
+    ],
+    "sesiones": [
+        {"cliente_id": "c1", "cliente_nombre": "Marta", "cliente_apellidos": "Gil",
+         "fecha": "2025-03-10", "hora_inicio": "10:00", "hora_fin": "11:00",
+         "tipo": "presencial", "estado": "completada", "trainer_id": "t1"},
+        {"cliente_id": "c2", "cliente_nombre": "Pablo", "fecha": "2025-03-10",
+         "hora_inicio": "09:00", "hora_fin": "10:00", "tipo": "online",
+         "estado": "programada", "trainer_id": "t1"},
+        {"cliente_id": "c1", "cliente_nombre": "Marta", "fecha": "2025-03-11",
+         "hora_inicio": "09:00", "hora_fin": "10:00", "tipo": "presencial",
+         "estado": "cancelada", "trainer_id": "t1"},
+    ],
+    "transacciones": [
+        {"tipo": "ingreso", "fecha": "2025-02-03", "monto": 100, "estado": "pagado",
+         "trainer_id": "t1"},
+        {"tipo": "ingreso", "fecha": "2025-03-03", "monto": 90, "estado": "pagado",
+         "trainer_id": "t1"},
+        {"tipo": "ingreso", "fecha": "2025-03-20", "monto": 30, "estado": "pendiente",
+         "trainer_id": "t1"},
+        {"tipo": "gasto", "fecha": "2025-03-21", "monto": 500, "estado": "pagado",
+         "trainer_id": "t1"},
+    ],
+}
+
+
+@pytest.fixture
+def export_path(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(EXPORT), encoding="utf-8")
+    return str(path)
+
+
+def test_deck_data_is_derived_from_the_indexes():
+    data = gen.AppDataIndex(EXPORT).deck_data("t1")
+    assert data["trainer_name"] == "Ana"
+    # Sesiones del día más cargado, por hora; las canceladas no cuentan
+    assert [s["client"] for s in data["sessions"]] == ["Pablo", "Marta Gil"]
+    assert [s["type"] for s in data["sessions"]] == ["Online", "Presencial"]
+    assert data["sessions_today"] == 2
+    assert data["clients"][0] == {"name": "Marta Gil", "sessions": 1, "adherence": 90}
+    assert data["adherence"] == 80 and data["clients_follow_up"] == 1
+    assert data["revenue"] == 120 and data["revenue_month"] == "Marzo"
+    assert data["revenue_growth"] == 20
+    assert data["collected_pct"] == 75 and data["pending_invoices"] == 1
+
+
+def test_missing_collections_fall_back_to_the_defaults():
+    data = gen.AppDataIndex(EXPORT).deck_data("t2")
+    assert data["trainer_name"] == "Luis"
+    assert "sessions" not in data and "revenue" not in data
+    assert set(gen.AppDataIndex(EXPORT).deck_data("t1")) <= set(gen.DEFAULT_DECK_DATA)
+
+
+def test_explicit_month_and_january_growth():
+    export = dict(EXPORT, transacciones=[
+        {"tipo": "ingreso", "fecha": "2024-12-01", "monto": 200, "estado": "pagado"},
+        {"tipo": "ingreso", "fecha": "2025-01-01", "monto": 100, "estado": "pagado"},
+    ])
+    data = gen.AppDataIndex(export).deck_data("t1", month="2025-01")
+    assert data["revenue_month"] == "Enero" and data["revenue_growth"] == -50
+
+
+def test_load_app_data_is_cached_per_path(export_path):
+    assert gen.load_app_data(export_path) is gen.load_app_data(export_path)
+
+
+def test_spec_data_overrides_the_export(export_path):
+    data = gen._spec_deck_data({"app_data": {"trainer": "t1"}, "app_data_file": export_path,
+                                "data": {"trainer_name": "Otra"}})
+    assert data["trainer_name"] == "Otra" and data["revenue"] == 120
+
+
+def test_per_trainer_writes_one_deck_per_trainer(export_path, tmp_path):
+    out = tmp_path / "decks"
+    gen.main(["--app-data", export_path, "--per-trainer", str(out)])
+    assert sorted(p.name for p in out.iterdir()) == ["REVIVE_t1.pptx", "REVIVE_t2.pptx"]
+
+
+def test_per_trainer_needs_an_export(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["--per-trainer", str(tmp_path)])
+    assert exc.value.code == 2
+    assert "--per-trainer necesita --app-data" in capsys.readouterr().err
+
+
+def test_unknown_trainer_raises():
+    with pytest.raises(KeyError, match="t9"):
+        gen.AppDataIndex(EXPORT).deck_data("t9")
+
+
+def test_unknown_trainer_is_a_usage_error(export_path, tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["-o", str(tmp_path / "d.pptx"), "--app-data", export_path, "--trainer", "t9"])
+    assert exc.value.code == 2 and "t9" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("flag", ["--trainer", "--month"])
+def test_trainer_and_month_need_an_export(tmp_path, capsys, flag):
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["-o", str(tmp_path / "d.pptx"), flag, "t1"])
+    assert exc.value.code == 2 and "--app-data" in capsys.readouterr().err
@@ -0,0 +1,68 @@
+import pytest
+
+import create_pptx_christian as gen
+
+
+def test_short_text_keeps_the_maximum_size():
+    assert gen.fit_font_size("Hola", 4, 1, 24) == 24
+
+
+def test_long_text_shrinks_in_half_point_steps():
+    text = "Centraliza clientes, sesiones, pagos y nutrición en una sola app"
+    size = gen.fit_font_size(text, 3, 0.6, 24)
+    assert gen.AUTO_FIT_MIN_SIZE < size < 24 and (size * 2).is_integer()
+    # El siguiente paso ya no cabe
+    assert gen.fit_font_size(text, 3, 0.6, size + gen.AUTO_FIT_STEP) == size
+
+
+def test_words_are_never_split():
+    word = "Supercalifragilisticoespialidoso"
+    # Cabrían muchas líneas, pero la palabra entera tiene que caber a lo ancho
+    size = gen.fit_font_size(word, 2.5, 5, 40)
+    width = gen.glyph_widths().text_width(word) / 1000 / 72
+    assert width * size <= 2.5 < width * (size + gen.AUTO_FIT_STEP)
+
+
+def test_nothing_fits_returns_the_minimum():
+    assert gen.fit_font_size("x" * 200, 0.1, 0.1, 24) == gen.AUTO_FIT_MIN_SIZE
+
+
+def test_short_boxes_still_allow_one_line():
+    assert gen.fit_font_size("OK", 2, 0.01, 18) == 18
+
+
+def test_template_slots_cannot_be_fitted():
+    with pytest.raises(TypeError, match="slots de plantilla"):
+        gen.fit_font_size(gen._Slot(0), 2, 1, 18)
+
+
+def test_glyph_table_is_shared_and_filled_lazily():
+    widths = gen.glyph_widths(gen.THEME_FONT, True)
+    assert widths is gen.glyph_widths(gen.THEME_FONT, True)
+    widths.pop("Ж", None)
+    widths.text_width("Ж")
+    assert "Ж" in widths
+
+
+def test_auto_fit_text_box_gets_the_fitted_size():
+    prs = gen.new_presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    box = gen.add_text_box(slide, 0, 0, gen.Inches(1.5), gen.Inches(0.4),
+                           "Texto demasiado largo para la caja", font_size=20, auto_fit=True)
+    size = int(box.text_frame.paragraphs[0]._p.find("a:pPr/a:defRPr", gen._XML_NS).get("sz"))
+    assert size < 2000
+
+
+def test_template_cache_fits_the_real_text():
+    sessions = [dict(session, client="Maximiliano Fernández de la Vega")
+                for session in gen.DEFAULT_DECK_DATA["sessions"]]
+    data = dict(gen.DEFAULT_DECK_DATA, sessions=sessions)
+    direct = gen.build_presentation(data, slides="4")
+    cached = gen.build_presentation(data, gen.SlideTemplateCache(), slides="4")
+    sizes = [[p.get("sz") for p in s._element.iter(f"{{{gen._XML_NS['a']}}}defRPr")]
+             for s in (direct.slides[0], cached.slides[0])]
+    assert sizes[0] == sizes[1]
+    # Teaser Visual: el nombre del cliente (12 pt) se reduce para caber en 2"
+    names = [box for box in direct.slides[0].shapes
+             if box.has_text_frame and box.text_frame.text == sessions[0]["client"]]
+    assert int(names[0].text_frame.paragraphs[0]._p.pPr[0].get("sz")) < 1200
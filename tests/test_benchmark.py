@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+import benchmark_pptx as bench
+import create_pptx_christian as gen
+
+
+def test_best_of_runs_setup_outside_each_repeat():
+    seen = []
+    bench._best_of(seen.append, 3, setup=object)
+    assert len(seen) == 3 and len({id(arg) for arg in seen}) == 3
+
+
+def test_bench_slides_uses_a_fresh_presentation_per_repeat(monkeypatch):
+    decks = []
+    new_presentation = gen.new_presentation
+
+    def tracked():
+        decks.append(new_presentation())
+        return decks[-1]
+
+    monkeypatch.setattr(gen, "new_presentation", tracked)
+    monkeypatch.setattr(gen, "SLIDE_BUILDERS", gen.SLIDE_BUILDERS[:1])
+    bench.bench_slides(repeat=3)
+    assert [len(prs.slides) for prs in decks] == [1, 1, 1]
+
+
+def test_bench_decks_takes_the_best_of_repeat(monkeypatch):
+    calls = []
+    monkeypatch.setattr(bench, "_build_deck", lambda n: calls.append(n) or 1024)
+    results = bench.bench_decks([2], repeat=4)
+    assert calls == [2] * 5  # 4 cronometradas + 1 con tracemalloc
+    assert results["2"]["bytes"] == 1024
+
+
+def _fake_results(monkeypatch, seconds):
+    monkeypatch.setattr(bench, "bench_helpers", lambda calls, repeat: {})
+    monkeypatch.setattr(bench, "bench_slides", lambda repeat: {"s1": {"seconds": seconds}})
+    monkeypatch.setattr(bench, "bench_save", lambda repeat: {})
+    monkeypatch.setattr(bench, "bench_decks", lambda sizes, repeat: {})
+
+
+def test_baseline_from_the_other_emitter_is_refused():
+    with pytest.raises(ValueError, match="fast_emit"):
+        bench.compare_to_baseline({"fast_emit": True}, {"fast_emit": False}, 0.15)
+
+
+def test_main_refuses_a_mismatched_baseline_before_measuring(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"fast_emit": False, "slides": {}}))
+    monkeypatch.setattr(bench, "bench_helpers", lambda *a: pytest.fail("no debe medir"))
+    with pytest.raises(SystemExit) as exc:
+        bench.main(["--fast-emit", "--baseline", str(baseline)])
+    assert exc.value.code == 2
+
+
+def test_baseline_is_read_before_it_is_overwritten(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"fast_emit": False, "slides": {"s1": {"seconds": 1.0}}}))
+    _fake_results(monkeypatch, seconds=2.0)
+    with pytest.raises(SystemExit) as exc:
+        bench.main(["--baseline", str(baseline), "--save-baseline", str(baseline)])
+    assert exc.value.code == 1
+    assert json.loads(baseline.read_text())["slides"]["s1"]["seconds"] == 2.0
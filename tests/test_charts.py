@@ -0,0 +1,64 @@
+import zipfile
+
+import pytest
+
+import create_pptx_christian as gen
+
+
+@pytest.fixture
+def slide():
+    prs = gen.new_presentation()
+    return prs.slides.add_slide(prs.slide_layouts[6])
+
+
+@pytest.mark.parametrize("values, expected", [
+    ([3, 7, 12], (0, 12.5, 2.5)),
+    ([-4, 9], (-5, 10, 5)),
+    ([0.2, 0.9], (0, 1, 0.2)),
+    ([5, 5], (0, 5, 1)),
+    ([], (0, 1, 0.2)),
+])
+def test_chart_scale_uses_round_steps(values, expected):
+    assert gen.chart_scale(values) == pytest.approx(expected)
+
+
+def test_nan_values_become_gaps():
+    assert gen._chart_values([1, float("nan"), None]) == [1.0, None, None]
+    assert gen.chart_scale([1, float("nan"), 9]) == pytest.approx((0, 10, 2))
+
+
+def test_bar_chart_is_one_graphic_frame(slide):
+    chart = gen.add_bar_chart(slide, 0, 0, gen.Inches(4), gen.Inches(2), range(300))
+    assert len(slide.shapes) == 1
+    assert list(chart.plots[0].series[0].values)[-1] == 299
+    assert chart.value_axis.maximum_scale == 300
+
+
+def test_static_charts_have_no_embedded_workbook(slide, tmp_path):
+    gen.add_line_chart(slide, 0, 0, gen.Inches(4), gen.Inches(2), {"a": [1, 2], "b": [2, 1]})
+    gen.add_bar_chart(slide, 0, 0, gen.Inches(4), gen.Inches(2), [1, 2], editable=True)
+    path = tmp_path / "charts.pptx"
+    slide.part.package.save(str(path))
+    with zipfile.ZipFile(path) as zf:
+        embeddings = [name for name in zf.namelist() if name.startswith("ppt/embeddings/")]
+    assert len(embeddings) == 1
+
+
+def test_line_chart_with_several_series_shows_a_legend(slide):
+    chart = gen.add_line_chart(slide, 0, 0, gen.Inches(4), gen.Inches(2),
+                               {"a": [1, 2, 3], "b": [3, 2, 1]}, axes=False)
+    assert chart.has_legend and len(chart.plots[0].series) == 2
+    assert not chart.value_axis.visible
+
+
+def test_gauge_clamps_progress(slide):
+    chart = gen.add_gauge(slide, 0, 0, gen.Inches(1), 1.7, gen.EMERALD, label="100%")
+    assert list(chart.plots[0].series[0].values) == [1.0, 0.0]
+    assert slide.shapes[-1].text_frame.text == "100%"
+
+
+def test_numpy_arrays_are_accepted(slide):
+    np = pytest.importorskip("numpy")
+    chart = gen.add_bar_chart(slide, 0, 0, gen.Inches(4), gen.Inches(2),
+                              np.array([1.0, np.nan, 3.0]))
+    assert list(chart.plots[0].series[0].values) == [1.0, None, 3.0]
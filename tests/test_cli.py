@@ -0,0 +1,152 @@
+import json
+
+import pytest
+
+import create_pptx_christian as gen
+
+
+def _write(tmp_path, content):
+    path = tmp_path / "decks.json"
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_load_deck_specs_accepts_list_of_specs(tmp_path):
+    path = _write(tmp_path, json.dumps([{"output": "a.pptx", "data": {"month": "Marzo"}}]))
+    assert gen.load_deck_specs(path) == [{"output": "a.pptx", "data": {"month": "Marzo"}}]
+
+
+@pytest.mark.parametrize("content, message", [
+    ('{"output": "a.pptx"}', "lista"),
+    ('["a.pptx"]', "no es un objeto"),
+    ('[{"data": {}}]', "no tiene 'output'"),
+    ('[{"output": 3}]', "no tiene 'output'"),
+])
+def test_load_deck_specs_rejects_bad_shapes(tmp_path, content, message):
+    with pytest.raises(ValueError, match=message):
+        gen.load_deck_specs(_write(tmp_path, content))
+
+
+@pytest.mark.parametrize("content", ["[{", None])
+def test_batch_reports_bad_spec_files_as_usage_errors(tmp_path, capsys, content):
+    path = _write(tmp_path, content) if content else str(tmp_path / "missing.json")
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["--batch", path])
+    assert exc.value.code == 2
+    assert "--batch:" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("flags", [["--merge", "a.pptx"], ["--fill", "r.json"], ["--stdout"],
+                                   ["--profile", "p.json"], ["--trace", "t.json"],
+                                   ["--slides", "1"]])
+def test_incremental_rejects_flags_it_cannot_honour(tmp_path, capsys, flags):
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["-o", str(tmp_path / "deck.pptx"), "--incremental", *flags])
+    assert exc.value.code == 2
+    assert "--incremental" in capsys.readouterr().err
+
+
+def test_incremental_honours_template_and_locales(tmp_path):
+    base, deck = tmp_path / "base.pptx", tmp_path / "deck.pptx"
+    gen.new_presentation().save(str(base))
+    gen.main(["-o", str(deck), "--incremental", "--template", str(base), "--locales", "en",
+              "--stats-json", str(tmp_path / "stats.json")])
+    with open(tmp_path / "stats.json", encoding="utf-8") as f:
+        result = json.load(f)
+    assert result["locales"] == {"en": str(tmp_path / "deck.en.pptx")}
+    with open(str(deck) + gen.BUILD_MANIFEST_SUFFIX, encoding="utf-8") as f:
+        assert json.load(f)["template"] == gen.file_sha256(str(base))
+
+
+def test_batch_passes_incremental_to_every_spec(tmp_path, monkeypatch):
+    seen = []
+    monkeypatch.setattr(gen, "render_batch", lambda specs, workers=None: seen.extend(specs) or [])
+    path = _write(tmp_path, json.dumps([{"output": str(tmp_path / "a.pptx")}]))
+    gen.main(["--batch", path, "--incremental"])
+    assert seen[0]["incremental"] is True
+
+
+def test_incremental_spec_with_slides_is_an_error(tmp_path):
+    result = gen._render_deck_safe({"output": str(tmp_path / "a.pptx"), "incremental": True,
+                                    "slides": "1"})
+    assert "slides" in result["error"]
+
+
+def test_batch_renders_each_spec_in_worker_processes(tmp_path, slide_texts):
+    specs = [{"output": str(tmp_path / f"{name}.pptx"), "data": {"trainer_name": name},
+              "slides": "6"} for name in ("Ana", "Luis")]
+    specs.insert(1, {"output": str(tmp_path / "broken.pptx"), "slides": "9"})
+    results = gen.render_batch(specs, workers=2)
+    assert [r["output"] for r in results] == [spec["output"] for spec in specs]
+    assert "fuera de rango" in results[1]["error"]
+    assert not (tmp_path / "broken.pptx").exists()
+    for name in ("Ana", "Luis"):
+        prs = gen.Presentation(str(tmp_path / f"{name}.pptx"))
+        assert f"Ideas de {name}:" in slide_texts(prs.slides[0])
+
+
+def test_batch_outputs_go_to_the_output_dir(tmp_path):
+    path = _write(tmp_path, json.dumps([{"output": "a.pptx", "slides": "1"}]))
+    gen.main(["--batch", path, "--output-dir", str(tmp_path / "out")])
+    assert (tmp_path / "out" / "a.pptx").exists()
+
+
+@pytest.mark.parametrize("selection, expected", [
+    ("", [0, 1, 2, 3, 4, 5, 6]), ("1,3-5", [0, 2, 3, 4]), ("7", [6]),
+])
+def test_parse_slide_selection(selection, expected):
+    assert gen.parse_slide_selection(selection, 7) == expected
+
+
+@pytest.mark.parametrize("selection", ["0", "8", "5-3", "1-9", "a", "1-b"])
+def test_bad_slide_selections_raise(selection):
+    with pytest.raises(ValueError):
+        gen.parse_slide_selection(selection, 7)
+
+
+def test_bad_slide_selection_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["-o", str(tmp_path / "deck.pptx"), "--slides", "2-99"])
+    assert exc.value.code == 2 and "--slides" in capsys.readouterr().err
+    assert not (tmp_path / "deck.pptx").exists()
+
+
+def test_slides_selects_the_builders(tmp_path):
+    deck = tmp_path / "deck.pptx"
+    gen.main(["-o", "deck.pptx", "--output-dir", str(tmp_path), "--slides", "1,6-7"])
+    assert len(gen.Presentation(str(deck)).slides) == 3
+
+
+@pytest.mark.parametrize("flags", [["-o", "x.pptx"], ["-o", "-"], ["--stdout"],
+                                   ["--merge", "a.pptx"], ["--fill", "r.json"],
+                                   ["--trainer", "t1"], ["--month", "2025-03"],
+                                   ["--profile", "p.json"], ["--trace", "t.json"],
+                                   ["--import-time"]])
+def test_batch_rejects_flags_it_cannot_honour(tmp_path, capsys, flags):
+    path = _write(tmp_path, json.dumps([{"output": "a.pptx"}]))
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["--batch", path, *flags])
+    assert exc.value.code == 2
+    assert "--batch no se combina con" in capsys.readouterr().err
+
+
+def test_batch_forwards_stream_and_locales(tmp_path, monkeypatch):
+    seen = []
+    monkeypatch.setattr(gen, "render_batch", lambda specs, workers=None: seen.extend(specs) or [])
+    path = _write(tmp_path, json.dumps([{"output": str(tmp_path / "a.pptx")}]))
+    gen.main(["--batch", path, "--stream", "--locales", "en"])
+    assert seen[0]["stream"] is True and seen[0]["locales"] == ["en"]
+
+
+def test_batch_with_an_unknown_locale_is_a_usage_error(tmp_path, capsys):
+    path = _write(tmp_path, json.dumps([{"output": str(tmp_path / "a.pptx")}]))
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["--batch", path, "--locales", "xx"])
+    assert exc.value.code == 2 and "xx.json" in capsys.readouterr().err
+
+
+def test_spec_locales_write_one_variant_per_locale(tmp_path):
+    result = gen.render_deck({"output": str(tmp_path / "a.pptx"), "slides": "1",
+                              "stream": True, "locales": ["en"]})
+    assert result["locales"] == {"en": str(tmp_path / "a.en.pptx")}
+    assert len(gen.Presentation(result["locales"]["en"]).slides) == 1
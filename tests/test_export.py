@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+import create_pptx_christian as gen
+
+
+@pytest.fixture(autouse=True)
+def export_cache(tmp_path, monkeypatch):
+    cache = tmp_path / "export_cache"
+    monkeypatch.setattr(gen, "EXPORT_CACHE_DIR", str(cache))
+    return cache
+
+
+@pytest.fixture
+def deck(tmp_path):
+    path = tmp_path / "deck.pptx"
+    prs = gen.build_presentation(slides="1-2")
+    prs.save(str(path))
+    return str(path), prs
+
+
+def test_parse_formats():
+    assert gen.parse_formats(" PDF, png,,pptx ") == ["pdf", "png", "pptx"]
+    with pytest.raises(ValueError, match="formatos desconocidos \\['docx'\\]"):
+        gen.parse_formats("pdf,docx")
+
+
+def test_unknown_format_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["-o", str(tmp_path / "d.pptx"), "--format", "svg"])
+    assert exc.value.code == 2 and "formatos desconocidos" in capsys.readouterr().err
+
+
+def test_slide_hashes_change_only_for_the_edited_slide():
+    first = gen.slide_hashes(gen.build_presentation(slides="1-4"))
+    assert first == gen.slide_hashes(gen.build_presentation(slides="1-4"))
+    second = gen.slide_hashes(gen.build_presentation({"revenue_growth": -4}, slides="1-4"))
+    assert [a == b for a, b in zip(first, second)] == [True, True, True, False]
+
+
+def test_missing_libreoffice_raises_export_error(deck, monkeypatch):
+    monkeypatch.setattr(gen, "_soffice", lambda: None)
+    with pytest.raises(gen.ExportError, match="soffice"):
+        gen.export_deck(deck[0], ["pdf"])
+
+
+def test_missing_libreoffice_exits_with_a_message(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(gen, "_soffice", lambda: None)
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["-o", str(tmp_path / "d.pptx"), "--format", "pptx,pdf"])
+    assert exc.value.code == 1 and "Exportación fallida" in capsys.readouterr().err
+    assert os.path.exists(tmp_path / "d.pptx")
+
+
+def test_cached_renders_are_reused(deck, export_cache, tmp_path, monkeypatch):
+    path, prs = deck
+    converted, rasterised = [], []
+    monkeypatch.setattr(gen, "convert_to_pdf",
+                        lambda src, dst: converted.append(dst) or open(dst, "wb").write(b"%PDF"))
+    monkeypatch.setattr(gen, "rasterise_page", lambda pdf, page, png, dpi:
+                        rasterised.append(page) or open(png, "wb").write(b"PNG"))
+
+    result = gen.export_deck(path, ["pdf", "png"], output_dir=str(tmp_path / "out"), prs=prs)
+    assert result["rasterised"] == 2 and len(converted) == 1
+    assert [os.path.basename(p) for p in result["png"]] == ["deck_01.png", "deck_02.png"]
+    assert os.path.basename(result["pdf"]) == "deck.pdf"
+
+    again = gen.export_deck(path, ["pdf", "png"], output_dir=str(tmp_path / "out"), prs=prs)
+    assert again["rasterised"] == 0 and len(converted) == 1 and rasterised == [1, 2]
+
+
+def test_reordered_slides_reuse_their_thumbnails(tmp_path, monkeypatch):
+    rasterised = []
+    monkeypatch.setattr(gen, "convert_to_pdf", lambda src, dst: open(dst, "wb").write(b"%PDF"))
+    monkeypatch.setattr(gen, "rasterise_page", lambda pdf, page, png, dpi:
+                        rasterised.append(page) or open(png, "wb").write(b"PNG"))
+    for name, slides in (("a", "1,2,4"), ("b", "4,1,2"), ("c", "2")):
+        path = tmp_path / f"{name}.pptx"
+        prs = gen.build_presentation(slides=slides)
+        prs.save(str(path))
+        gen.export_deck(str(path), ["png"], prs=prs)
+    assert rasterised == [1, 2, 3]
@@ -0,0 +1,55 @@
+import pytest
+
+import create_pptx_christian as gen
+
+
+@pytest.fixture(scope="module")
+def template(tmp_path_factory):
+    path = tmp_path_factory.mktemp("fill") / "tokens.pptx"
+    gen.build_presentation({"trainer_name": "{{name}}"}).save(str(path))
+    return gen.FillTemplate(str(path))
+
+
+def test_fill_writes_one_deck_per_record(template, tmp_path):
+    records = [{"name": "Ana"}, {"name": "Luis"}]
+    outputs = list(gen.fill_decks(template, records, str(tmp_path / "{n}_{name}.pptx")))
+    assert outputs == [str(tmp_path / "1_Ana.pptx"), str(tmp_path / "2_Luis.pptx")]
+    texts = [t for slide in gen.Presentation(outputs[1]).slides
+             for shape in slide.shapes if shape.has_text_frame for t in [shape.text_frame.text]]
+    assert any("Luis" in text for text in texts)
+    assert not any("{{" in text for text in texts)
+
+
+def test_record_field_named_n_does_not_clash(template, tmp_path):
+    outputs = list(gen.fill_decks(template, [{"name": "Ana", "n": "x"}],
+                                  str(tmp_path / "deck_{n}.pptx")))
+    assert outputs == [str(tmp_path / "deck_1.pptx")]
+
+
+@pytest.mark.parametrize("pattern", ["{client}.pptx", "{0}.pptx", "{name[9]}.pptx"])
+def test_bad_output_pattern_is_a_value_error(template, tmp_path, pattern):
+    with pytest.raises(ValueError, match="patrón de salida"):
+        list(gen.fill_decks(template, [{"name": "Ana"}], str(tmp_path / pattern)))
+
+
+def test_missing_token_value_is_a_value_error(template, tmp_path):
+    with pytest.raises(ValueError, match="sin valor para 'name'"):
+        list(gen.fill_decks(template, [{}], str(tmp_path / "{n}.pptx")))
+
+
+def test_cli_reports_bad_patterns_as_usage_errors(template, tmp_path, capsys):
+    records = tmp_path / "records.json"
+    records.write_text('[{"name": "Ana"}]', encoding="utf-8")
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["--fill", str(records), "--fill-deck", template.path,
+                  "--fill-output", str(tmp_path / "{missing}.pptx")])
+    assert exc.value.code == 2
+    assert "patrón de salida" in capsys.readouterr().err
+
+
+def test_run_patchers_must_say_which_runs_they_patch():
+    class NoSelection(gen._RunPatcher):
+        pass
+
+    with pytest.raises(TypeError, match="_selects"):
+        NoSelection(b"")
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from PIL import Image
+
+import create_pptx_christian as gen
+
+
+@pytest.fixture(autouse=True)
+def image_cache(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(gen, "IMAGE_CACHE_DIR", str(cache))
+    return cache
+
+
+def _photo(path, size=(1200, 800)):
+    # Ruido: demasiados colores para considerarla arte plano
+    Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(path)
+    return str(path)
+
+
+def test_photo_is_downscaled_to_its_placement_as_jpeg(tmp_path):
+    cached = gen.prepare_image(_photo(tmp_path / "photo.png"), gen.Inches(2), gen.Inches(1))
+    assert cached.endswith(".jpg")
+    with Image.open(cached) as img:
+        assert img.size == (2 * gen.IMAGE_DPI, gen.IMAGE_DPI)
+
+
+def test_images_are_never_upscaled(tmp_path):
+    cached = gen.prepare_image(_photo(tmp_path / "small.png", (40, 20)),
+                               gen.Inches(4), gen.Inches(2))
+    with Image.open(cached) as img:
+        assert img.size == (40, 20)
+
+
+def test_transparent_artwork_stays_png(tmp_path):
+    source = tmp_path / "logo.png"
+    Image.new("RGBA", (400, 400), (255, 0, 0, 0)).save(source)
+    cached = gen.prepare_image(str(source), gen.Inches(1), gen.Inches(1))
+    assert cached.endswith(".png")
+    with Image.open(cached) as img:
+        assert img.mode == "RGBA"
+
+
+def test_same_content_and_size_share_one_cached_file(tmp_path, image_cache):
+    first = _photo(tmp_path / "a.png")
+    second = tmp_path / "b.png"
+    second.write_bytes(open(first, "rb").read())
+    size = (gen.Inches(2), gen.Inches(1))
+    assert gen.prepare_image(first, *size) == gen.prepare_image(str(second), *size)
+    assert gen.prepare_image(first, gen.Inches(1), gen.Inches(1)) != gen.prepare_image(first, *size)
+    assert len(os.listdir(image_cache)) == 2
+
+
+def test_add_image_places_the_prepared_picture(tmp_path):
+    prs = gen.new_presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    picture = gen.add_image(slide, _photo(tmp_path / "photo.png"), 0, 0,
+                            gen.Inches(2), gen.Inches(1))
+    assert picture.image.size == (2 * gen.IMAGE_DPI, gen.IMAGE_DPI)
+
+
+def test_missing_image_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        gen.prepare_image(str(tmp_path / "nope.png"), gen.Inches(1), gen.Inches(1))
@@ -0,0 +1,18 @@
+import subprocess
+import sys
+
+from conftest import ROOT
+
+PROBE = """
+import sys
+import create_pptx_christian
+heavy = ("pptx.chart.data", "xlsxwriter", "concurrent.futures.process")
+print(",".join(name for name in heavy if name in sys.modules))
+"""
+
+
+def test_optional_modules_are_not_imported_eagerly():
+    # pptx/lxml se importan siempre; los opcionales solo cuando se usan
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,122 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import create_pptx_christian as gen
+from conftest import ROOT
+
+SLIDES = len(gen.SLIDE_BUILDERS)
+
+
+@pytest.fixture
+def deck(tmp_path):
+    return str(tmp_path / "deck.pptx")
+
+
+def _manifest(deck):
+    with open(deck + gen.BUILD_MANIFEST_SUFFIX, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_only_changed_slides_are_rerendered(deck):
+    _, dirty, _ = gen.render_incremental(deck)
+    assert len(dirty) == SLIDES
+    _, dirty, _ = gen.render_incremental(deck)
+    assert dirty == []
+    prs, dirty, _ = gen.render_incremental(deck, {"revenue_growth": -3})
+    assert dirty == [gen.SLIDE_BUILDERS.index(gen.create_slide_3)]
+    assert len(prs.slides) == SLIDES
+
+
+def test_editing_a_helper_rebuilds_the_deck(deck, monkeypatch):
+    gen.render_incremental(deck)
+    original = gen._char_width
+
+    # _char_width solo se alcanza a través de measure_text/fit_font_size
+    def _char_width(char, bold):  # otra fuente, mismo resultado
+        return original(char, bold)
+
+    monkeypatch.setattr(gen, "_char_width", _char_width)
+    monkeypatch.setattr(gen, "_renderer_version", None)
+    _, dirty, _ = gen.render_incremental(deck)
+    assert len(dirty) == SLIDES
+
+
+def test_editing_a_constant_rebuilds_the_deck(deck, monkeypatch):
+    gen.render_incremental(deck)
+    monkeypatch.setattr(gen, "GLOW_ALPHA", gen.GLOW_ALPHA + 1)
+    monkeypatch.setattr(gen, "_renderer_version", None)
+    _, dirty, _ = gen.render_incremental(deck)
+    assert dirty
+
+
+def test_renderer_version_covers_reachable_code():
+    code_objects, constants = gen.render_dependencies()
+    assert {"add_badge", "_char_width", "_Slot", "growth_label"} <= set(code_objects)
+    assert not set(code_objects) & {b.__name__ for b in gen.SLIDE_BUILDERS}
+    assert "EMERALD" in constants and "BASE_DIR" not in constants
+
+
+def test_manifest_records_template_and_save_mode(deck, tmp_path):
+    gen.render_incremental(deck, deterministic=True)
+    manifest = _manifest(deck)
+    assert manifest["template"] is None and manifest["deterministic"] is True
+
+    base = tmp_path / "base.pptx"
+    gen.new_presentation().save(str(base))
+    _, dirty, _ = gen.render_incremental(deck, deterministic=True, template=str(base))
+    assert len(dirty) == SLIDES
+    assert _manifest(deck)["template"] == gen.file_sha256(str(base))
+
+
+def _hash_file(deck):
+    with open(deck + gen.HASH_SUFFIX, encoding="utf-8") as f:
+        return f.read().split()[0]
+
+
+def test_switching_to_deterministic_resaves_clean_decks(deck):
+    gen.render_incremental(deck)
+    _, dirty, digest = gen.render_incremental(deck, deterministic=True)
+    assert dirty == [] and digest == gen.file_sha256(deck)
+    mtime = os.stat(deck).st_mtime_ns
+    _, dirty, again = gen.render_incremental(deck, deterministic=True)
+    assert again == digest and os.stat(deck).st_mtime_ns == mtime
+
+
+def test_deterministic_deck_changed_on_disk_is_saved_again(deck):
+    gen.render_incremental(deck, deterministic=True)
+    # Mismas slides, guardado normal: el manifiesto ya no describe el fichero
+    gen.Presentation(deck).save(deck)
+    changed = gen.file_sha256(deck)
+    _, dirty, digest = gen.render_incremental(deck, deterministic=True)
+    assert dirty == [] and digest != changed
+    assert digest == gen.file_sha256(deck) == _manifest(deck)["sha256"]
+
+
+def test_cli_incremental_deterministic_hash_matches_the_file(deck, capsys):
+    gen.main(["-o", deck, "--incremental"])
+    gen.main(["-o", deck, "--incremental", "--deterministic"])
+    assert "Slides regeneradas: 0/" in capsys.readouterr().out
+    assert _hash_file(deck) == gen.file_sha256(deck)
+
+
+def test_renderer_version_is_stable_across_processes():
+    probe = "import create_pptx_christian as gen; print(gen.renderer_version())"
+    versions = {subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True,
+                               text=True, check=True,
+                               env={**os.environ, "PYTHONHASHSEED": seed}).stdout
+                for seed in ("1", "2")}
+    assert len(versions) == 1
+
+
+def test_code_fingerprint_ignores_line_numbers():
+    namespace = {}
+    exec("def f(x):\n    return x + 1\n", namespace)
+    first = gen.code_fingerprint(namespace["f"])
+    exec("\n\n\ndef f(x):\n    return x + 1\n", namespace)
+    assert gen.code_fingerprint(namespace["f"]) == first
+    exec("def f(x):\n    return x + 2\n", namespace)
+    assert gen.code_fingerprint(namespace["f"]) != first
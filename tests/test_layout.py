@@ -0,0 +1,79 @@
+import pytest
+
+import create_pptx_christian as gen
+from create_pptx_christian import Column, Row, Spacer, Stack, Text
+
+
+def _boxes(node, *args):
+    return {key: tuple(round(v, 6) for v in box) for key, box in gen.layout(node, *args).items()}
+
+
+def test_row_places_children_with_gap_and_padding():
+    row = Row(Spacer(key="a", width=1, height=1), Spacer(key="b", width=2, height=0.5),
+              key="row", padding=0.5, gap=0.25)
+    boxes = _boxes(row, 1, 1)
+    assert boxes["row"] == (1, 1, 4.25, 2)
+    assert boxes["a"] == (1.5, 1.5, 1, 1)
+    # align="stretch" por defecto: el hijo ocupa todo el alto de la fila
+    assert boxes["b"] == (2.75, 1.5, 2, 1)
+
+
+def test_grow_shares_the_free_space():
+    row = Row(Spacer(key="a", width=1, grow=1), Spacer(key="b", width=1, grow=3), height=1)
+    boxes = _boxes(row, 0, 0, 10)
+    assert boxes["a"][2] == 3 and boxes["b"] == (3, 0, 7, 1)
+
+
+@pytest.mark.parametrize("justify, lefts", [
+    ("start", [0, 1]), ("center", [3, 4]), ("end", [6, 7]), ("between", [0, 7]),
+])
+def test_justify(justify, lefts):
+    row = Row(Spacer(key="a", width=1), Spacer(key="b", width=1), justify=justify)
+    boxes = _boxes(row, 0, 0, 8, 1)
+    assert [boxes["a"][0], boxes["b"][0]] == lefts
+
+
+def test_overflow_shrinks_in_proportion_to_size():
+    column = Column(Spacer(key="a", height=3), Spacer(key="b", height=1, shrink=0),
+                    Spacer(key="c", height=1))
+    boxes = _boxes(column, 0, 0, 1, 4)
+    assert [boxes[k][3] for k in "abc"] == [2.25, 1, 0.75]
+
+
+def test_align_center_keeps_the_natural_cross_size():
+    column = Column(Spacer(key="a", width=2, height=1), align="center")
+    assert _boxes(column, 0, 0, 6, 1)["a"] == (2, 0, 2, 1)
+
+
+def test_stack_overlays_children():
+    stack = Stack(Spacer(key="bg"), Text("Hola", 14, key="label", padding=0.1), key="card")
+    boxes = _boxes(stack, 0, 0, 3, 1)
+    assert boxes["bg"] == boxes["label"] == boxes["card"] == (0, 0, 3, 1)
+
+
+def test_text_is_sized_by_its_measurement():
+    width, height = gen.measure_text("Hola\nmundo", 14)
+    node = Text("Hola\nmundo", 14, key="t", padding=(0.1, 0.05))
+    assert _boxes(node, 0, 0)["t"][2:] == (round(width + 0.2, 6), round(height + 0.1, 6))
+    assert height == pytest.approx(2 * gen.LINE_SPACING * 14 / 72)
+
+
+def test_measurements_are_memoized():
+    gen.measure_text.cache_clear()
+    gen.measure_text("Una vez", 12)
+    gen.measure_text("Una vez", 12)
+    assert gen.measure_text.cache_info().hits == 1
+
+
+def test_bold_text_is_not_narrower():
+    assert gen.measure_text("Revive", 12, bold=True)[0] >= gen.measure_text("Revive", 12)[0]
+
+
+def test_box_emu():
+    assert gen.Box(1, 0.5, 2, 1).emu == (gen.Inches(1), gen.Inches(0.5),
+                                         gen.Inches(2), gen.Inches(1))
+
+
+def test_template_slots_cannot_be_measured():
+    with pytest.raises(TypeError, match="slots de plantilla"):
+        gen.measure_text(gen._Slot(0), 12)
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+import create_pptx_christian as gen
+
+
+def _off_canvas_deck():
+    prs = gen.build_presentation(slides=[0])
+    gen.add_text_box(prs.slides[0], gen.Inches(20), gen.Inches(20), gen.Inches(1),
+                     gen.Inches(1), "Fuera")
+    return prs
+
+
+def test_default_deck_has_no_lint_errors():
+    issues = gen.lint_deck(gen.build_presentation())
+    assert not [issue for issue in issues if issue.severity == "error"]
+
+
+def test_off_canvas_shape_is_an_error():
+    prs = _off_canvas_deck()
+    codes = {issue.code for issue in gen.lint_deck(prs) if issue.severity == "error"}
+    assert codes == {"off_canvas"}
+
+
+def test_incremental_runs_lint_on_the_result(tmp_path):
+    deck, stats = str(tmp_path / "deck.pptx"), str(tmp_path / "stats.json")
+    gen.main(["-o", deck, "--incremental"])
+    gen.main(["-o", deck, "--incremental", "--lint", "--stats-json", stats])
+    with open(stats, encoding="utf-8") as f:
+        result = json.load(f)
+    assert result["rerendered"] == [] and "lint" in result
+
+
+def test_incremental_lint_errors_exit_with_1(tmp_path, monkeypatch):
+    error = gen.LintIssue(1, "shape", "off_canvas", "error", "fuera de la slide")
+    monkeypatch.setattr(gen, "lint_deck", lambda prs: [error])
+    with pytest.raises(SystemExit) as exc:
+        gen.main(["-o", str(tmp_path / "deck.pptx"), "--incremental", "--lint"])
+    assert exc.value.code == 1
+
+
+def test_batch_incremental_specs_are_linted(tmp_path):
+    spec = {"output": str(tmp_path / "deck.pptx"), "incremental": True, "lint": True}
+    gen.render_deck(spec)
+    assert "lint" in gen.render_deck(spec)
+
+
+@pytest.mark.parametrize("attr, value", [("x", None), ("cx", "ancho"), ("y", "1.5")])
+def test_malformed_xfrm_is_an_issue_not_a_crash(attr, value):
+    prs = gen.build_presentation(slides=[0])
+    box = gen.add_text_box(prs.slides[0], 0, 0, gen.Inches(1), gen.Inches(1), "Caja")
+    xfrm = box._element.spPr.find("a:xfrm", gen._XML_NS)
+    target = xfrm.find("a:off" if attr in "xy" else "a:ext", gen._XML_NS)
+    if value is None:
+        del target.attrib[attr]
+    else:
+        target.set(attr, value)
+    issues = [issue for issue in gen.lint_deck(prs) if issue.code == "bad_xfrm"]
+    assert len(issues) == 1 and issues[0].severity == "error"
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+import create_pptx_christian as gen
+
+
+@pytest.fixture(scope="module")
+def catalog_keys():
+    with open(gen._catalog_path("en"), encoding="utf-8") as f:
+        messages = json.load(f)
+    values = messages.pop(gen.DATA_VALUES_KEY)
+    return messages, values
+
+
+def _texts(path):
+    return [t.text for slide in gen.Presentation(path).slides
+            for t in slide._element.iter(f"{{{gen._A_NS}}}t")]
+
+
+def test_english_deck_has_no_spanish_left(tmp_path, catalog_keys):
+    messages, values = catalog_keys
+    paths = gen.render_deck_locales(None, ["en"], str(tmp_path / "deck.pptx"),
+                                    template_cache=gen.SlideTemplateCache())
+    texts = _texts(paths["en"])
+    catalog = gen.load_catalog("en")
+    untranslated = [text for text in texts if catalog.translate(text) != text]
+    assert untranslated == []
+    spanish = {source for source, target in {**messages, **values}.items() if source != target}
+    assert not [text for text in texts if text in spanish]
+    assert "Revenue January" in texts and "Group" in texts
+
+
+def test_data_values_matching_message_keys_are_not_translated(tmp_path):
+    data = {"clients": [{"name": "Agenda", "sessions": 3, "adherence": 90},
+                        {"name": "Pedro Martín", "sessions": 8, "adherence": 72}]}
+    paths = gen.render_deck_locales(data, ["en"], str(tmp_path / "deck.pptx"),
+                                    template_cache=gen.SlideTemplateCache())
+    texts = _texts(paths["en"])
+    assert "Agenda" in texts          # nombre del cliente
+    assert "Schedule" in texts        # la etiqueta "Agenda" del deck
+
+
+def test_source_locale_variant_equals_the_deck(tmp_path):
+    paths = gen.render_deck_locales(None, ["es"], str(tmp_path / "deck.pptx"))
+    variant = gen.Presentation(paths["es"])
+    deck = gen.build_presentation()
+    assert [s.part.blob for s in variant.slides] == [s.part.blob for s in deck.slides]
+
+
+def test_merged_decks_are_translated_run_by_run(tmp_path):
+    paths = gen.render_locales(gen.build_presentation(slides=[3]), ["en"],
+                               str(tmp_path / "deck.pptx"))
+    assert "Revenue January" in _texts(paths["en"])
+
+
+def test_template_text_keeps_slots_and_skips_data_runs():
+    catalog = gen.MessageCatalog("en", {"Ingresos {}": "Revenue {}", "Agenda": "Schedule",
+                                        gen.DATA_VALUES_KEY: {"Enero": "January"}})
+    assert catalog.translate_template_text("Ingresos ⟦4⟧") == "Revenue ⟦4⟧"
+    assert catalog.translate_template_text("⟦2⟧") == "⟦2⟧"
+    assert catalog.translate_template_text("Agenda") == "Schedule"
+    assert catalog.translate("Ingresos Enero") == "Revenue January"
+    assert gen.localize_data({"revenue_month": "Enero", "trainer_name": "Enero"}, catalog) == \
+        {"revenue_month": "January", "trainer_name": "Enero"}
+
+
+def test_update_catalog_adds_data_values(tmp_path, monkeypatch):
+    monkeypatch.setattr(gen, "LOCALES_DIR", str(tmp_path))
+    added = gen.update_catalog("fr")
+    with open(tmp_path / "fr.json", encoding="utf-8") as f:
+        messages = json.load(f)
+    assert {"Enero", "Grupal", "Presencial"} <= set(messages[gen.DATA_VALUES_KEY])
+    assert added == len(messages) - 1 + len(messages[gen.DATA_VALUES_KEY])
+    gen.load_catalog.cache_clear()
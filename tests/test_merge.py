@@ -0,0 +1,87 @@
+import pytest
+
+import create_pptx_christian as gen
+
+
+@pytest.fixture
+def copier():
+    return gen._PartCopier(gen.new_presentation())
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("/ppt/media/image7.png", "/ppt/media/image1.png"),
+    ("/ppt/media/logo.png", "/ppt/media/logo.png"),
+    ("/ppt/media/100%.png", "/ppt/media/100%.png"),
+    ("/ppt/media/50%_off3.jpeg", "/ppt/media/50%_off1.jpeg"),
+    ("/ppt/embeddings/oleObject", "/ppt/embeddings/oleObject"),
+    ("/ppt/charts/chart12.xml", "/ppt/charts/chart1.xml"),
+])
+def test_partname_follows_the_source_pattern(copier, source, expected):
+    assert copier._partname(gen.PackURI(source)) == expected
+
+
+def test_partname_numbers_names_already_taken(copier):
+    names = [copier._partname(gen.PackURI("/ppt/media/logo.png")) for _ in range(3)]
+    assert names == ["/ppt/media/logo.png", "/ppt/media/logo1.png", "/ppt/media/logo2.png"]
+    names = [copier._partname(gen.PackURI("/ppt/media/a%d.png")) for _ in range(2)]
+    assert names == ["/ppt/media/a%d.png", "/ppt/media/a%d1.png"]
+
+
+def test_merged_deck_keeps_every_slide(tmp_path):
+    source = tmp_path / "source.pptx"
+    gen.build_presentation().save(str(source))
+    prs = gen.assemble_deck([f"{source}:1-2", str(source)])
+    assert len(prs.slides) == 2 + len(gen.SLIDE_BUILDERS)
+    prs.save(str(tmp_path / "merged.pptx"))
+
+
+@pytest.fixture
+def linked_source(tmp_path):
+    # Slide 1 con un shape que salta a la slide 2
+    prs = gen.build_presentation(slides="1-2")
+    shape = prs.slides[0].shapes[0]
+    shape.click_action.target_slide = prs.slides[1]
+    path = tmp_path / "linked.pptx"
+    prs.save(str(path))
+    return str(path)
+
+
+def _link_target(slide):
+    return slide.shapes[0].click_action.target_slide
+
+
+@pytest.mark.parametrize("selection, linked", [("1-2", 1), ("2,1", 0)])
+def test_slide_links_point_at_the_merged_copy(tmp_path, linked_source, selection, linked):
+    prs = gen.assemble_deck([f"{linked_source}:{selection}"])
+    source = prs.slides[1 - linked]
+    assert _link_target(source) == prs.slides[linked]
+    assert not [i for i in gen.lint_deck(prs) if i.code == "broken_rel"]
+    path = tmp_path / "merged.pptx"
+    prs.save(str(path))
+    reopened = gen.Presentation(str(path))
+    assert _link_target(reopened.slides[1 - linked]) == reopened.slides[linked]
+
+
+def test_links_to_slides_left_out_are_dropped(linked_source):
+    prs = gen.assemble_deck([f"{linked_source}:1"])
+    assert not [i for i in gen.lint_deck(prs) if i.code == "broken_rel"]
+    hlinks = prs.slides[0]._element.iter(f"{{{gen._XML_NS['a']}}}hlinkClick")
+    assert list(hlinks) == []
+
+
+def test_merges_into_the_same_deck_reuse_one_copier(tmp_path, monkeypatch):
+    source = tmp_path / "source.pptx"
+    gen.build_presentation(slides="1-2").save(str(source))
+    target = gen.new_presentation()
+    gen.merge_slides(target, str(source), "1")
+    copier = target.part._part_copier
+    hashed = []
+    real_sha1 = gen.hashlib.sha1
+    monkeypatch.setattr(gen.hashlib, "sha1", lambda data=b"": hashed.append(data) or real_sha1(data))
+    gen.merge_slides(target, str(source), "2")
+    assert target.part._part_copier is copier
+    assert len(target.slides) == 2
+    # Solo la media nueva de la segunda mezcla se hashea
+    media = [p for p in target.part.package.iter_parts()
+             if p.content_type.startswith(gen._SHARED_MEDIA_TYPES)]
+    assert len(hashed) <= len(media)
@@ -0,0 +1,39 @@
+import create_pptx_christian as gen
+
+
+def _shape_counts():
+    prs = gen.build_presentation()
+    return [len(slide.shapes) for slide in prs.slides], prs
+
+
+def test_native_effects_reduce_shapes_and_keep_the_text(slide_texts):
+    classic, classic_prs = _shape_counts()
+    gen.use_native_effects()
+    native, native_prs = _shape_counts()
+    assert all(n <= c for n, c in zip(native, classic))
+    # Slide 4 (Teaser Visual) está hecha de glass cards y badges
+    assert native[3] < classic[3] * 0.8
+    for classic_slide, native_slide in zip(classic_prs.slides, native_prs.slides):
+        assert sorted(slide_texts(native_slide)) == sorted(slide_texts(classic_slide))
+
+
+def test_glass_card_carries_glow_shadow_and_title():
+    gen.use_native_effects()
+    prs = gen.new_presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    card = gen.add_glass_card(slide, 0, 0, gen.Inches(3), gen.Inches(2), gen.VIOLET, "Título")
+    effects = card._element.spPr.find("a:effectLst", gen._XML_NS)
+    assert [gen.etree.QName(e).localname for e in effects] == ["glow", "outerShdw"]
+    assert card._element.spPr.find("a:gradFill", gen._XML_NS) is not None
+    assert card.text_frame.text == "Título"
+    assert len(slide.shapes) == 2  # card + acento
+
+
+def test_switching_modes_invalidates_templates_and_version():
+    gen.TEMPLATE_CACHE.render(gen.new_presentation(), gen.create_slide_1, gen.DEFAULT_DECK_DATA)
+    version = gen.renderer_version()
+    gen.use_native_effects()
+    assert gen.TEMPLATE_CACHE.stats()["templates"] == 0
+    assert gen.renderer_version() != version
+    gen.use_native_effects()  # mismo modo: no invalida nada
+    assert gen._renderer_version is not None
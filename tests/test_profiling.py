@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import create_pptx_christian as gen
+
+
+@pytest.fixture
+def profiled_run(tmp_path):
+    profile, trace = tmp_path / "profile.json", tmp_path / "trace.json"
+    gen.main(["-o", str(tmp_path / "deck.pptx"), "--profile", str(profile),
+              "--trace", str(trace)])
+    yield json.loads(profile.read_text()), json.loads(trace.read_text())
+    gen.disable_profiling()
+
+
+def test_profile_reports_every_slide(profiled_run):
+    summary, _ = profiled_run
+    slides = summary["slides"]
+    assert [entry["builder"] for entry in slides] == [
+        builder.__name__ for builder in gen.SLIDE_BUILDERS]
+    for entry in slides:
+        assert entry["shapes"] and entry["bytes"] > 0 and entry["seconds"] >= 0
+    assert "add_text_box" in slides[0]["helpers"]
+    package = summary["package"]
+    assert package["shared_bytes"] + sum(e["bytes"] for e in slides) == package["total_bytes"]
+
+
+def test_trace_is_in_chrome_format(profiled_run):
+    _, trace = profiled_run
+    events = trace["traceEvents"]
+    assert {event["ph"] for event in events} == {"X"}
+    slide_events = [event for event in events if event["cat"] == "slide"]
+    assert len(slide_events) == len(gen.SLIDE_BUILDERS)
+
+
+def test_profiling_restores_the_helpers():
+    original = gen.add_text_box
+    profiler = gen.enable_profiling()
+    assert gen.add_text_box is not original
+    gen.enable_profiling()  # volver a activarla no envuelve dos veces
+    assert gen.add_text_box.__wrapped__ is original
+    gen.disable_profiling()
+    assert gen.add_text_box is original and gen._PROFILER is None
+    assert profiler.events == []
+    gen.disable_profiling()  # sin profiler activo no hace nada
+
+
+def test_helper_errors_are_still_timed():
+    profiler = gen.Profiler()
+
+    def broken():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        profiler.wrap("broken", broken)()
+    assert [event[0] for event in profiler.events] == ["broken"]
@@ -0,0 +1,92 @@
+import pytest
+
+import create_pptx_christian as gen
+
+SLIDE_3 = gen.SLIDE_BUILDERS.index(gen.create_slide_3)
+
+
+def _fills(slide):
+    return [el.get("val") for el in slide._element.iter(
+        "{http://schemas.openxmlformats.org/drawingml/2006/main}srgbClr")]
+
+
+@pytest.mark.parametrize("growth, label, colors", [
+    (12, "+12% ↑", (gen.EMERALD_DARK, gen.EMERALD_GLOW)),
+    (-4, "-4% ↓", (gen.ROSE_DARK, gen.ROSE)),
+    (0, "0% →", (gen.GRAY_DARK, gen.GRAY_LIGHT)),
+])
+def test_growth_badge_follows_sign(growth, label, colors):
+    assert gen.growth_label(growth) == label
+    assert gen.growth_badge_colors(growth) == colors
+
+
+@pytest.mark.parametrize("growth", [12, -4])
+def test_growth_badge_through_template_cache(slide_texts, growth):
+    data = {"revenue_growth": growth}
+    direct = gen.build_presentation(data, slides=[SLIDE_3]).slides[0]
+    cache = gen.SlideTemplateCache()
+    gen.build_presentation({"revenue_growth": 1}, template_cache=cache, slides=[SLIDE_3])
+    cached = gen.build_presentation(data, template_cache=cache, slides=[SLIDE_3]).slides[0]
+    assert gen.growth_label(growth) in slide_texts(cached)
+    assert slide_texts(cached) == slide_texts(direct)
+    assert _fills(cached) == _fills(direct)
+
+
+def _deck_xml(prs):
+    return [slide.part.blob for slide in prs.slides]
+
+
+def test_template_cache_matches_direct_render():
+    data = {"revenue": 1234567, "trainer_name": "Ana López", "revenue_growth": -7,
+            "adherence": 64}
+    direct = gen.build_presentation(data)
+    cache = gen.SlideTemplateCache()
+    gen.build_presentation(template_cache=cache)
+    cached = gen.build_presentation(data, template_cache=cache)
+    assert len(cache) == len(gen.SLIDE_BUILDERS)
+    assert _deck_xml(cached) == _deck_xml(direct)
+
+
+def test_fast_emit_matches_normal_path():
+    normal = gen.build_presentation()
+    gen.use_fast_emitter(True)
+    fast = gen.build_presentation()
+    assert _deck_xml(fast) == _deck_xml(normal)
+
+
+def test_template_cache_falls_back_on_slot_arithmetic(capsys):
+    def create_slide_doubled(prs, data):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        gen.add_text_box(slide, 0, 0, gen.Inches(2), gen.Inches(1), str(data["revenue"] + 1))
+        return slide
+
+    cache = gen.SlideTemplateCache()
+    prs = gen.new_presentation()
+    slide = cache.render(prs, create_slide_doubled, {"revenue": 41})
+    assert slide.shapes[0].text_frame.text == "42"
+    assert "create_slide_doubled" in cache.stats()["direct"]
+    assert "renderiza directo" in capsys.readouterr().err
+
+
+def test_template_cache_does_not_hide_builder_bugs():
+    def create_slide_broken(prs, data):
+        raise KeyError("missing")
+
+    with pytest.raises(KeyError):
+        gen.SlideTemplateCache().render(gen.new_presentation(), create_slide_broken, {})
+
+
+def test_template_cache_key_includes_base_template(tmp_path):
+    base = tmp_path / "base.pptx"
+    gen.new_presentation().save(str(base))
+    cache = gen.SlideTemplateCache()
+    gen.build_presentation(template_cache=cache, slides=[0])
+    gen.build_presentation(template_cache=cache, slides=[0], template=str(base))
+    assert len(cache) == 2
+
+
+def test_chart_slides_are_rendered_directly_without_warning(capsys):
+    cache = gen.SlideTemplateCache()
+    gen.build_presentation(template_cache=cache)
+    assert list(cache.stats()["direct"]) == ["create_slide_6"]
+    assert capsys.readouterr().err == ""
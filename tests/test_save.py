@@ -0,0 +1,51 @@
+import io
+import zipfile
+
+import create_pptx_christian as gen
+
+
+def _members(blob):
+    with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+        return {info.filename: zf.read(info) for info in zf.infolist()}
+
+
+def test_streaming_save_has_the_same_members_as_prs_save():
+    prs = gen.build_presentation()
+    saved, streamed = io.BytesIO(), io.BytesIO()
+    prs.save(saved)
+    gen.save_streaming(prs, streamed)
+    assert _members(streamed.getvalue()) == _members(saved.getvalue())
+
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+
+def test_streaming_save_accepts_unseekable_targets():
+    target = _Unseekable()
+    gen.save_streaming(gen.build_presentation(slides=[0]), target)
+    assert zipfile.ZipFile(io.BytesIO(b"".join(target.chunks))).testzip() is None
+
+
+def test_deterministic_save_gives_the_same_sha256(tmp_path):
+    first, second = tmp_path / "a.pptx", tmp_path / "b.pptx"
+    digest = gen.save_deck(gen.build_presentation(), str(first), deterministic=True)
+    again = gen.save_deck(gen.build_presentation(), str(second), deterministic=True)
+    assert digest == again == gen.file_sha256(str(first))
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_deterministic_save_honours_source_date_epoch(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    path = tmp_path / "deck.pptx"
+    gen.save_deck(gen.build_presentation(slides=[0]), str(path), deterministic=True)
+    with zipfile.ZipFile(path) as zf:
+        assert {info.date_time for info in zf.infolist()} == {(2023, 11, 14, 22, 13, 20)}
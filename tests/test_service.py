@@ -0,0 +1,146 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import deck_service
+
+
+@pytest.fixture
+def service(tmp_path):
+    return deck_service.DeckService(str(tmp_path), workers=1, app_data_file="/srv/export.json")
+
+
+@pytest.mark.parametrize("key", ["template", "formats", "incremental", "app_data_file"])
+def test_submit_rejects_server_side_keys(service, key):
+    with pytest.raises(ValueError, match=key):
+        service.submit({"output": "a.pptx", key: "/etc/passwd"})
+    assert service.jobs == {}
+
+
+def test_submit_rejects_client_app_data_file(service):
+    with pytest.raises(ValueError, match="file"):
+        service.submit({"app_data": {"trainer": "t1", "file": "/etc/passwd"}})
+
+
+def test_app_data_always_comes_from_the_service(service, tmp_path):
+    job = service.submit({"output": "../../x.pptx", "app_data": {"trainer": "t1"}})
+    assert job.spec["app_data_file"] == "/srv/export.json"
+    assert job.spec["output"] == os.path.join(str(tmp_path), f"{job.id}_x.pptx")
+
+
+def test_app_data_needs_a_service_export(tmp_path):
+    service = deck_service.DeckService(str(tmp_path), workers=1)
+    with pytest.raises(ValueError, match="--app-data"):
+        service.submit({"app_data": {"trainer": "t1"}})
+
+
+def _finish(service, job, tmp_path, age=0):
+    job.submitted -= age
+    for name in (f"{job.id}_a.pptx", f"{job.id}_a.pptx.sha256"):
+        (tmp_path / name).write_bytes(b"x")
+    job.done.set()
+
+
+def test_finished_jobs_expire_with_their_files(service, tmp_path):
+    old = service.submit({"output": "a.pptx"})
+    _finish(service, old, tmp_path, age=service.job_ttl + 1)
+    recent = service.submit({"output": "a.pptx"})
+    _finish(service, recent, tmp_path)
+    service.evict()
+    assert list(service.jobs) == [recent.id]
+    assert sorted(os.listdir(tmp_path)) == [f"{recent.id}_a.pptx", f"{recent.id}_a.pptx.sha256"]
+
+
+def test_job_count_is_bounded(tmp_path):
+    service = deck_service.DeckService(str(tmp_path), workers=1, max_jobs=2, queue_size=10)
+    jobs = [service.submit({"output": "a.pptx"}) for _ in range(2)]
+    for job in jobs:
+        _finish(service, job, tmp_path)
+    newest = service.submit({"output": "a.pptx"})
+    assert list(service.jobs) == [jobs[1].id, newest.id]
+    assert not any(name.startswith(jobs[0].id) for name in os.listdir(tmp_path))
+
+
+def test_running_jobs_are_never_evicted(tmp_path):
+    service = deck_service.DeckService(str(tmp_path), workers=1, max_jobs=1, queue_size=10)
+    first = service.submit({"output": "a.pptx"})
+    service.submit({"output": "b.pptx"})
+    assert first.id in service.jobs
+
+
+class _Writer:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _request(service, raw):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        writer = _Writer()
+        await deck_service._handle(service, reader, writer)
+        return writer.data
+    head, _, body = asyncio.run(run()).partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(body)
+
+
+@pytest.mark.parametrize("raw", [b"GARBAGE\r\n\r\n", b"GET /health\r\n\r\n",
+                                 b"GET /health HTTP/1.1\r\nContent-Length: x\r\n\r\n"])
+def test_malformed_requests_get_400(service, raw):
+    status, payload = _request(service, raw)
+    assert status == 400 and payload["error"]
+
+
+def test_oversized_body_gets_413(service):
+    raw = f"POST /decks HTTP/1.1\r\nContent-Length: {deck_service.MAX_BODY + 1}\r\n\r\n"
+    assert _request(service, raw.encode())[0] == 413
+
+
+def test_post_with_forbidden_key_gets_400(service):
+    body = json.dumps({"output": "a.pptx", "template": "/etc/x.pptx"}).encode()
+    raw = b"POST /decks HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    status, payload = _request(service, raw)
+    assert status == 400 and "template" in payload["error"]
+
+
+def test_output_names_are_restricted_to_safe_characters(service, tmp_path):
+    job = service.submit({"output": 'a"\r\nSet-Cookie: x.pptx'})
+    assert os.path.basename(job.spec["output"]) == f"{job.id}_a___Set-Cookie__x.pptx"
+
+
+def test_pinned_jobs_are_not_evicted(tmp_path):
+    service = deck_service.DeckService(str(tmp_path), workers=1, max_jobs=1, queue_size=10)
+    job = service.submit({"output": "a.pptx"})
+    _finish(service, job, tmp_path, age=service.job_ttl + 1)
+    job.pins += 1
+    service.evict()
+    assert job.id in service.jobs and (tmp_path / f"{job.id}_a.pptx").exists()
+    job.pins -= 1
+    service.evict()
+    assert job.id not in service.jobs
+
+
+def test_deleted_deck_gets_410(service, tmp_path):
+    job = service.submit({"output": "a.pptx"})
+    job.status, job.result = "done", {"output": str(tmp_path / f"{job.id}_a.pptx")}
+    job.done.set()
+    status, payload = _request(service, f"GET /decks/{job.id}/file HTTP/1.1\r\n\r\n".encode())
+    assert status == 410 and payload["error"]
+    assert job.pins == 0
+
+
+def test_oversized_header_line_gets_431(service):
+    raw = b"GET /health HTTP/1.1\r\nX-Big: " + b"a" * (1 << 17) + b"\r\n\r\n"
+    assert _request(service, raw)[0] == 431
@@ -0,0 +1,66 @@
+import pytest
+
+import create_pptx_christian as gen
+
+
+def _spec(*components, **extra):
+    return {"components": list(components), **extra}
+
+
+def _text(**fields):
+    return {"type": "text", "x": 1, "y": 1, "w": 4, "h": 1, "text": "Hola", **fields}
+
+
+def test_bundled_specs_compile():
+    for name in ("apertura.json", "roadmap.json"):
+        background, ops = gen.compile_slide_spec(
+            gen.load_slide_spec(f"{gen.SPEC_DIR}/{name}"))
+        assert ops and isinstance(background, gen.RgbColor)
+
+
+def test_children_are_positioned_relative_to_their_parent():
+    rect = {"type": "rect", "x": 2, "y": 3, "w": 4, "h": 2, "fill": "GRAY_DARK",
+            "children": [_text(x=0.5, y=0.25)]}
+    _, ops = gen.compile_slide_spec(_spec(rect))
+    helper, args = ops[1]
+    assert helper == "add_text_box"
+    assert [value for _, value in args[:2]] == [gen.Inches(2.5), gen.Inches(3.25)]
+
+
+def test_placeholders_use_the_deck_data():
+    prs = gen.new_presentation()
+    slide = gen.render_slide_spec(prs, _spec(_text(text="Hola {trainer_name}")),
+                                  {"trainer_name": "Ana"})
+    assert slide.shapes[0].text_frame.text == "Hola Ana"
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"components": "text"}, "debe ser una lista"),
+    (_spec({"x": 1}), "necesita un 'type'"),
+    (_spec({"type": "video"}), "tipo desconocido"),
+    (_spec(_text(blink=True)), "campos desconocidos"),
+    (_spec({"type": "text", "x": 1, "y": 1, "w": 1, "h": 1}), "falta el campo 'text'"),
+    (_spec(_text(x="1in")), "se esperaba un número"),
+    (_spec(_text(color="MAGENTA")), "color desconocido"),
+    (_spec(_text(align="justify")), "alineación inválida"),
+    (_spec(background="#12"), "color desconocido"),
+    (["components"], "debe ser un objeto"),
+    (_spec(_text(x=True)), "se esperaba un número"),
+    (_spec(_text(size=False)), "se esperaba un número"),
+    (_spec(_text(fit="yes")), "se esperaba true o false"),
+    (_spec(_text(text="Hola {nombre}")), "marcador desconocido \\{nombre\\}"),
+    (_spec(_text(text="Hola {")), "llaves mal formadas"),
+    (_spec(_text(text="{sessions[9]}")), "marcador inválido"),
+    (_spec(_text(text="{trainer_name:d}")), "marcador inválido"),
+])
+def test_invalid_specs_raise_slide_spec_error(spec, message):
+    with pytest.raises(gen.SlideSpecError, match=message):
+        gen.compile_slide_spec(spec)
+
+
+def test_literal_braces_and_indexed_placeholders_render():
+    prs = gen.new_presentation()
+    spec = _spec(_text(text="{{app}} {sessions[0][client]}"))
+    slide = gen.render_slide_spec(prs, spec, gen.DEFAULT_DECK_DATA)
+    client = gen.DEFAULT_DECK_DATA["sessions"][0]["client"]
+    assert slide.shapes[0].text_frame.text == f"{{app}} {client}"
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+from pptx import Presentation
+
+import create_pptx_christian as gen
+
+BASE = os.path.join(gen.BASE_DIR, "REVIVE_Reunion_Christian.pptx")
+
+
+@pytest.fixture
+def pool():
+    return gen.TemplatePool(BASE)
+
+
+def test_decks_share_masters_but_not_slides(pool):
+    first, second = pool.presentation(), pool.presentation()
+    assert len(first.slides) == len(second.slides) == 0
+    assert first.slide_masters[0].part is second.slide_masters[0].part
+    assert first.part is not second.part
+    gen.build_presentation(prs=first, slides="1")
+    assert len(first.slides) == 1 and len(second.slides) == 0
+    assert len(pool.presentation().slides) == 0
+
+
+def test_core_properties_are_per_deck(pool):
+    first, second = pool.presentation(), pool.presentation()
+    first.core_properties.title = "Ana"
+    assert second.core_properties.title != "Ana"
+
+
+def test_pooled_deck_saves_like_a_fresh_one(pool, tmp_path):
+    prs = gen.build_presentation(prs=pool.presentation())
+    path = tmp_path / "pooled.pptx"
+    prs.save(str(path))
+    reopened = Presentation(str(path))
+    assert len(reopened.slides) == len(gen.SLIDE_BUILDERS)
+    assert reopened.slide_width == gen.Inches(13.333)
+
+
+def test_pool_is_cached_per_absolute_path():
+    relative = os.path.relpath(BASE)
+    assert gen.template_pool(BASE) is gen.template_pool(relative)
+    assert gen.template_pool(None) is not gen.template_pool(BASE)
+
+
+def test_missing_template_raises(tmp_path):
+    with pytest.raises(Exception, match="nope.pptx"):
+        gen.TemplatePool(str(tmp_path / "nope.pptx"))
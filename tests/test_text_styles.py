@@ -0,0 +1,60 @@
+import pytest
+
+import create_pptx_christian as gen
+
+
+@pytest.fixture
+def slide():
+    prs = gen.new_presentation()
+    return prs.slides.add_slide(prs.slide_layouts[6])
+
+
+@pytest.fixture
+def registered_style():
+    yield gen.register_text_style("test_title", 30, gen.EMERALD, bold=True, font_name="Georgia")
+    del gen.TEXT_STYLES["test_title"]
+
+
+def _def_rpr(box):
+    return box.text_frame.paragraphs[0]._p.find("a:pPr/a:defRPr", gen._XML_NS)
+
+
+def test_explicit_arguments_override_the_style():
+    style = gen.text_style("caption", font_size=12, bold=True)
+    assert style == gen.TextStyle(12, gen.GRAY_LIGHT, True, gen.THEME_FONT)
+    assert gen.text_style() == gen.TextStyle(18, gen.WHITE, False, gen.THEME_FONT)
+
+
+def test_unknown_style_raises():
+    with pytest.raises(KeyError):
+        gen.text_style("headline")
+
+
+def test_registered_style_is_applied(slide, registered_style):
+    box = gen.add_text_box(slide, 0, 0, gen.Inches(2), gen.Inches(1), "Hola",
+                           style="test_title")
+    def_rpr = _def_rpr(box)
+    assert def_rpr.get("sz") == "3000" and def_rpr.get("b") == "1"
+    assert def_rpr.find("a:latin", gen._XML_NS).get("typeface") == "Georgia"
+
+
+def test_theme_font_is_inherited_not_repeated(slide):
+    box = gen.add_text_box(slide, 0, 0, gen.Inches(2), gen.Inches(1), "Hola", style="body")
+    assert _def_rpr(box).find("a:latin", gen._XML_NS) is None
+    theme = slide.part.slide_layout.slide_master.part.part_related_by(gen.RT.THEME)
+    assert f'typeface="{gen.THEME_FONT}"'.encode() in theme.blob
+
+
+def test_paragraphs_get_copies_of_the_cached_element(slide):
+    first = gen.add_text_box(slide, 0, 0, gen.Inches(2), gen.Inches(1), "a", style="body")
+    second = gen.add_text_box(slide, 0, 0, gen.Inches(2), gen.Inches(1), "b", style="body")
+    _def_rpr(first).set("sz", "100")
+    assert _def_rpr(second).get("sz") == "1400"
+    assert gen._def_rpr_element(gen.TEXT_STYLES["body"]).get("sz") == "1400"
+
+
+def test_restyling_replaces_the_previous_style(slide):
+    box = gen.add_text_box(slide, 0, 0, gen.Inches(2), gen.Inches(1), "a", style="body")
+    gen.apply_text_style(box.text_frame.paragraphs[0], gen.TEXT_STYLES["caption"])
+    p_pr = box.text_frame.paragraphs[0]._p.pPr
+    assert [d.get("sz") for d in p_pr.findall("a:defRPr", gen._XML_NS)] == ["900"]